@@ -9,7 +9,7 @@ from app.core.config import get_settings
 from app.db.base import Base
 
 # Import all models so Alembic sees them
-from app.models import career, job, resume, roadmap, user  # noqa: F401
+from app.models import career, job, pipeline, resume, roadmap, role_keywords, task, user  # noqa: F401
 
 config = context.config
 settings = get_settings()
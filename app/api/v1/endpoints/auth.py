@@ -1,29 +1,58 @@
+import uuid
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import create_access_token, hash_password, verify_password
+from app.core.security import (
+    create_access_token,
+    decode_access_token,
+    hash_password,
+    set_password_token_matches,
+    verify_password,
+)
 from app.db.session import get_db
 from app.models.user import User
-from app.schemas.user import TokenOut, UserLogin, UserOut, UserRegister
+from app.schemas.user import SetPassword, TokenOut, UserLogin, UserOut, UserRegister
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/register", response_model=TokenOut, status_code=status.HTTP_201_CREATED)
 async def register(body: UserRegister, db: AsyncSession = Depends(get_db)):
-    existing = await db.execute(select(User).where(User.email == body.email))
-    if existing.scalar_one_or_none():
+    # One statement: a concurrent registration of the same email inserts nothing
+    result = await db.scalars(
+        insert(User)
+        .values(email=body.email, hashed_password=hash_password(body.password), full_name=body.full_name)
+        .on_conflict_do_nothing(index_elements=[User.email])
+        .returning(User)
+    )
+    user = result.one_or_none()
+    if user is None:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    user = User(
-        email=body.email,
-        hashed_password=hash_password(body.password),
-        full_name=body.full_name,
-    )
-    db.add(user)
-    await db.flush()
+    token = create_access_token(str(user.id))
+    return TokenOut(access_token=token, user=UserOut.model_validate(user))
+
+
+@router.post("/set-password", response_model=TokenOut)
+async def set_password(body: SetPassword, db: AsyncSession = Depends(get_db)):
+    """Set a password with a set-password token (cohort invite) and sign in.
 
+    The token works once: setting the password invalidates it.
+    """
+    try:
+        payload = decode_access_token(body.token)
+        user_id = uuid.UUID(payload["sub"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid or expired token")
+    user = await db.get(User, user_id)
+    if not user or not user.is_active or not set_password_token_matches(payload, user.hashed_password):
+        raise HTTPException(status_code=400, detail="Invalid or expired token")
+
+    user.hashed_password = hash_password(body.password)
+    await db.flush()
     token = create_access_token(str(user.id))
     return TokenOut(access_token=token, user=UserOut.model_validate(user))
 
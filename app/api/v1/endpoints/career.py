@@ -4,49 +4,26 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_current_user
+from app.core.deps import get_current_user, get_current_user_with_profile, job_list_fields
 from app.db.session import get_db
 from app.models.career import CareerRecommendation
 from app.models.user import User
-from app.schemas.career import CareerRecommendationOut, SelectRolesRequest
-from app.services.career_recommender import recommend_roles
+from app.schemas.career import CareerRecommendationOut, RoleInsightOut, SelectRolesRequest, to_role_insight
+from app.services.career_recommender import refresh_recommendations
+from app.services.role_insights import cached_role_insight, explore_roles
 
 router = APIRouter(prefix="/career", tags=["career"])
 
 
 @router.post("/recommend", response_model=list[CareerRecommendationOut])
 async def get_recommendations(
-    user: User = Depends(get_current_user),
+    user: User = Depends(get_current_user_with_profile),
     db: AsyncSession = Depends(get_db),
 ):
     if not user.profile or not user.profile.skills:
         raise HTTPException(status_code=400, detail="Upload resume first to extract skills")
 
-    # Clear old recommendations
-    old = await db.execute(
-        select(CareerRecommendation).where(CareerRecommendation.user_id == user.id)
-    )
-    for rec in old.scalars():
-        await db.delete(rec)
-
-    results = await recommend_roles(
-        user_skills=user.profile.skills,
-        education=user.profile.education,
-        experience=user.profile.experience,
-    )
-    recs: list[CareerRecommendation] = []
-    for r in results:
-        rec = CareerRecommendation(
-            user_id=user.id,
-            job_role=r["job_role"],
-            match_score=r["match_score"],
-            matched_skills=r["matched_skills"],
-            missing_skills=r["missing_skills"],
-        )
-        db.add(rec)
-        recs.append(rec)
-
-    await db.flush()
+    recs = await refresh_recommendations(db, user.id, user.profile)
     return [CareerRecommendationOut.model_validate(r) for r in recs]
 
 
@@ -71,3 +48,46 @@ async def select_roles(
 
     await db.flush()
     return {"selected": len(recs)}
+
+
+@router.post("/explore", response_model=list[RoleInsightOut], response_model_exclude_unset=True)
+async def explore_recommended_roles(
+    refresh: bool = False,
+    fields: tuple[str, ...] = Depends(job_list_fields),
+    user: User = Depends(get_current_user_with_profile),
+    db: AsyncSession = Depends(get_db),
+):
+    """Top jobs and ATS score for every recommended role, in one call.
+
+    Roles are evaluated concurrently from the stored resume profile, and only
+    those without a fresh stored result are computed (``?refresh=true``
+    recomputes all). Each role lists its top 10 jobs; ``GET /career/explore``
+    returns all of one role's jobs.
+    """
+    if not user.profile or not user.profile.raw_text:
+        raise HTTPException(status_code=400, detail="Upload a resume first")
+
+    insights = await explore_roles(db, user, user.profile, refresh=refresh)
+    if not insights:
+        raise HTTPException(status_code=400, detail="Get career recommendations first")
+    return [to_role_insight(i, fields, jobs_limit=10) for i in insights]
+
+
+@router.get("/explore", response_model=RoleInsightOut, response_model_exclude_unset=True)
+async def get_role_insight(
+    role: str,
+    fields: tuple[str, ...] = Depends(job_list_fields),
+    user: User = Depends(get_current_user_with_profile),
+    db: AsyncSession = Depends(get_db),
+):
+    """Jobs and ATS score for one role: a stored read when fresh, else computed now."""
+    if not user.profile or not user.profile.raw_text:
+        raise HTTPException(status_code=400, detail="Upload a resume first")
+
+    insight = await cached_role_insight(db, user, user.profile, role)
+    if insight is None:
+        computed = await explore_roles(db, user, user.profile, roles=[role])
+        if not computed:
+            raise HTTPException(status_code=502, detail="Could not evaluate this role, try again")
+        insight = computed[0]
+    return to_role_insight(insight, fields)
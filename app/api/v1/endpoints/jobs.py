@@ -1,29 +1,50 @@
 import uuid
+from datetime import datetime, timedelta, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select
+from sqlalchemy import select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_current_user
+from app.core.config import get_settings
+from app.core.deps import get_current_user, get_current_user_with_profile, job_list_fields
 from app.db.session import get_db
 from app.models.career import CareerRecommendation
-from app.models.job import SavedJob
+from app.models.job import CatalogJob, JobSearchSnapshot, SavedJob, UserJobFeedEntry
 from app.models.user import User
-from app.schemas.job import JobOut, UpdateJobStatus
-from app.services.job_search import rank_jobs, search_jobs
+from app.schemas.job import (
+    JobFeedOut,
+    JobOut,
+    JobSearchOut,
+    SavedJobPage,
+    SavedJobSummary,
+    SaveJobRequest,
+    UpdateJobStatus,
+    to_list_item,
+)
+from app.services.job_aggregator import JobSearchUnavailable, find_jobs_for_role
+from app.services.job_catalog import expire_search_snapshots
+from app.services.job_feed import current_user_feed
+from app.services.role_insights import cached_role_insight
+from app.utils.pagination import decode_cursor, encode_cursor
 
+settings = get_settings()
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 
 
-@router.get("/search", response_model=list[JobOut])
+@router.get("/search", response_model=JobSearchOut, response_model_exclude_unset=True)
 async def search_and_match(
     role: str | None = None,
-    user: User = Depends(get_current_user),
+    fields: tuple[str, ...] = Depends(job_list_fields),
+    user: User = Depends(get_current_user_with_profile),
     db: AsyncSession = Depends(get_db),
 ):
     """Search for jobs matching the user's profile.
 
     If no role is provided, uses the user's selected career recommendation.
+    The ranked results are snapshotted under the returned ``search_id`` so
+    saving a job never re-queries the job API. Jobs come back as compact
+    list items (``?fields=`` to pick others); ``GET /jobs/{id}`` has the
+    full description.
     """
     query = role
     if not query:
@@ -38,50 +59,146 @@ async def search_and_match(
             raise HTTPException(status_code=400, detail="Select a career role first or provide ?role= param")
         query = selected.job_role
 
-    user_skills = user.profile.skills if user.profile else []
-    location = user.location_preference
-    remote = user.remote_preference == "remote"
+    # Roles evaluated by POST /career/explore (or onboarding) are a stored read
+    insight = await cached_role_insight(db, user, user.profile, query) if user.profile else None
+    if insight is not None:
+        ranked = insight.jobs
+    else:
+        user_skills = user.profile.skills if user.profile else []
+        location = user.location_preference
+        remote = user.remote_preference == "remote"
+        try:
+            ranked = await find_jobs_for_role(query, user_skills, location, remote)
+        except JobSearchUnavailable:
+            raise HTTPException(status_code=502, detail="Job search is unavailable right now, try again")
 
-    raw_jobs = await search_jobs(
-        query=f"{query} fresher entry level",
-        location=location,
-        remote_only=remote,
+    # Drop this user's expired snapshots, then store the new one
+    await expire_search_snapshots(db, user.id)
+    now = datetime.now(timezone.utc)
+    snapshot = JobSearchSnapshot(
+        user_id=user.id,
+        query=query,
+        jobs=ranked,
+        expires_at=now + timedelta(minutes=settings.JOB_SNAPSHOT_TTL_MINUTES),
     )
+    db.add(snapshot)
+    await db.flush()
 
-    ranked = rank_jobs(raw_jobs, user_skills, location)
-    return [JobOut(**j) for j in ranked]
+    return JobSearchOut(
+        search_id=snapshot.id,
+        expires_at=snapshot.expires_at,
+        jobs=[to_list_item(j, fields) for j in ranked],
+    )
 
 
-@router.post("/save/{job_index}", response_model=JobOut)
+@router.get("/feed", response_model=JobFeedOut, response_model_exclude_unset=True)
+async def get_job_feed(
+    after: int | None = Query(None, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    fields: tuple[str, ...] = Depends(job_list_fields),
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Today's matches: the user's precomputed ranked feed.
+
+    Keyset-paginated on rank: pass the returned ``next_after`` as ``after``
+    for the next page. Feeds are built by the user_feed worker; a user
+    without one yet, or whose role, skills or location changed since, gets
+    theirs computed from the catalog on this visit.
+    """
+    state = await current_user_feed(db, user.id)
+    if state is None:
+        raise HTTPException(status_code=400, detail="Select a career role first")
+
+    stmt = (
+        select(UserJobFeedEntry.position, UserJobFeedEntry.job)
+        .where(UserJobFeedEntry.user_id == user.id)
+        .order_by(UserJobFeedEntry.position)
+        .limit(limit + 1)
+    )
+    if after is not None:
+        stmt = stmt.where(UserJobFeedEntry.position > after)
+    rows = (await db.execute(stmt)).all()
+
+    page = rows[:limit]
+    return JobFeedOut(
+        role=state.role,
+        computed_at=state.computed_at,
+        jobs=[to_list_item(job, fields) for _, job in page],
+        next_after=page[-1].position if len(rows) > limit else None,
+    )
+
+
+@router.post("/save", response_model=JobOut)
 async def save_job(
+    body: SaveJobRequest,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Save a job from a search snapshot by index or external job id."""
+    if body.job_index is None and not body.external_job_id:
+        raise HTTPException(status_code=400, detail="Provide job_index or external_job_id")
+    return await _save_from_snapshot(db, user, body.search_id, body.job_index, body.external_job_id)
+
+
+@router.post("/save/{job_index}", response_model=JobOut)
+async def save_job_by_index(
     job_index: int,
-    role: str | None = None,
+    search_id: uuid.UUID,
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Save a job from search results by its index."""
-    # Re-run search to get the job (stateless design)
-    query = role
-    if not query:
-        result = await db.execute(
-            select(CareerRecommendation).where(
-                CareerRecommendation.user_id == user.id,
-                CareerRecommendation.is_selected.is_(True),
-            )
+    return await _save_from_snapshot(db, user, search_id, job_index, None)
+
+
+async def _save_from_snapshot(
+    db: AsyncSession,
+    user: User,
+    search_id: uuid.UUID,
+    job_index: int | None,
+    external_job_id: str | None,
+) -> JobOut:
+    result = await db.execute(
+        select(JobSearchSnapshot).where(
+            JobSearchSnapshot.id == search_id,
+            JobSearchSnapshot.user_id == user.id,
         )
-        selected = result.scalars().first()
-        if not selected:
-            raise HTTPException(status_code=400, detail="Select a career role first")
-        query = selected.job_role
+    )
+    snapshot = result.scalar_one_or_none()
+    if not snapshot:
+        raise HTTPException(status_code=404, detail="Search not found")
+    if snapshot.expires_at < datetime.now(timezone.utc):
+        raise HTTPException(status_code=410, detail="Search results expired, search again")
 
-    user_skills = user.profile.skills if user.profile else []
-    raw_jobs = await search_jobs(query=f"{query} fresher entry level")
-    ranked = rank_jobs(raw_jobs, user_skills, user.location_preference)
+    jobs = snapshot.jobs or []
+    if external_job_id:
+        job_data = next((j for j in jobs if j.get("external_job_id") == external_job_id), None)
+        if job_data is None:
+            raise HTTPException(status_code=404, detail="Job not found in search results")
+    else:
+        if job_index < 0 or job_index >= len(jobs):
+            raise HTTPException(status_code=404, detail="Invalid job index")
+        job_data = jobs[job_index]
+    description = job_data.get("description")
+    if description is None and job_data.get("external_job_id"):
+        # Role-insight results are stored without descriptions
+        description = await db.scalar(
+            select(CatalogJob.description).where(CatalogJob.external_job_id == job_data["external_job_id"])
+        )
 
-    if job_index < 0 or job_index >= len(ranked):
-        raise HTTPException(status_code=404, detail="Invalid job index")
+    # Saving the same posting twice returns the existing saved job
+    if job_data.get("external_job_id"):
+        result = await db.execute(
+            select(SavedJob).where(
+                SavedJob.user_id == user.id,
+                SavedJob.external_job_id == job_data["external_job_id"],
+            )
+        )
+        existing = result.scalars().first()
+        if existing:
+            return JobOut.model_validate(existing)
 
-    job_data = ranked[job_index]
     saved = SavedJob(
         user_id=user.id,
         external_job_id=job_data.get("external_job_id"),
@@ -90,7 +207,7 @@ async def save_job(
         location=job_data.get("location"),
         is_remote=job_data.get("is_remote", False),
         apply_url=job_data.get("apply_url"),
-        description=job_data.get("description"),
+        description=description,
         salary_range=job_data.get("salary_range"),
         match_score=job_data.get("match_score", 0),
         match_details=job_data.get("match_details"),
@@ -100,9 +217,44 @@ async def save_job(
     return JobOut.model_validate(saved)
 
 
-@router.get("/saved", response_model=list[JobOut])
-async def get_saved_jobs(user: User = Depends(get_current_user)):
-    return [JobOut.model_validate(j) for j in user.saved_jobs]
+_SAVED_LIST_COLUMNS = [getattr(SavedJob, f) for f in SavedJobSummary.model_fields]
+
+
+@router.get("/saved", response_model=SavedJobPage)
+async def get_saved_jobs(
+    status: list[str] | None = Query(None),
+    remote: bool | None = None,
+    min_score: float | None = None,
+    cursor: str | None = None,
+    limit: int = Query(20, ge=1, le=100),
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Saved jobs, newest first, keyset-paginated on ``(created_at, id)``.
+
+    Only list columns are read; fetch one job for its full description.
+    Pass the returned ``next_cursor`` as ``cursor`` for the next page.
+    """
+    stmt = (
+        select(*_SAVED_LIST_COLUMNS)
+        .where(SavedJob.user_id == user.id)
+        .order_by(SavedJob.created_at.desc(), SavedJob.id.desc())
+        .limit(limit + 1)
+    )
+    if status:
+        stmt = stmt.where(SavedJob.status.in_(status))
+    if remote is not None:
+        stmt = stmt.where(SavedJob.is_remote.is_(remote))
+    if min_score is not None:
+        stmt = stmt.where(SavedJob.match_score >= min_score)
+    if cursor:
+        created_at, job_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(SavedJob.created_at, SavedJob.id) < tuple_(created_at, job_id))
+
+    rows = (await db.execute(stmt)).mappings().all()
+    page = [SavedJobSummary(**row) for row in rows[:limit]]
+    next_cursor = encode_cursor(page[-1].created_at, page[-1].id) if len(rows) > limit else None
+    return SavedJobPage(jobs=page, next_cursor=next_cursor)
 
 
 @router.patch("/saved/{job_id}/status", response_model=JobOut)
@@ -121,3 +273,68 @@ async def update_job_status(
     job.status = body.status
     await db.flush()
     return JobOut.model_validate(job)
+
+
+@router.get("/{job_id}", response_model=JobOut)
+async def get_job_detail(
+    job_id: str,
+    search_id: uuid.UUID | None = None,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Full job, description included.
+
+    ``job_id`` is a saved job's ``id`` or a posting's ``external_job_id``.
+    Postings are looked up in the given search snapshot, then the catalog,
+    the user's feed and their latest unexpired search.
+    """
+    try:
+        saved_id = uuid.UUID(job_id)
+    except ValueError:
+        saved_id = None
+    if saved_id is not None:
+        result = await db.execute(
+            select(SavedJob).where(SavedJob.id == saved_id, SavedJob.user_id == user.id)
+        )
+        saved = result.scalar_one_or_none()
+        if saved:
+            return JobOut.model_validate(saved)
+
+    now = datetime.now(timezone.utc)
+    snapshots = select(JobSearchSnapshot.jobs).where(
+        JobSearchSnapshot.user_id == user.id,
+        JobSearchSnapshot.expires_at > now,
+        JobSearchSnapshot.jobs.contains([{"external_job_id": job_id}]),
+    )
+    if search_id is not None:
+        job = _find_in_jobs(
+            (await db.execute(snapshots.where(JobSearchSnapshot.id == search_id))).scalar(), job_id
+        )
+        # Stored without a description (role insights): the catalog has it
+        if job and "description" in job:
+            return JobOut(**job)
+
+    result = await db.execute(select(CatalogJob).where(CatalogJob.external_job_id == job_id))
+    posting = result.scalar_one_or_none()
+    if posting:
+        return JobOut.model_validate(posting)
+
+    result = await db.execute(
+        select(UserJobFeedEntry.job).where(
+            UserJobFeedEntry.user_id == user.id,
+            UserJobFeedEntry.external_job_id == job_id,
+        )
+    )
+    job = result.scalars().first()
+    if job:
+        return JobOut(**job)
+
+    result = await db.execute(snapshots.order_by(JobSearchSnapshot.created_at.desc()).limit(1))
+    job = _find_in_jobs(result.scalar(), job_id)
+    if job:
+        return JobOut(**job)
+    raise HTTPException(status_code=404, detail="Job not found")
+
+
+def _find_in_jobs(jobs: list[dict] | None, external_job_id: str) -> dict | None:
+    return next((j for j in jobs or [] if j.get("external_job_id") == external_job_id), None)
@@ -1,38 +1,58 @@
 """Full onboarding pipeline endpoint — powered by LangGraph."""
 
+import json
 import os
+import time
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
-from app.core.deps import get_current_user
+from app.core.deps import get_current_user, job_list_fields
 from app.db.session import get_db
-from app.models.career import CareerRecommendation
-from app.models.resume import ResumeProfile
+from app.models.pipeline import PipelineRun
 from app.models.user import User
-from app.services.pipeline import run_full_pipeline
+from app.services.pipeline import get_run_progress
+from app.services.pipeline_runner import (
+    completed_result,
+    enqueue_run,
+    follow_events,
+    has_live_task,
+    onboarding_result,
+)
+from app.services.resume_parser import upload_path
 
 settings = get_settings()
 router = APIRouter(prefix="/pipeline", tags=["pipeline"])
 
 
-@router.post("/onboard")
+def _run_links(run_id: uuid.UUID) -> dict:
+    base = f"{settings.API_V1_PREFIX}/pipeline/runs/{run_id}"
+    return {"status_url": base, "events_url": f"{base}/events"}
+
+
+@router.post("/onboard", status_code=status.HTTP_202_ACCEPTED)
 async def run_onboarding_pipeline(
     file: UploadFile,
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Run the full LangGraph onboarding pipeline in one call.
+    """Start the full LangGraph onboarding pipeline in the background.
 
     Steps executed:
     1. Parse resume (LLM + regex)
     2. Recommend top 5 career roles (LLM)
     3. Search & rank jobs for top role (RapidAPI + scoring)
-    4. ATS score the resume for top role (LLM)
-
-    Returns all results in a single response.
+    4. ATS score the resume for top role (LLM), concurrently with step 3
+
+    Answers 202 with a ``run_id`` right away; a task worker executes the run.
+    Follow progress on
+    ``GET /pipeline/runs/{run_id}/events`` (SSE: one event per finished step,
+    then ``completed`` with the full result) or poll
+    ``GET /pipeline/runs/{run_id}``. Each step is checkpointed; a failed run
+    continues with ``POST /pipeline/runs/{run_id}/resume``.
     """
     if not file.filename or not file.filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Only PDF files are supported")
@@ -43,65 +63,112 @@ async def run_onboarding_pipeline(
 
     # Save file
     os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
-    file_path = os.path.join(settings.UPLOAD_DIR, f"{user.id}_{uuid.uuid4().hex}.pdf")
+    file_path = upload_path(user.id)
     with open(file_path, "wb") as f:
         f.write(content)
 
-    # Run the full LangGraph pipeline
-    result = await run_full_pipeline(
-        user_id=str(user.id),
-        resume_file_path=file_path,
-        location_preference=user.location_preference,
-        remote_preference=user.remote_preference,
-    )
+    # Record the run first: its id keys the checkpoints and progress events
+    run = PipelineRun(user_id=user.id, resume_file_path=file_path)
+    db.add(run)
+    await db.flush()
+    await enqueue_run(db, run)
+    await db.commit()
 
-    # Persist parsed resume profile
-    profile = user.profile
-    if profile:
-        profile.resume_file_path = file_path
-        profile.raw_text = result.get("raw_text", "")
-        profile.skills = result.get("skills", [])
-        profile.experience = result.get("experience", [])
-        profile.education = result.get("education", [])
-        profile.total_experience_years = result.get("total_experience_years", 0.0)
-    else:
-        profile = ResumeProfile(
-            user_id=user.id,
-            resume_file_path=file_path,
-            raw_text=result.get("raw_text", ""),
-            skills=result.get("skills", []),
-            experience=result.get("experience", []),
-            education=result.get("education", []),
-            total_experience_years=result.get("total_experience_years", 0.0),
-        )
-        db.add(profile)
-
-    # Persist ATS score
-    ats = result.get("ats_result", {})
-    if ats:
-        profile.ats_score = ats.get("score", 0)
-        profile.ats_feedback = ats
-
-    # Persist career recommendations
-    for rec_data in result.get("recommendations", []):
-        rec = CareerRecommendation(
-            user_id=user.id,
-            job_role=rec_data["job_role"],
-            match_score=rec_data["match_score"],
-            matched_skills=rec_data.get("matched_skills", []),
-            missing_skills=rec_data.get("missing_skills", []),
-        )
-        db.add(rec)
+    return {"run_id": str(run.id), "status": run.status, **_run_links(run.id)}
 
-    await db.flush()
 
+@router.post("/runs/{run_id}/resume", status_code=status.HTTP_202_ACCEPTED)
+async def resume_onboarding_pipeline(
+    run_id: uuid.UUID,
+    response: Response,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Continue a failed or interrupted run from its last completed node.
+
+    Steps that already finished are not recomputed. A completed run is not
+    run again (200 with its status). A ``running`` run is only refused while
+    a task for it is still queued or running; one whose task is gone
+    (dead-lettered before it could record the failure) is resumed.
+    """
+    run = await _get_run(db, run_id, user)
+    if run.status == "completed":
+        response.status_code = status.HTTP_200_OK
+        return {"run_id": str(run.id), "status": run.status, **_run_links(run.id)}
+    if run.status == "running" and await has_live_task(db, run.id):
+        raise HTTPException(status_code=409, detail="Pipeline run is already running")
+
+    run.status = "running"
+    run.error = None
+    await enqueue_run(db, run, resume=True)
+    await db.commit()
+
+    return {"run_id": str(run.id), "status": run.status, **_run_links(run.id)}
+
+
+@router.get("/runs/{run_id}")
+async def get_pipeline_run(
+    run_id: uuid.UUID,
+    fields: tuple[str, ...] = Depends(job_list_fields),
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Status of a run, the nodes it got through, and its result once completed."""
+    run = await _get_run(db, run_id, user)
+    progress = await get_run_progress(str(run.id))
+    result = None
+    if run.status == "completed":
+        # Past PIPELINE_CHECKPOINT_RETENTION_HOURS only the completed event's result is left
+        result = onboarding_result(progress["state"], fields) if progress else await completed_result(db, run.id)
     return {
-        "status": "completed",
-        "skills_extracted": result.get("skills", []),
-        "experience_years": result.get("total_experience_years", 0),
-        "career_recommendations": result.get("recommendations", []),
-        "top_role": result.get("selected_role", ""),
-        "matched_jobs": result.get("matched_jobs", [])[:10],  # Top 10 in response
-        "ats_score": ats,
-        "errors": result.get("errors", []),
+        "run_id": str(run.id),
+        "status": run.status,
+        "error": run.error,
+        "completed_nodes": progress["completed_nodes"] if progress else [],
+        "next_nodes": progress["next_nodes"] if progress else [],
+        "result": result,
+        "created_at": run.created_at,
+        "updated_at": run.updated_at,
     }
+
+
+@router.get("/runs/{run_id}/events")
+async def stream_pipeline_events(
+    run_id: uuid.UUID,
+    last_event_id: int = Header(0, alias="Last-Event-ID"),
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Server-sent events for a run: one per finished step, then a terminal event.
+
+    Event names are node names (``parse_resume``, ``recommend_careers``,
+    ``search_jobs``, ``ats_score``, ``join_results``) carrying that step's
+    partial result, then ``completed`` (full result) or ``failed``. Past
+    events are replayed first. A reconnecting client sends ``Last-Event-ID``
+    and gets only what it missed.
+    """
+    run = await _get_run(db, run_id, user)
+
+    async def events():
+        last_write = time.monotonic()
+        async for event in follow_events(run.id, last_event_id):
+            if event is None:
+                if time.monotonic() - last_write >= settings.PIPELINE_SSE_KEEPALIVE_SECONDS:
+                    last_write = time.monotonic()
+                    yield ": keep-alive\n\n"
+                continue
+            last_write = time.monotonic()
+            yield f"id: {event.id}\nevent: {event.event}\ndata: {json.dumps(event.data, default=str)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _get_run(db: AsyncSession, run_id: uuid.UUID, user: User) -> PipelineRun:
+    run = await db.get(PipelineRun, run_id)
+    if not run or run.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Pipeline run not found")
+    return run
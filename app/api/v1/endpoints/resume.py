@@ -1,28 +1,24 @@
 import os
-import uuid
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
-from app.core.deps import get_current_user
+from app.core.deps import get_current_user, get_current_user_with_profile
 from app.db.session import get_db
-from app.models.resume import ResumeProfile
 from app.models.user import User
 from app.schemas.resume import ATSScoreOut, ResumeProfileOut
+from app.schemas.task import TaskOut
 from app.services.ats_scorer import score_resume
-from app.services.resume_parser import parse_resume_with_llm
+from app.services.resume_parser import parse_resume_with_llm, save_parsed_resume, upload_path
+from app.services.role_insights import cached_role_insight
+from app.services.task_queue import enqueue
 
 settings = get_settings()
 router = APIRouter(prefix="/resume", tags=["resume"])
 
 
-@router.post("/upload", response_model=ResumeProfileOut, status_code=status.HTTP_201_CREATED)
-async def upload_resume(
-    file: UploadFile,
-    user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
-):
+async def _save_upload(file: UploadFile, user: User) -> str:
     if not file.filename or not file.filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Only PDF files are supported")
 
@@ -30,42 +26,42 @@ async def upload_resume(
     if len(content) > settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024:
         raise HTTPException(status_code=400, detail=f"File exceeds {settings.MAX_UPLOAD_SIZE_MB}MB limit")
 
-    # Save file
     os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
-    file_path = os.path.join(settings.UPLOAD_DIR, f"{user.id}_{uuid.uuid4().hex}.pdf")
+    file_path = upload_path(user.id)
     with open(file_path, "wb") as f:
         f.write(content)
+    return file_path
+
+
+@router.post("/upload", response_model=ResumeProfileOut, status_code=status.HTTP_201_CREATED)
+async def upload_resume(
+    file: UploadFile,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    file_path = await _save_upload(file, user)
 
     # Parse with LLM (falls back to regex automatically)
     parsed = await parse_resume_with_llm(file_path)
 
-    # Upsert profile
-    profile = user.profile
-    if profile:
-        profile.resume_file_path = file_path
-        profile.raw_text = parsed["raw_text"]
-        profile.skills = parsed["skills"]
-        profile.experience = parsed["experience"]
-        profile.education = parsed["education"]
-        profile.total_experience_years = parsed["total_experience_years"]
-    else:
-        profile = ResumeProfile(
-            user_id=user.id,
-            resume_file_path=file_path,
-            raw_text=parsed["raw_text"],
-            skills=parsed["skills"],
-            experience=parsed["experience"],
-            education=parsed["education"],
-            total_experience_years=parsed["total_experience_years"],
-        )
-        db.add(profile)
-
-    await db.flush()
+    profile = await save_parsed_resume(db, user.id, file_path, parsed)
     return ResumeProfileOut.model_validate(profile)
 
 
+@router.post("/upload-async", response_model=TaskOut, status_code=status.HTTP_202_ACCEPTED)
+async def upload_resume_async(
+    file: UploadFile,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Store the PDF and queue its parse; poll ``GET /tasks/{id}`` for the profile."""
+    file_path = await _save_upload(file, user)
+    task = await enqueue(db, "resume.parse", {"file_path": file_path}, user_id=user.id)
+    return TaskOut.model_validate(task)
+
+
 @router.get("/profile", response_model=ResumeProfileOut)
-async def get_profile(user: User = Depends(get_current_user)):
+async def get_profile(user: User = Depends(get_current_user_with_profile)):
     if not user.profile:
         raise HTTPException(status_code=404, detail="No resume uploaded yet")
     return ResumeProfileOut.model_validate(user.profile)
@@ -74,10 +70,18 @@ async def get_profile(user: User = Depends(get_current_user)):
 @router.post("/ats-score", response_model=ATSScoreOut)
 async def get_ats_score(
     target_role: str | None = None,
-    user: User = Depends(get_current_user),
+    use_llm: bool | None = None,
+    user: User = Depends(get_current_user_with_profile),
+    db: AsyncSession = Depends(get_db),
 ):
     if not user.profile or not user.profile.raw_text:
         raise HTTPException(status_code=404, detail="Upload a resume first")
 
-    result = await score_resume(user.profile.raw_text, target_role)
+    # Roles evaluated by POST /career/explore (or onboarding) are a stored read
+    if target_role and use_llm in (None, settings.ATS_USE_LLM):
+        insight = await cached_role_insight(db, user, user.profile, target_role)
+        if insight is not None and insight.ats:
+            return ATSScoreOut(**insight.ats)
+
+    result = await score_resume(user.profile.raw_text, target_role, use_llm=use_llm)
     return ATSScoreOut(**result)
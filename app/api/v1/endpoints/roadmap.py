@@ -5,14 +5,13 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_current_user
+from app.core.deps import get_current_user, get_current_user_with_profile
 from app.db.session import get_db
-from app.models.career import CareerRecommendation
 from app.models.roadmap import RoadmapEntry
 from app.models.user import User
 from app.schemas.roadmap import ReferralMessageOut, ReferralMessageRequest, RoadmapEntryOut, UpdateProgress
 from app.services.llm_client import generate_referral_message
-from app.services.roadmap_generator import generate_daily_roadmap
+from app.services.roadmap_generator import create_roadmap
 
 router = APIRouter(prefix="/roadmap", tags=["roadmap"])
 
@@ -20,44 +19,10 @@ router = APIRouter(prefix="/roadmap", tags=["roadmap"])
 @router.post("/generate", response_model=list[RoadmapEntryOut])
 async def generate_roadmap(
     days: int = 7,
-    user: User = Depends(get_current_user),
+    user: User = Depends(get_current_user_with_profile),
     db: AsyncSession = Depends(get_db),
 ):
-    # Find selected role
-    result = await db.execute(
-        select(CareerRecommendation).where(
-            CareerRecommendation.user_id == user.id,
-            CareerRecommendation.is_selected.is_(True),
-        )
-    )
-    selected = result.scalars().first()
-    target_role = selected.job_role if selected else "Software Developer"
-
-    # Get user skills for personalized roadmap
-    skills = user.profile.skills if user.profile else []
-    exp_years = user.profile.total_experience_years if user.profile else 0.0
-
-    plan = await generate_daily_roadmap(
-        target_role=target_role,
-        skills=skills,
-        experience_years=exp_years,
-        total_days=days,
-    )
-
-    entries: list[RoadmapEntry] = []
-    for item in plan:
-        entry = RoadmapEntry(
-            user_id=user.id,
-            date=date.fromisoformat(item["date"]),
-            jobs_to_apply=item["jobs_to_apply"],
-            referrals_to_send=item["referrals_to_send"],
-            recruiters_to_connect=item["recruiters_to_connect"],
-            daily_tips=item["daily_tips"],
-        )
-        db.add(entry)
-        entries.append(entry)
-
-    await db.flush()
+    entries = await create_roadmap(db, user.id, user.profile, days)
     return [RoadmapEntryOut.model_validate(e) for e in entries]
 
 
@@ -110,7 +75,7 @@ async def update_progress(
 @router.post("/referral-message", response_model=ReferralMessageOut)
 async def get_referral_message(
     body: ReferralMessageRequest,
-    user: User = Depends(get_current_user),
+    user: User = Depends(get_current_user_with_profile),
 ):
     background = f"{user.full_name}"
     if user.profile and user.profile.skills:
@@ -0,0 +1,52 @@
+"""Background tasks — submit LLM-heavy work to the task queue and poll it."""
+
+import uuid
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.deps import get_current_user
+from app.db.session import get_db
+from app.models.user import User
+from app.schemas.task import TaskCreate, TaskOut
+from app.services.task_queue import enqueue, get_task
+from app.workers.tasks import USER_TASK_KINDS
+
+router = APIRouter(prefix="/tasks", tags=["tasks"])
+
+
+@router.post("", response_model=TaskOut, status_code=status.HTTP_202_ACCEPTED)
+async def submit_task(
+    body: TaskCreate,
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key"),
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Queue a task for the workers; poll ``GET /tasks/{id}`` for its result.
+
+    Re-sending the same ``Idempotency-Key`` returns the original task.
+    """
+    if body.kind not in USER_TASK_KINDS:
+        raise HTTPException(status_code=400, detail=f"Unknown task kind. Allowed: {', '.join(USER_TASK_KINDS)}")
+    task = await enqueue(
+        db,
+        body.kind,
+        body.params,
+        user_id=user.id,
+        idempotency_key=f"{user.id}:{idempotency_key}" if idempotency_key else None,
+    )
+    if task.user_id != user.id or task.kind != body.kind:
+        raise HTTPException(status_code=409, detail="Idempotency-Key already used for another task")
+    return TaskOut.model_validate(task)
+
+
+@router.get("/{task_id}", response_model=TaskOut)
+async def get_task_status(
+    task_id: uuid.UUID,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    task = await get_task(db, task_id)
+    if not task or task.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return TaskOut.model_validate(task)
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.auth_cache import invalidate_principal
 from app.core.deps import get_current_user
 from app.db.session import get_db
 from app.models.user import User
@@ -28,5 +29,8 @@ async def onboard(
         user.remote_preference = body.remote_preference
     if body.salary_expectation is not None:
         user.salary_expectation = body.salary_expectation
-    await db.flush()
+    await db.commit()
+    # The commit already scheduled this; awaiting it means the response only
+    # goes out once the cache (shared with redis) has dropped the old preferences
+    await invalidate_principal(user.id)
     return UserOut.model_validate(user)
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, career, jobs, pipeline, resume, roadmap, users
+from app.api.v1.endpoints import auth, career, jobs, pipeline, resume, roadmap, tasks, users
 
 api_router = APIRouter()
 api_router.include_router(auth.router)
@@ -10,3 +10,4 @@ api_router.include_router(career.router)
 api_router.include_router(jobs.router)
 api_router.include_router(roadmap.router)
 api_router.include_router(pipeline.router)
+api_router.include_router(tasks.router)
@@ -0,0 +1,387 @@
+"""Caches behind ``get_current_user``: decoded tokens and active principals.
+
+Every authenticated request used to decode its JWT and run
+``SELECT users WHERE id = ...``, including pollers like ``/roadmap/today``.
+
+- Decoded tokens are kept per token until the token's ``exp`` (bounded LRU,
+  TOKEN_CACHE_MAX_ENTRIES), so a token is verified once, not per request.
+- Active users' column values (the lean principal, no relationships) are
+  kept for PRINCIPAL_CACHE_TTL_SECONDS. The ``memory`` backend is a bounded
+  LRU per process. The ``redis`` backend (REDIS_URL, needs the ``redis``
+  package) is shared by all API processes, so an invalidation reaches
+  every one of them. ``auto`` (the default) picks redis when WEB_CONCURRENCY
+  > 1 and the package is installed, memory otherwise. An empty
+  PRINCIPAL_CACHE_BACKEND disables the cache.
+
+An invalidation in the memory backend only reaches its own process; the
+others keep the old row until their entry expires. With WEB_CONCURRENCY > 1
+its TTL is therefore capped at MULTI_WORKER_MEMORY_TTL seconds. Replicas on
+separate hosts don't show up in WEB_CONCURRENCY: run them with redis.
+
+A hit becomes a ``User`` attached to the request's session without a query,
+so endpoints can still modify and flush it. Every committed change to a
+``users`` row made through a session (ORM attribute changes, deletes, bulk
+``update(User)`` / ``delete(User)``) invalidates its principal after the
+commit (``invalidate_principals_on_commit``, installed on the app's
+``AppSession`` class only), so a new write path (deactivation, an admin edit)
+can't forget it. Resume and recommendation changes need no invalidation:
+relationships are never cached.
+
+One race remains: a request that missed the cache and read the row just
+before the commit can store that old row just after the invalidation. It is
+then served until PRINCIPAL_CACHE_TTL_SECONDS, as if the invalidation had
+come that much later. That bound is accepted rather than versioning entries.
+"""
+
+import asyncio
+import importlib.util
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.config import get_settings
+from app.core.security import decode_access_token
+from app.models.user import User
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+_COLUMNS = {attr.key: attr.columns[0] for attr in User.__mapper__.column_attrs}
+
+# Memory backend TTL when other worker processes can't see its invalidations
+MULTI_WORKER_MEMORY_TTL = 5
+
+
+@dataclass
+class AuthCacheStats:
+    principal_hits: int = 0
+    principal_misses: int = 0
+    invalidations: int = 0
+    backend_errors: int = 0
+    token_hits: int = 0
+    token_misses: int = 0
+
+    def as_dict(self) -> dict:
+        lookups = self.principal_hits + self.principal_misses
+        tokens = self.token_hits + self.token_misses
+        return {
+            "backend": getattr(get_principal_store(), "name", "disabled"),
+            "principal_hits": self.principal_hits,
+            "principal_misses": self.principal_misses,
+            "principal_hit_ratio": round(self.principal_hits / lookups, 4) if lookups else 0.0,
+            "db_queries_saved": self.principal_hits,
+            "invalidations": self.invalidations,
+            "backend_errors": self.backend_errors,
+            "token_hits": self.token_hits,
+            "token_misses": self.token_misses,
+            "token_hit_ratio": round(self.token_hits / tokens, 4) if tokens else 0.0,
+            "tokens_cached": len(_tokens),
+        }
+
+
+stats = AuthCacheStats()
+
+
+def get_auth_cache_stats() -> dict:
+    return stats.as_dict()
+
+
+# --- Decoded tokens ---
+
+_tokens: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+
+def decode_token_cached(token: str) -> dict:
+    """``decode_access_token`` once per token; the result is reused until ``exp``."""
+    entry = _tokens.get(token)
+    if entry is not None and entry[0] > time.time():
+        stats.token_hits += 1
+        _tokens.move_to_end(token)
+        return entry[1]
+    _tokens.pop(token, None)
+    stats.token_misses += 1
+    payload = decode_access_token(token)  # raises on a bad or expired token: nothing cached
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        _tokens[token] = (float(exp), payload)
+        while len(_tokens) > settings.TOKEN_CACHE_MAX_ENTRIES:
+            _tokens.popitem(last=False)
+    return payload
+
+
+# --- Principals ---
+
+def _dump(user: User) -> dict:
+    return {key: getattr(user, key) for key in _COLUMNS}
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, (uuid.UUID, datetime)):
+        return value.isoformat() if isinstance(value, datetime) else str(value)
+    return value
+
+
+def _decode(key: str, value: Any) -> Any:
+    if value is None:
+        return None
+    python_type = _COLUMNS[key].type.python_type
+    if python_type is uuid.UUID:
+        return uuid.UUID(value)
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    return value
+
+
+class MemoryPrincipalStore:
+    name = "memory"
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[uuid.UUID, tuple[float, dict]] = OrderedDict()
+
+    async def get(self, user_id: uuid.UUID) -> dict | None:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            self._entries.pop(user_id, None)
+            return None
+        self._entries.move_to_end(user_id)
+        return entry[1]
+
+    async def set(self, user_id: uuid.UUID, data: dict) -> None:
+        self._entries[user_id] = (time.monotonic() + self.ttl, data)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, user_id: uuid.UUID) -> None:
+        self._entries.pop(user_id, None)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+    async def close(self) -> None:
+        self._entries.clear()
+
+
+class RedisPrincipalStore:
+    name = "redis"
+    prefix = "principal:"
+
+    def __init__(self, url: str, ttl: float):
+        import redis.asyncio as redis  # optional dependency, only for this backend
+
+        self.ttl = ttl
+        self._redis = redis.from_url(url)
+
+    @classmethod
+    def _key(cls, user_id: uuid.UUID) -> str:
+        return f"{cls.prefix}{user_id}"
+
+    async def get(self, user_id: uuid.UUID) -> dict | None:
+        raw = await self._redis.get(self._key(user_id))
+        if raw is None:
+            return None
+        return {key: _decode(key, value) for key, value in json.loads(raw).items() if key in _COLUMNS}
+
+    async def set(self, user_id: uuid.UUID, data: dict) -> None:
+        payload = json.dumps({key: _encode(value) for key, value in data.items()})
+        await self._redis.set(self._key(user_id), payload, ex=max(1, int(self.ttl)))
+
+    async def delete(self, user_id: uuid.UUID) -> None:
+        await self._redis.delete(self._key(user_id))
+
+    async def clear(self) -> None:
+        keys = [key async for key in self._redis.scan_iter(match=f"{self.prefix}*")]
+        if keys:
+            await self._redis.delete(*keys)
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+_store: MemoryPrincipalStore | RedisPrincipalStore | None = None
+_store_ready = False
+_pending_invalidations: set[asyncio.Task] = set()
+
+
+def _backend() -> str:
+    backend = settings.PRINCIPAL_CACHE_BACKEND
+    if backend != "auto":
+        return backend
+    if settings.WEB_CONCURRENCY > 1 and importlib.util.find_spec("redis") is not None:
+        return "redis"
+    return "memory"
+
+
+def _memory_ttl() -> float:
+    ttl = settings.PRINCIPAL_CACHE_TTL_SECONDS
+    if settings.WEB_CONCURRENCY > 1 and ttl > MULTI_WORKER_MEMORY_TTL:
+        logger.warning(
+            f"Principal cache: memory backend with {settings.WEB_CONCURRENCY} workers, TTL capped at "
+            f"{MULTI_WORKER_MEMORY_TTL}s (invalidations only reach their own process; use redis)"
+        )
+        return MULTI_WORKER_MEMORY_TTL
+    return ttl
+
+
+def get_principal_store() -> MemoryPrincipalStore | RedisPrincipalStore | None:
+    global _store, _store_ready
+    if not _store_ready:
+        backend = _backend()
+        if backend == "memory":
+            _store = MemoryPrincipalStore(_memory_ttl(), settings.PRINCIPAL_CACHE_MAX_ENTRIES)
+        elif backend == "redis":
+            _store = RedisPrincipalStore(settings.REDIS_URL, settings.PRINCIPAL_CACHE_TTL_SECONDS)
+        elif backend:
+            raise ValueError(f"Unknown PRINCIPAL_CACHE_BACKEND: {backend!r}")
+        _store_ready = True
+    return _store
+
+
+def set_principal_store(store: MemoryPrincipalStore | RedisPrincipalStore | None) -> None:
+    global _store, _store_ready
+    _store, _store_ready = store, True
+
+
+async def close_principal_store() -> None:
+    global _store, _store_ready
+    if _pending_invalidations:
+        await asyncio.gather(*_pending_invalidations, return_exceptions=True)
+    if _store is not None:
+        await _store.close()
+    _store, _store_ready = None, False
+
+
+async def cached_principal(db, user_id: uuid.UUID) -> User | None:
+    """The cached principal attached to ``db`` (no query), or None on a miss."""
+    store = get_principal_store()
+    if store is None:
+        return None
+    try:
+        data = await store.get(user_id)
+    except Exception as e:
+        # A cache outage costs a query per request, never a failed request
+        stats.backend_errors += 1
+        logger.warning(f"Principal cache read failed: {e}")
+        data = None
+    if data is None:
+        stats.principal_misses += 1
+        return None
+    stats.principal_hits += 1
+    user = User(**data)
+    make_transient_to_detached(user)
+    return await db.merge(user, load=False)
+
+
+async def remember_principal(user: User) -> None:
+    """Cache an active user's columns after a database load."""
+    store = get_principal_store()
+    if store is None or not user.is_active:
+        return
+    try:
+        await store.set(user.id, _dump(user))
+    except Exception as e:
+        stats.backend_errors += 1
+        logger.warning(f"Principal cache write failed: {e}")
+
+
+async def invalidate_principal(user_id: uuid.UUID) -> None:
+    """Drop a user's cached principal.
+
+    Commits through a session with ``invalidate_principals_on_commit`` do this
+    on their own; awaiting it is for code that must not return before the
+    cache has forgotten the old row.
+    """
+    store = get_principal_store()
+    if store is None:
+        return
+    stats.invalidations += 1
+    try:
+        await store.delete(user_id)
+    except Exception as e:
+        stats.backend_errors += 1
+        logger.warning(f"Principal cache invalidation failed for {user_id}: {e}")
+
+
+async def clear_principals() -> None:
+    """Drop every cached principal (after a bulk change to the users table)."""
+    store = get_principal_store()
+    if store is None:
+        return
+    stats.invalidations += 1
+    try:
+        await store.clear()
+    except Exception as e:
+        stats.backend_errors += 1
+        logger.warning(f"Principal cache clear failed: {e}")
+
+
+# --- Invalidation on commit ---
+
+_CHANGED = "changed_principals"
+_ALL_USERS = "*"
+
+
+async def _invalidate_changed(changed: set) -> None:
+    if _ALL_USERS in changed:
+        await clear_principals()
+        return
+    for user_id in changed:
+        await invalidate_principal(user_id)
+
+
+def invalidate_principals_on_commit(session_class) -> None:
+    """Invalidate the principals of the user rows each committed transaction changed.
+
+    Changed ids are collected per session as they are flushed and invalidated
+    once the commit went through, so a request that reads the row afterwards
+    caches the new one (see the module docstring for a concurrent miss). A
+    bulk update or delete on ``User`` can't name its rows: it clears the whole
+    cache. A rollback keeps what was collected (an extra invalidation later is
+    harmless, a missed one is not). Statements on ``User.__table__`` bypass
+    the ORM and are not seen.
+    """
+    from sqlalchemy import event
+
+    def changed(session) -> set:
+        return session.info.setdefault(_CHANGED, set())
+
+    @event.listens_for(session_class, "after_flush")
+    def _after_flush(session, flush_context):
+        # The session still shows its pre-flush dirty / deleted lists here
+        ids = {
+            obj.id for obj in session.dirty
+            if isinstance(obj, User) and session.is_modified(obj, include_collections=False)
+        }
+        ids.update(obj.id for obj in session.deleted if isinstance(obj, User))
+        if ids:
+            changed(session).update(ids)
+
+    @event.listens_for(session_class, "do_orm_execute")
+    def _bulk(orm_execute_state):
+        if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+            return
+        if any(mapper.class_ is User for mapper in orm_execute_state.all_mappers):
+            changed(orm_execute_state.session).add(_ALL_USERS)
+
+    @event.listens_for(session_class, "after_commit")
+    def _after_commit(session):
+        ids = session.info.pop(_CHANGED, None)
+        if not ids:
+            return
+        try:
+            task = asyncio.get_running_loop().create_task(_invalidate_changed(ids))
+        except RuntimeError:
+            return  # no event loop (sync caller): its entries expire after the TTL
+        _pending_invalidations.add(task)
+        task.add_done_callback(_pending_invalidations.discard)
@@ -1,31 +1,124 @@
 """FastAPI dependencies — auth, DB session, etc."""
 
+import secrets
 import uuid
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, Query, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.core.security import decode_access_token
+from app.core.auth_cache import cached_principal, decode_token_cached, remember_principal
+from app.core.config import get_settings
 from app.db.session import get_db
 from app.models.user import User
+from app.schemas.job import JOB_LIST_DEFAULT_FIELDS, JobListItem
 
+settings = get_settings()
 bearer_scheme = HTTPBearer()
 
 
-async def get_current_user(
-    creds: HTTPAuthorizationCredentials = Depends(bearer_scheme),
-    db: AsyncSession = Depends(get_db),
+async def _load_relationships(db: AsyncSession, user: User, relationships: tuple[str, ...]) -> None:
+    """Load relationships onto a cached (query-less) principal: one query each."""
+    for name in relationships:
+        prop = getattr(User, name).property
+        (local, remote), = prop.local_remote_pairs
+        result = await db.execute(select(prop.mapper.class_).where(remote == getattr(user, local.key)))
+        rows = list(result.scalars())
+        set_committed_value(user, name, rows if prop.uselist else (rows[0] if rows else None))
+
+
+async def _authenticate(
+    creds: HTTPAuthorizationCredentials,
+    db: AsyncSession,
+    relationships: tuple[str, ...] = (),
+    options: tuple = (),
 ) -> User:
     try:
-        payload = decode_access_token(creds.credentials)
+        payload = decode_token_cached(creds.credentials)
+        if payload.get("purpose") is not None:
+            raise ValueError("not an access token")  # e.g. a set-password invite
         user_id = uuid.UUID(payload["sub"])
     except Exception:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    user = await cached_principal(db, user_id)
+    if user is not None:
+        await _load_relationships(db, user, relationships)
+        return user
+
+    result = await db.execute(select(User).options(*options).where(User.id == user_id))
+    user = result.unique().scalar_one_or_none()
     if not user or not user.is_active:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found or inactive")
+    await remember_principal(user)
     return user
+
+
+async def get_current_user(
+    creds: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    """The authenticated user: no relationships, and usually no query.
+
+    Active principals are cached (``app.core.auth_cache``); on a miss this is
+    one primary-key query.
+
+    Accessing ``user.profile`` (or any relationship) on it raises; endpoints
+    that need related rows depend on ``current_user_with(...)`` instead.
+    """
+    return await _authenticate(creds, db)
+
+
+def current_user_with(*relationships: str):
+    """``get_current_user`` that also loads the named ``User`` relationships.
+
+    On a principal cache miss the one-to-one ``profile`` is joined into the
+    user query and collections are loaded with one extra ``IN`` query each;
+    on a hit each relationship is one query.
+    """
+    options = []
+    for name in relationships:
+        attr = getattr(User, name)
+        options.append(selectinload(attr) if attr.property.uselist else joinedload(attr))
+    options = tuple(options)
+
+    async def dependency(
+        creds: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+        db: AsyncSession = Depends(get_db),
+    ) -> User:
+        return await _authenticate(creds, db, relationships, options)
+
+    return dependency
+
+
+# Resume profile included (skills, raw_text): resume, career, jobs search, roadmap
+get_current_user_with_profile = current_user_with("profile")
+
+
+def require_stats_token(x_stats_token: str | None = Header(None)) -> None:
+    """Internal endpoints (``/stats``): STATS_TOKEN, or no token at all in development.
+
+    Anything else gets a 404, so the endpoint does not advertise itself.
+    """
+    if settings.STATS_TOKEN:
+        if x_stats_token and secrets.compare_digest(x_stats_token, settings.STATS_TOKEN):
+            return
+    elif settings.ENVIRONMENT == "development":
+        return
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+
+def job_list_fields(
+    fields: str | None = Query(None, description="Comma-separated job fields to return"),
+) -> tuple[str, ...]:
+    """``?fields=`` for job list endpoints; defaults to the compact list view."""
+    if not fields:
+        return JOB_LIST_DEFAULT_FIELDS
+    picked = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in picked if f not in JobListItem.model_fields]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown job fields: {', '.join(unknown)}")
+    return picked
@@ -1,3 +1,4 @@
+import hashlib
 from datetime import datetime, timedelta, timezone
 
 import bcrypt
@@ -13,11 +14,13 @@ def hash_password(password: str) -> str:
 
 
 def verify_password(plain: str, hashed: str) -> bool:
+    if not hashed:
+        return False  # no password set yet (invited account)
     return bcrypt.checkpw(plain.encode(), hashed.encode())
 
 
-def create_access_token(subject: str, extra: dict | None = None) -> str:
-    expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+def create_access_token(subject: str, extra: dict | None = None, expires_minutes: int | None = None) -> str:
+    expire = datetime.now(timezone.utc) + timedelta(minutes=expires_minutes or settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     payload = {"sub": subject, "exp": expire, "iat": datetime.now(timezone.utc)}
     if extra:
         payload.update(extra)
@@ -26,3 +29,29 @@ def create_access_token(subject: str, extra: dict | None = None) -> str:
 
 def decode_access_token(token: str) -> dict:
     return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+
+
+# --- Set-password (invite) tokens ---
+
+SET_PASSWORD = "set_password"
+
+
+def _password_fingerprint(hashed_password: str) -> str:
+    return hashlib.sha256(hashed_password.encode()).hexdigest()[:16]
+
+
+def create_set_password_token(user_id: str, hashed_password: str) -> str:
+    """A token that sets the user's password once.
+
+    It carries a fingerprint of the current hash, so it stops working as soon
+    as the password changes (single use). Not an access token.
+    """
+    return create_access_token(
+        user_id,
+        {"purpose": SET_PASSWORD, "pwd": _password_fingerprint(hashed_password)},
+        expires_minutes=settings.SET_PASSWORD_TOKEN_EXPIRE_HOURS * 60,
+    )
+
+
+def set_password_token_matches(payload: dict, hashed_password: str) -> bool:
+    return payload.get("purpose") == SET_PASSWORD and payload.get("pwd") == _password_fingerprint(hashed_password)
@@ -0,0 +1,408 @@
+"""Lightweight tracing — spans with durations and attributes, per request / run.
+
+A trace is started for each API request (``trace_middleware``), each queued
+task and each onboarding run. A run's trace id is its run id, so every
+attempt of a resumed run lands in the same trace. Inside a trace, ``span()``
+/ ``@traced`` nest through ``contextvars``. That covers LangGraph nodes, the
+speculative job search task and SQLAlchemy statements (``instrument_engine``)
+without passing anything through call signatures. Outside a trace they are
+no-ops.
+
+When a trace finishes, its critical path (the chain of spans the trace
+actually waited on) is computed and logged. The trace is exported according
+to TRACE_EXPORTER (comma-separated):
+
+- ``log``: critical-path summary only
+- ``json``: one JSON line per trace (spans + summary) appended to TRACE_JSON_PATH;
+  ``python scripts/trace_summary.py`` prints it
+- ``otlp``: OTLP/HTTP JSON to TRACE_OTLP_ENDPOINT (a local collector, Jaeger, Tempo…)
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import os
+import re
+import time
+import uuid
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from app.core.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+_TRACE_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+@dataclass(slots=True)
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    start_ns: int
+    end_ns: int = 0
+    attributes: dict = field(default_factory=dict)
+    error: str | None = None
+
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    @property
+    def duration_ms(self) -> float:
+        return round((self.end_ns - self.start_ns) / 1e6, 2)
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "duration_ms": self.duration_ms,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+@dataclass(slots=True)
+class Trace:
+    trace_id: str
+    root: Span
+    spans: list[Span] = field(default_factory=list)
+    dropped: int = 0
+
+
+_current_trace: ContextVar[Trace | None] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+_pending_exports: set[asyncio.Task] = set()
+
+
+def tracing_enabled() -> bool:
+    return bool(settings.TRACE_EXPORTER.strip())
+
+
+def current_trace_id() -> str | None:
+    trace = _current_trace.get()
+    return trace.trace_id if trace else None
+
+
+def normalize_trace_id(value: str | uuid.UUID | None) -> str:
+    """A 32-hex trace id: a run id / UUID as-is, anything else gets a fresh one."""
+    if isinstance(value, uuid.UUID):
+        return value.hex
+    if value:
+        candidate = value.replace("-", "").lower()
+        if _TRACE_ID.match(candidate):
+            return candidate
+    return uuid.uuid4().hex
+
+
+def _new_span(trace: Trace, name: str, parent: Span | None, attributes: dict) -> Span:
+    return Span(
+        name=name,
+        trace_id=trace.trace_id,
+        span_id=os.urandom(8).hex(),
+        parent_id=parent.span_id if parent else None,
+        start_ns=time.time_ns(),
+        attributes=attributes,
+    )
+
+
+def _record_error(span: Span, exc: BaseException) -> None:
+    if isinstance(exc, asyncio.CancelledError):
+        span.attributes["cancelled"] = True
+    else:
+        span.error = f"{type(exc).__name__}: {exc}"[:500]
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Span | None]:
+    """Time a block as a child of the current span (no-op outside a trace)."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+    if len(trace.spans) >= settings.TRACE_MAX_SPANS:
+        trace.dropped += 1
+        yield None
+        return
+    current = _new_span(trace, name, _current_span.get(), attributes)
+    trace.spans.append(current)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        _record_error(current, e)
+        raise
+    finally:
+        current.end_ns = time.time_ns()
+        _current_span.reset(token)
+
+
+@contextmanager
+def start_trace(name: str, trace_id: str | uuid.UUID | None = None, **attributes) -> Iterator[Span | None]:
+    """Root span of a new trace, exported when the block exits.
+
+    Inside an active trace this is just a child span, so e.g. a run started
+    from a traced task stays in the task's trace.
+    """
+    if not tracing_enabled():
+        yield None
+        return
+    if _current_trace.get() is not None:
+        with span(name, **attributes) as current:
+            yield current
+        return
+
+    tid = normalize_trace_id(trace_id)
+    root = Span(name=name, trace_id=tid, span_id=os.urandom(8).hex(), parent_id=None,
+                start_ns=time.time_ns(), attributes=attributes)
+    trace = Trace(trace_id=tid, root=root, spans=[root])
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span.set(root)
+    try:
+        yield root
+    except BaseException as e:
+        _record_error(root, e)
+        raise
+    finally:
+        root.end_ns = time.time_ns()
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+        _finish_trace(trace)
+
+
+def traced(name: str, **attributes):
+    """Decorator: run an async function inside ``span(name)``."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            with span(name, **attributes):
+                return await fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# --- Critical path ---
+
+def critical_path(spans: list[Span]) -> list[dict]:
+    """The chain of spans the root waited on, oldest first.
+
+    Walks back from the root's end: at each level the child that finished
+    last (before the cursor) was blocking, the gaps between blocking children
+    are the parent's own time, and the walk recurses into each blocking
+    child. Returns ``[{"span", "ms"}]`` segments that sum to the root's
+    duration.
+    """
+    if not spans:
+        return []
+    children: dict[str | None, list[Span]] = defaultdict(list)
+    for s in spans:
+        children[s.parent_id].append(s)
+    segments: list[tuple[int, int, str]] = []
+
+    def walk(current: Span, end_ns: int) -> None:
+        cursor = min(current.end_ns, end_ns)
+        for child in sorted(children.get(current.span_id, ()), key=lambda s: s.end_ns, reverse=True):
+            if child.start_ns >= cursor or child.end_ns <= current.start_ns:
+                continue
+            child_end = min(child.end_ns, cursor)
+            if cursor > child_end:
+                segments.append((child_end, cursor, current.name))
+            walk(child, child_end)
+            cursor = max(child.start_ns, current.start_ns)
+        if cursor > current.start_ns:
+            segments.append((current.start_ns, cursor, current.name))
+
+    root = spans[0]
+    walk(root, root.end_ns)
+    segments.sort()
+
+    path: list[dict] = []
+    for start, end, name in segments:
+        ms = (end - start) / 1e6
+        if path and path[-1]["span"] == name:
+            path[-1]["ms"] += ms
+        else:
+            path.append({"span": name, "ms": ms})
+    for step in path:
+        step["ms"] = round(step["ms"], 1)
+    return [step for step in path if step["ms"] > 0]
+
+
+def trace_summary(trace: Trace) -> dict:
+    return {
+        "trace_id": trace.trace_id,
+        "name": trace.root.name,
+        "duration_ms": trace.root.duration_ms,
+        "attributes": trace.root.attributes,
+        "error": trace.root.error,
+        "spans": len(trace.spans),
+        "dropped_spans": trace.dropped,
+        "critical_path": critical_path(trace.spans),
+    }
+
+
+# --- Export ---
+
+def _finish_trace(trace: Trace) -> None:
+    for s in trace.spans:
+        if not s.end_ns:  # still running (e.g. an abandoned speculative task)
+            s.end_ns = trace.root.end_ns
+            s.attributes["unfinished"] = True
+
+    exporters = {e.strip() for e in settings.TRACE_EXPORTER.split(",") if e.strip()}
+    summary = trace_summary(trace)
+    path = " → ".join(f"{step['span']} {step['ms']:.0f}ms" for step in summary["critical_path"])
+    logger.info(f"Trace {summary['name']} {trace.trace_id} {summary['duration_ms']:.0f}ms; critical path: {path}")
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None  # sync caller
+    if "json" in exporters:
+        if loop:
+            _track_export(loop.create_task(_export_json(trace, summary)))
+        else:
+            try:
+                _write_json(trace, summary)
+            except OSError as e:
+                logger.warning(f"Trace JSON export failed: {e}")
+    if "otlp" in exporters and loop:  # without an event loop there is nothing to send from
+        _track_export(loop.create_task(_export_otlp(trace)))
+
+
+def _track_export(task: asyncio.Task) -> None:
+    _pending_exports.add(task)
+    task.add_done_callback(_pending_exports.discard)
+
+
+async def _export_json(trace: Trace, summary: dict) -> None:
+    # Serialising and appending a large trace blocks, so it runs off the event loop
+    try:
+        await asyncio.to_thread(_write_json, trace, summary)
+    except OSError as e:
+        logger.warning(f"Trace JSON export failed: {e}")
+
+
+def _write_json(trace: Trace, summary: dict) -> None:
+    line = json.dumps({**summary, "span_list": [s.as_dict() for s in trace.spans]}, default=str)
+    directory = os.path.dirname(settings.TRACE_JSON_PATH)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # One write per trace, so concurrent workers appending to the file don't interleave
+    with open(settings.TRACE_JSON_PATH, "a") as f:
+        f.write(line + "\n")
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_span(s: Span) -> dict:
+    otlp = {
+        "traceId": s.trace_id,
+        "spanId": s.span_id,
+        "name": s.name,
+        "kind": 1,  # INTERNAL
+        "startTimeUnixNano": str(s.start_ns),
+        "endTimeUnixNano": str(s.end_ns),
+        "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in s.attributes.items() if v is not None],
+        "status": {"code": 2, "message": s.error} if s.error else {"code": 1},
+    }
+    if s.parent_id:
+        otlp["parentSpanId"] = s.parent_id
+    return otlp
+
+
+async def _export_otlp(trace: Trace) -> None:
+    from app.services.http_client import get_http_client
+
+    body = {"resourceSpans": [{
+        "resource": {"attributes": [
+            {"key": "service.name", "value": {"stringValue": settings.TRACE_SERVICE_NAME}},
+        ]},
+        "scopeSpans": [{"scope": {"name": "app.core.tracing"}, "spans": [_otlp_span(s) for s in trace.spans]}],
+    }]}
+    try:
+        resp = await get_http_client().post(settings.TRACE_OTLP_ENDPOINT, json=body)
+        resp.raise_for_status()
+    except Exception as e:
+        logger.warning(f"OTLP export of trace {trace.trace_id} failed: {e}")
+
+
+async def flush_traces() -> None:
+    """Wait for in-flight JSON and OTLP exports (call before closing the HTTP client)."""
+    if _pending_exports:
+        await asyncio.gather(*_pending_exports, return_exceptions=True)
+
+
+# --- Instrumentation hooks ---
+
+def instrument_engine(engine) -> None:
+    """Record a ``db.<VERB>`` span for every SQL statement run inside a trace."""
+    from sqlalchemy import event
+
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        trace = _current_trace.get()
+        if trace is None or len(trace.spans) >= settings.TRACE_MAX_SPANS:
+            return
+        verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+        current = _new_span(trace, f"db.{verb}", _current_span.get(), {
+            "db.statement": " ".join(statement.split())[:300],
+            "db.executemany": executemany,
+        })
+        trace.spans.append(current)
+        conn.info.setdefault("trace_spans", []).append(current)
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.get("trace_spans")
+        if spans:
+            current = spans.pop()
+            current.end_ns = time.time_ns()
+            if cursor is not None and cursor.rowcount is not None and cursor.rowcount >= 0:
+                current.attributes["db.rows"] = cursor.rowcount
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(context):
+        spans = context.connection.info.get("trace_spans") if context.connection is not None else None
+        if spans:
+            current = spans.pop()
+            current.end_ns = time.time_ns()
+            current.error = f"{type(context.original_exception).__name__}: {context.original_exception}"[:500]
+
+
+def trace_middleware(app) -> None:
+    """Trace every API request (installed only when tracing is enabled).
+
+    ``X-Request-ID`` is taken from / echoed to the client; a 32-hex value
+    becomes the trace id.
+    """
+    @app.middleware("http")
+    async def _trace_request(request, call_next):
+        request_id = request.headers.get("x-request-id")
+        with start_trace(
+            f"{request.method} {request.url.path}",
+            trace_id=request_id,
+            **{"http.method": request.method, "http.path": request.url.path, "request_id": request_id},
+        ) as root:
+            response = await call_next(request)
+            root.set(**{"http.status_code": response.status_code})
+            response.headers["X-Request-ID"] = request_id or root.trace_id
+            return response
@@ -1,8 +1,11 @@
 from collections.abc import AsyncGenerator
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
 
+from app.core.auth_cache import invalidate_principals_on_commit
 from app.core.config import get_settings
+from app.core.tracing import instrument_engine
 
 settings = get_settings()
 
@@ -13,7 +16,19 @@ engine = create_async_engine(
     echo=settings.DEBUG,
 )
 
-async_session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+instrument_engine(engine)
+
+
+
+class AppSession(Session):
+    """The app's sync session class; its listeners don't touch other SQLAlchemy users in-process."""
+
+
+async_session_factory = async_sessionmaker(
+    engine, class_=AsyncSession, sync_session_class=AppSession, expire_on_commit=False,
+)
+
+invalidate_principals_on_commit(AppSession)
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
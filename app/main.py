@@ -1,10 +1,23 @@
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.router import api_router
+from app.core.auth_cache import close_principal_store, get_auth_cache_stats
 from app.core.config import get_settings
+from app.core.deps import require_stats_token
+from app.core.tracing import flush_traces, trace_middleware, tracing_enabled
+from app.services.career_recommender import get_role_matcher
+from app.services.http_client import close_http_client, start_http_client
+from app.services.job_aggregator import get_source_stats
+from app.services.job_search import get_search_cache_stats, rapidapi_limiter
+from app.services.llm_client import llm_limiter
+from app.services.pipeline import get_speculation_stats
+from app.services.pipeline_checkpoint import close_checkpointer, start_checkpointer
+from app.services.resume_parser import pdf_limiter, shutdown_pdf_pool
+from app.services.role_insights import get_insight_stats
+from app.services.task_queue import queue_stats, start_api_consumers, stop_api_consumers
 
 settings = get_settings()
 
@@ -15,8 +28,23 @@ async def lifespan(app: FastAPI):
     import os
 
     os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+    # Startup: compile (or memory-map) the role × skill matrix
+    get_role_matcher()
+    # Startup: shared pooled HTTP client for external APIs
+    await start_http_client()
+    # Startup: durable checkpoint store for resumable pipeline runs
+    await start_checkpointer()
+    # Startup: in-process task consumers (TASK_API_CONSUMERS, local dev only)
+    await start_api_consumers()
     yield
-    # Shutdown: cleanup if needed
+    # Shutdown: hand claimed tasks back to the queue (runs resume from their checkpoints)
+    await stop_api_consumers()
+    # Shutdown: close pooled connections
+    await close_checkpointer()
+    await flush_traces()
+    await close_http_client()
+    await close_principal_store()
+    shutdown_pdf_pool()
 
 
 app = FastAPI(
@@ -36,9 +64,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-request traces (TRACE_EXPORTER)
+if tracing_enabled():
+    trace_middleware(app)
+
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
 
 @app.get("/health")
 async def health():
     return {"status": "ok", "version": settings.APP_VERSION}
+
+
+@app.get("/stats", dependencies=[Depends(require_stats_token)], include_in_schema=False)
+async def stats():
+    """Process-local cache and job source statistics, plus task queue counts (internal)."""
+    return {
+        "auth_cache": get_auth_cache_stats(),
+        "job_search_cache": get_search_cache_stats(),
+        "job_sources": get_source_stats(),
+        "pipeline_speculation": get_speculation_stats(),
+        "role_insights": get_insight_stats(),
+        "stage_limiters": {lim.name: lim.as_dict() for lim in (pdf_limiter, llm_limiter, rapidapi_limiter)},
+        "task_queue": await queue_stats(),
+    }
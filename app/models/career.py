@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime, timezone
 
 from sqlalchemy import DateTime, Float, ForeignKey, String
-from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -28,4 +28,25 @@ class CareerRecommendation(Base):
     user: Mapped["User"] = relationship(back_populates="recommendations")
 
 
+class RoleInsight(Base):
+    """Ranked jobs and ATS score of one user's resume for one candidate role.
+
+    Filled for every recommended role at once, so switching roles is a read.
+    ``inputs_hash`` covers what the result was computed from (role, skills,
+    resume text, location, remote, ATS mode); a mismatch means it is stale.
+    """
+
+    __tablename__ = "role_insights"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    role_key: Mapped[str] = mapped_column(String(255), primary_key=True)  # normalized role
+    job_role: Mapped[str] = mapped_column(String(255), nullable=False)
+    inputs_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    jobs: Mapped[list] = mapped_column(JSONB, default=list)
+    ats: Mapped[dict | None] = mapped_column(JSONB)
+    computed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
 from app.models.user import User  # noqa: E402
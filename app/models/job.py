@@ -1,8 +1,8 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, Float, ForeignKey, String, Text
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy import BigInteger, Computed, DateTime, Float, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -10,10 +10,15 @@ from app.db.base import Base
 
 class SavedJob(Base):
     __tablename__ = "saved_jobs"
+    __table_args__ = (
+        # Keyset pages of /jobs/saved: newest first, optionally by status
+        Index("ix_saved_jobs_user_created", "user_id", "created_at", "id"),
+        Index("ix_saved_jobs_user_status_created", "user_id", "status", "created_at"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), index=True
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE")
     )
     external_job_id: Mapped[str | None] = mapped_column(String(255), index=True)
     title: Mapped[str] = mapped_column(String(500), nullable=False)
@@ -35,4 +40,105 @@ class SavedJob(Base):
     user: Mapped["User"] = relationship(back_populates="saved_jobs")
 
 
+class JobSearchSnapshot(Base):
+    """Ranked results of one /jobs/search call, kept so saves never re-query."""
+
+    __tablename__ = "job_search_snapshots"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), index=True
+    )
+    query: Mapped[str] = mapped_column(String(500), nullable=False)
+    jobs: Mapped[list] = mapped_column(JSONB, default=list)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+
+
+class CatalogJob(Base):
+    """Locally synced job posting, searchable with Postgres full-text search."""
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_jobs_dedupe_bands", "dedupe_bands", postgresql_using="gin"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    external_job_id: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
+    title: Mapped[str] = mapped_column(String(500), nullable=False)
+    company: Mapped[str] = mapped_column(String(255), nullable=False)
+    location: Mapped[str | None] = mapped_column(String(255))
+    is_remote: Mapped[bool] = mapped_column(default=False)
+    apply_url: Mapped[str | None] = mapped_column(Text)
+    description: Mapped[str | None] = mapped_column(Text)
+    salary_range: Mapped[str | None] = mapped_column(String(255))
+    posted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    search_vector = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+    )
+
+    # Near-duplicate detection (see app.services.job_dedupe): MinHash
+    # signature, LSH band keys, and the canonical posting this one repeats
+    dedupe_signature: Mapped[list | None] = mapped_column(ARRAY(BigInteger))
+    dedupe_bands: Mapped[list | None] = mapped_column(ARRAY(BigInteger))
+    canonical_job_id: Mapped[str | None] = mapped_column(String(255), index=True)
+
+    first_seen_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+    last_seen_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+
+
+class CatalogSyncState(Base):
+    """Last successful catalog sync per (role, location) query."""
+
+    __tablename__ = "catalog_sync_state"
+
+    query_key: Mapped[str] = mapped_column(String(500), primary_key=True)
+    role: Mapped[str] = mapped_column(String(255), nullable=False)
+    location: Mapped[str | None] = mapped_column(String(255))
+    last_synced_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    jobs_seen: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class UserJobFeedEntry(Base):
+    """One ranked job in a user's precomputed feed; ``position`` is its rank."""
+
+    __tablename__ = "user_job_feed"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    position: Mapped[int] = mapped_column(Integer, primary_key=True)
+    external_job_id: Mapped[str | None] = mapped_column(String(255))
+    match_score: Mapped[float] = mapped_column(Float, default=0.0)
+    job: Mapped[dict] = mapped_column(JSONB, nullable=False)
+
+
+class UserFeedState(Base):
+    """What a user's feed was computed from, so unchanged feeds are skipped."""
+
+    __tablename__ = "user_feed_state"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    role: Mapped[str] = mapped_column(String(255), nullable=False)
+    inputs_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    job_count: Mapped[int] = mapped_column(Integer, default=0)
+    computed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
 from app.models.user import User  # noqa: E402
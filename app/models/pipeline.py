@@ -0,0 +1,83 @@
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, String, Text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class Cohort(Base):
+    """A batch of users onboarded together (e.g. a college signing up).
+
+    Each member is a ``PipelineRun`` with this ``cohort_id``; re-running the
+    cohort picks up every run that is not completed yet.
+    """
+
+    __tablename__ = "cohorts"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    status: Mapped[str] = mapped_column(String(20), default="pending")  # pending / running / interrupted / completed / failed
+    stats: Mapped[dict | None] = mapped_column(JSONB)  # last run's stage throughput report
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
+
+
+class PipelineRun(Base):
+    """One onboarding pipeline execution; its id is the LangGraph thread id.
+
+    Node-by-node progress lives in the checkpoint tables, keyed by this id.
+    The row records who owns the run and whether its results were persisted.
+    """
+
+    __tablename__ = "pipeline_runs"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), index=True
+    )
+    cohort_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("cohorts.id", ondelete="CASCADE"), index=True
+    )
+    status: Mapped[str] = mapped_column(String(20), default="running")  # pending (cohort) / running / failed / completed
+    resume_file_path: Mapped[str] = mapped_column(Text, nullable=False)
+    error: Mapped[str | None] = mapped_column(Text)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
+
+
+class PipelineRunEvent(Base):
+    """One progress event of a run (node finished, run completed / failed).
+
+    The autoincrementing id orders events and doubles as the SSE event id,
+    so a reconnecting client resumes after ``Last-Event-ID``.
+    """
+
+    __tablename__ = "pipeline_run_events"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    run_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("pipeline_runs.id", ondelete="CASCADE"), index=True
+    )
+    event: Mapped[str] = mapped_column(String(50), nullable=False)  # node name / completed / failed
+    data: Mapped[dict] = mapped_column(JSONB, default=dict)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
@@ -0,0 +1,25 @@
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class RoleKeywordSet(Base):
+    """LLM-generated ATS keywords and skills for a normalized target role."""
+
+    __tablename__ = "role_keyword_sets"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    role_key: Mapped[str] = mapped_column(String(255), unique=True, index=True, nullable=False)
+    display_role: Mapped[str] = mapped_column(String(255), nullable=False)
+    keywords: Mapped[list] = mapped_column(ARRAY(String), default=list)
+    skills: Mapped[list] = mapped_column(ARRAY(String), default=list)
+    source: Mapped[str] = mapped_column(String(50), default="llm")
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
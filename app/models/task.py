@@ -0,0 +1,50 @@
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class Task(Base):
+    """A unit of background work on the Postgres task queue.
+
+    Lifecycle: ``queued`` → ``running`` (claimed, leased until
+    ``locked_until``) → ``succeeded``, or back to ``queued`` with a backoff
+    ``run_at`` on failure, or ``dead`` once ``max_attempts`` is used up. A
+    ``running`` task whose lease expired (crashed worker) can be claimed again.
+    """
+
+    __tablename__ = "tasks"
+    __table_args__ = (
+        # Claim scan: ready tasks by priority, oldest first
+        Index("ix_tasks_claim", "status", "priority", "run_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kind: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    payload: Mapped[dict] = mapped_column(JSONB, default=dict)
+    user_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), index=True
+    )
+    idempotency_key: Mapped[str | None] = mapped_column(String(255), unique=True)
+
+    status: Mapped[str] = mapped_column(String(20), default="queued")  # queued / running / succeeded / dead
+    priority: Mapped[int] = mapped_column(Integer, default=0)  # higher runs first
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    max_attempts: Mapped[int] = mapped_column(Integer, default=5)
+    run_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+    locked_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    locked_by: Mapped[str | None] = mapped_column(String(100))
+
+    result: Mapped[dict | None] = mapped_column(JSONB)
+    last_error: Mapped[str | None] = mapped_column(Text)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
@@ -32,11 +32,12 @@ class User(Base):
     remote_preference: Mapped[str | None] = mapped_column(String(50))  # remote / onsite / hybrid
     salary_expectation: Mapped[str | None] = mapped_column(String(100))
 
-    # Relationships
-    profile: Mapped["ResumeProfile"] = relationship(back_populates="user", uselist=False, lazy="selectin")
-    recommendations: Mapped[list["CareerRecommendation"]] = relationship(back_populates="user", lazy="selectin")
-    saved_jobs: Mapped[list["SavedJob"]] = relationship(back_populates="user", lazy="selectin")
-    roadmap_entries: Mapped[list["RoadmapEntry"]] = relationship(back_populates="user", lazy="selectin")
+    # Relationships — never loaded implicitly: a query opts in with
+    # joinedload / selectinload (see app.core.deps.current_user_with)
+    profile: Mapped["ResumeProfile"] = relationship(back_populates="user", uselist=False, lazy="raise_on_sql")
+    recommendations: Mapped[list["CareerRecommendation"]] = relationship(back_populates="user", lazy="raise_on_sql")
+    saved_jobs: Mapped[list["SavedJob"]] = relationship(back_populates="user", lazy="raise_on_sql")
+    roadmap_entries: Mapped[list["RoadmapEntry"]] = relationship(back_populates="user", lazy="raise_on_sql")
 
 
 # Resolve forward refs
@@ -3,6 +3,9 @@ from datetime import datetime
 
 from pydantic import BaseModel
 
+from app.schemas.job import JOB_LIST_DEFAULT_FIELDS, JobListItem, to_list_item
+from app.schemas.resume import ATSScoreOut
+
 
 class CareerRecommendationOut(BaseModel):
     id: uuid.UUID
@@ -17,3 +20,30 @@ class CareerRecommendationOut(BaseModel):
 
 class SelectRolesRequest(BaseModel):
     role_ids: list[uuid.UUID]
+
+
+class RoleInsightOut(BaseModel):
+    """Jobs and ATS score of the user's resume for one candidate role."""
+
+    job_role: str
+    computed_at: datetime
+    ats_score: int | None = None
+    ats: ATSScoreOut | None = None
+    job_count: int = 0
+    jobs: list[JobListItem] = []
+
+
+def to_role_insight(
+    insight,
+    fields: tuple[str, ...] = JOB_LIST_DEFAULT_FIELDS,
+    jobs_limit: int | None = None,
+) -> RoleInsightOut:
+    jobs = insight.jobs or []
+    return RoleInsightOut(
+        job_role=insight.job_role,
+        computed_at=insight.computed_at,
+        ats_score=insight.ats.get("score") if insight.ats else None,
+        ats=ATSScoreOut(**insight.ats) if insight.ats else None,
+        job_count=len(jobs),
+        jobs=[to_list_item(j, fields) for j in jobs[:jobs_limit]],
+    )
@@ -17,10 +17,115 @@ class JobOut(BaseModel):
     match_score: float = 0.0
     match_details: dict | None = None
     status: str = "matched"
+    alternate_locations: list[str] = []
+    alternate_urls: list[str] = []
+    posted_at: datetime | None = None
 
     model_config = {"from_attributes": True}
 
 
+class JobListItem(BaseModel):
+    """Compact job for list views.
+
+    Only the fields picked with ``?fields=`` (or ``JOB_LIST_DEFAULT_FIELDS``)
+    are set; list routes use ``response_model_exclude_unset`` so the rest are
+    left out of the payload. Full descriptions come from ``GET /jobs/{id}``.
+    """
+
+    id: uuid.UUID | None = None
+    external_job_id: str | None = None
+    title: str | None = None
+    company: str | None = None
+    location: str | None = None
+    is_remote: bool | None = None
+    apply_url: str | None = None
+    salary_range: str | None = None
+    match_score: float | None = None
+    match_details: dict | None = None
+    snippet: str | None = None
+    description: str | None = None
+    status: str | None = None
+    alternate_locations: list[str] | None = None
+    alternate_urls: list[str] | None = None
+    posted_at: datetime | None = None
+    source: str | None = None
+
+
+JOB_LIST_DEFAULT_FIELDS = (
+    "external_job_id", "title", "company", "location", "is_remote",
+    "apply_url", "salary_range", "match_score", "match_details", "snippet",
+)
+
+
+def make_snippet(text: str | None, length: int = 200) -> str:
+    """Whitespace-collapsed lead of a description, cut on a word boundary."""
+    text = " ".join((text or "")[: length * 2].split())
+    if len(text) <= length:
+        return text
+    return text[:length].rsplit(" ", 1)[0] + "…"
+
+
+# Jobs kept in precomputed results (role insights): every list field but the
+# description, which stays in the catalog / GET /jobs/{id}
+JOB_STORED_FIELDS = tuple(f for f in JobListItem.model_fields if f != "description")
+
+
+def to_list_item(job: dict, fields: tuple[str, ...] = JOB_LIST_DEFAULT_FIELDS) -> JobListItem:
+    data = {f: job.get(f) for f in fields if f != "snippet" and f in job}
+    if "snippet" in fields:
+        # Stored jobs carry their snippet instead of the description
+        data["snippet"] = make_snippet(job["description"]) if "description" in job else job.get("snippet")
+    return JobListItem(**data)
+
+
+def to_stored_job(job: dict) -> dict:
+    """A ranked job as stored with precomputed results (``JOB_STORED_FIELDS``)."""
+    return to_list_item(job, JOB_STORED_FIELDS).model_dump(mode="json", exclude_unset=True)
+
+
+class SavedJobSummary(BaseModel):
+    """List view of a saved job: no description or match details."""
+
+    id: uuid.UUID
+    external_job_id: str | None = None
+    title: str
+    company: str
+    location: str | None = None
+    is_remote: bool = False
+    apply_url: str | None = None
+    salary_range: str | None = None
+    match_score: float = 0.0
+    status: str = "matched"
+    applied_at: datetime | None = None
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class SavedJobPage(BaseModel):
+    jobs: list[SavedJobSummary]
+    next_cursor: str | None = None  # pass as ?cursor= for the next page
+
+
+class JobSearchOut(BaseModel):
+    search_id: uuid.UUID
+    expires_at: datetime
+    jobs: list[JobListItem]
+
+
+class JobFeedOut(BaseModel):
+    role: str
+    computed_at: datetime
+    jobs: list[JobListItem]
+    next_after: int | None = None  # pass as ?after= for the next page
+
+
+class SaveJobRequest(BaseModel):
+    search_id: uuid.UUID
+    job_index: int | None = None
+    external_job_id: str | None = None
+
+
 class JobSearchParams(BaseModel):
     query: str
     location: str | None = None
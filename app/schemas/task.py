@@ -0,0 +1,23 @@
+import uuid
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class TaskCreate(BaseModel):
+    kind: str  # resume.ats_score / career.recommend / career.explore / roadmap.generate
+    params: dict = {}
+
+
+class TaskOut(BaseModel):
+    id: uuid.UUID
+    kind: str
+    status: str  # queued / running / succeeded / dead
+    attempts: int
+    max_attempts: int
+    result: dict | None = None
+    last_error: str | None = None
+    created_at: datetime
+    finished_at: datetime | None = None
+
+    model_config = {"from_attributes": True}
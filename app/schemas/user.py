@@ -15,6 +15,11 @@ class UserLogin(BaseModel):
     password: str
 
 
+class SetPassword(BaseModel):
+    token: str
+    password: str
+
+
 class UserOnboard(BaseModel):
     skills: list[str] | None = None
     degree: str | None = None
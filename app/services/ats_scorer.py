@@ -1,14 +1,19 @@
-"""ATS resume scoring engine — LLM-powered with rule-based fallback.
+"""ATS resume scoring engine — rule-based by default, LLM on request.
 
-Primary: LLM evaluates resume like a real recruiter/ATS system.
-Fallback: Deterministic rule-based scoring.
+Default: Deterministic rule-based scoring against role keywords from the
+         role-keyword registry (one LLM call per role, not per resume).
+Optional: LLM evaluates resume like a real recruiter/ATS system
+          (``use_llm=True`` or ATS_USE_LLM), falling back to rules on failure.
 """
 
 import logging
 import re
 
-from app.services.llm_client import score_resume_llm
+from app.core.config import get_settings
+from app.services.llm_client import is_transient_error, score_resume_llm
+from app.services.role_keywords import get_role_keyword_set
 
+settings = get_settings()
 logger = logging.getLogger(__name__)
 
 ACTION_VERBS = [
@@ -51,13 +56,17 @@ DEFAULT_KEYWORDS = [
 async def score_resume(
     text: str,
     target_role: str | None = None,
-    use_llm: bool = True,
+    use_llm: bool | None = None,
+    raise_transient: bool = False,
 ) -> dict:
     """Score a resume for ATS compatibility.
 
-    Uses LLM for deep, context-aware analysis.
-    Falls back to rule-based scoring if LLM fails.
+    Rule-based by default; ``use_llm`` (default: ATS_USE_LLM) requests the
+    deeper LLM analysis, which falls back to rules if it fails (transient
+    provider errors are raised instead with ``raise_transient``).
     """
+    if use_llm is None:
+        use_llm = settings.ATS_USE_LLM
     if use_llm and target_role:
         try:
             llm_result = await score_resume_llm(text, target_role)
@@ -77,18 +86,39 @@ async def score_resume(
             return llm_result
 
         except Exception as e:
+            if raise_transient and is_transient_error(e):
+                raise
             logger.warning(f"LLM ATS scoring failed, using rule-based fallback: {e}")
 
-    return _score_resume_rules(text, target_role)
+    keywords = await resolve_role_keywords(target_role)
+    return _score_resume_rules(text, target_role, keywords)
 
 
-def _score_resume_rules(text: str, target_role: str | None = None) -> dict:
-    """Deterministic rule-based ATS scoring fallback."""
+async def resolve_role_keywords(target_role: str | None) -> list[str]:
+    """Hand-written keywords, else the registry's keywords and skills, else defaults."""
+    if not target_role:
+        return DEFAULT_KEYWORDS
+    if target_role in ROLE_KEYWORDS:
+        return ROLE_KEYWORDS[target_role]
+    entry = await get_role_keyword_set(target_role)
+    if not entry:
+        return DEFAULT_KEYWORDS
+    # An ATS filter matches hard skills as well as role terms; the two lists overlap
+    return list(dict.fromkeys(entry["keywords"] + entry["skills"]))
+
+
+def _score_resume_rules(
+    text: str,
+    target_role: str | None = None,
+    keywords: list[str] | None = None,
+) -> dict:
+    """Deterministic rule-based ATS scoring."""
     text_lower = text.lower()
     words = text_lower.split()
 
     # 1. Keyword presence (40 points)
-    keywords = ROLE_KEYWORDS.get(target_role or "", DEFAULT_KEYWORDS)
+    if keywords is None:
+        keywords = ROLE_KEYWORDS.get(target_role or "", DEFAULT_KEYWORDS)
     found_keywords = [kw for kw in keywords if kw in text_lower]
     missing_keywords = [kw for kw in keywords if kw not in text_lower]
     keyword_score = min(40, int((len(found_keywords) / max(len(keywords), 1)) * 40))
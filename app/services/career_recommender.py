@@ -2,13 +2,23 @@
 
 Primary: LLM analyzes skills + education + experience to recommend roles
          with market-aware reasoning.
-Fallback: Keyword-based Jaccard similarity matching.
+Fallback: Keyword matching over a precompiled role × skill matrix.
 """
 
 import logging
+import os
+import uuid
 
-from app.services.llm_client import recommend_roles_llm
+from sqlalchemy import delete, insert
 
+from app.core.config import get_settings
+from app.models.career import CareerRecommendation
+from app.models.resume import ResumeProfile
+from app.services.demand_index import get_demand_index, normalize_role
+from app.services.llm_client import is_transient_error, recommend_roles_llm
+from app.services.role_matcher import RoleMatcher, load_taxonomy_dir
+
+settings = get_settings()
 logger = logging.getLogger(__name__)
 
 # --- Keyword-based fallback map ---
@@ -82,11 +92,13 @@ async def recommend_roles(
     experience: list[dict] | None = None,
     top_n: int = 5,
     use_llm: bool = True,
+    raise_transient: bool = False,
 ) -> list[dict]:
     """Recommend top N career roles for the user.
 
     Uses LLM for intelligent, market-aware recommendations.
-    Falls back to keyword matching if LLM is unavailable.
+    Falls back to keyword matching if LLM is unavailable, unless
+    ``raise_transient`` asks for outages / rate limits to be raised.
     """
     if use_llm:
         try:
@@ -108,27 +120,105 @@ async def recommend_roles(
             if validated:
                 return validated
         except Exception as e:
+            if raise_transient and is_transient_error(e):
+                raise
             logger.warning(f"LLM career recommendation failed, using fallback: {e}")
 
     return _recommend_roles_keyword(user_skills, top_n)
 
 
+async def refresh_recommendations(
+    session,
+    user_id: uuid.UUID,
+    profile: ResumeProfile,
+    raise_transient: bool = False,
+) -> list[CareerRecommendation]:
+    """Replace the user's recommendations with fresh ones for their profile.
+
+    One ``DELETE`` and one multi-row ``INSERT ... RETURNING``, whatever the
+    number of roles.
+    """
+    results = await recommend_roles(
+        user_skills=profile.skills,
+        education=profile.education,
+        experience=profile.experience,
+        raise_transient=raise_transient,
+    )
+    await session.execute(delete(CareerRecommendation).where(CareerRecommendation.user_id == user_id))
+    if not results:
+        return []
+    recs = await session.scalars(
+        insert(CareerRecommendation).returning(CareerRecommendation, sort_by_parameter_order=True),
+        [{
+            "user_id": user_id,
+            "job_role": r["job_role"],
+            "match_score": r["match_score"],
+            "matched_skills": r["matched_skills"],
+            "missing_skills": r["missing_skills"],
+        } for r in results],
+    )
+    return list(recs)
+
+
 def _recommend_roles_keyword(user_skills: list[str], top_n: int = 5) -> list[dict]:
-    """Keyword-based Jaccard similarity fallback."""
-    user_skill_set = {s.lower().strip() for s in user_skills}
-    results: list[dict] = []
-
-    for role, role_skills in ROLE_SKILL_MAP.items():
-        role_skill_set = {s.lower() for s in role_skills}
-        matched = user_skill_set & role_skill_set
-        missing = role_skill_set - user_skill_set
-        score = len(matched) / (len(role_skill_set) + 1e-6)
-        results.append({
-            "job_role": role,
-            "match_score": round(score * 100, 1),
-            "matched_skills": sorted(matched),
-            "missing_skills": sorted(missing),
-        })
-
-    results.sort(key=lambda x: x["match_score"], reverse=True)
-    return results[:top_n]
+    """Keyword fallback — share of each role's skills the user already has."""
+    return get_role_matcher().top_k(user_skills, top_n)
+
+
+def predict_top_role(user_skills: list[str]) -> str | None:
+    """Keyword guess at the LLM's top role (microseconds), or None without a match."""
+    top = _recommend_roles_keyword(user_skills, 1)
+    if not top or top[0]["match_score"] <= 0:
+        return None
+    return top[0]["job_role"]
+
+
+def same_role(a: str | None, b: str | None) -> bool:
+    return bool(a and b) and normalize_role(a) == normalize_role(b)
+
+
+# --- Compiled role matcher (singleton) ---
+
+_role_matcher: RoleMatcher | None = None
+_role_matcher_version: float | None = None
+
+
+def build_role_taxonomy() -> dict[str, list[str]]:
+    """ROLE_SKILL_MAP merged with taxonomy files and mined demand-index roles.
+
+    Hand-written entries win; the demand index only adds roles that are not
+    already covered.
+    """
+    taxonomy = {role: list(skills) for role, skills in ROLE_SKILL_MAP.items()}
+    if settings.ROLE_TAXONOMY_DIR and os.path.isdir(settings.ROLE_TAXONOMY_DIR):
+        for role, skills in load_taxonomy_dir(settings.ROLE_TAXONOMY_DIR).items():
+            taxonomy.setdefault(role, []).extend(skills)
+
+    known = {normalize_role(role) for role in taxonomy}
+    for role, skills in get_demand_index().taxonomy(limit=settings.DEMAND_INDEX_ROLE_SKILLS).items():
+        if normalize_role(role) not in known:
+            taxonomy[role] = skills
+    return taxonomy
+
+
+def get_role_matcher() -> RoleMatcher:
+    """Get the compiled role matcher (cached).
+
+    If ROLE_MATRIX_DIR holds a saved matrix (see scripts/build_role_matrix.py)
+    it is memory-mapped so all workers share one copy; otherwise the taxonomy
+    is compiled in-process and recompiled whenever the demand index reloads.
+    """
+    global _role_matcher, _role_matcher_version
+    matrix_dir = settings.ROLE_MATRIX_DIR
+    if matrix_dir and os.path.exists(os.path.join(matrix_dir, "vocab.json")):
+        if _role_matcher is None:
+            _role_matcher = RoleMatcher.load(matrix_dir, mmap=True)
+            logger.info(f"Role matcher mapped from {matrix_dir}: {len(_role_matcher)} roles")
+        return _role_matcher
+
+    version = get_demand_index().version
+    if _role_matcher is None or version != _role_matcher_version:
+        _role_matcher = RoleMatcher.from_mapping(build_role_taxonomy())
+        _role_matcher_version = version
+        logger.info(f"Role matcher compiled: {len(_role_matcher)} roles, {len(_role_matcher.skills)} skills")
+    return _role_matcher
@@ -0,0 +1,309 @@
+"""Cohort batch onboarding — the full pipeline for thousands of users at once.
+
+A cohort (e.g. a college's whole batch) is created from a manifest of
+``email, resume_path`` rows. Missing users are created without a password,
+and each member gets a ``pending`` ``PipelineRun``. ``cohort_invites`` issues
+set-password tokens for members who have no password yet
+(``POST /auth/set-password``). ``run_cohort`` then drives all runs through
+the LangGraph pipeline:
+
+- up to COHORT_CONCURRENCY runs in flight; underneath, every stage is
+  bounded process-wide: PDF extraction (``pdf_limiter``, optionally a
+  process pool), LLM calls (``llm_limiter``) and RapidAPI
+  (``rapidapi_limiter``)
+- identical role searches across the cohort share one fetch
+  (``shared_role_searches``); only the per-user ranking is repeated
+- finished runs are written in batches of COHORT_PERSIST_BATCH_SIZE
+  (``persist_onboarding_batch``) instead of one transaction per user
+- every run is checkpointed, so after an interruption ``run_cohort`` again
+  only picks up runs that are not completed, and each continues from its
+  last finished node
+- stage throughput (runs/min, per-node rate and latency, limiter waits,
+  searches saved) is logged every COHORT_REPORT_SECONDS and stored on the
+  cohort
+"""
+
+import asyncio
+import csv
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import get_settings
+from app.core.security import create_set_password_token
+from app.core.tracing import start_trace
+from app.db.session import async_session_factory
+from app.models.pipeline import Cohort, PipelineRun
+from app.models.user import User
+from app.services.job_aggregator import shared_role_searches
+from app.services.job_search import rapidapi_limiter
+from app.services.llm_client import llm_limiter
+from app.services.pipeline import get_run_progress, invoke_pipeline, make_initial_state
+from app.services.pipeline_runner import persist_onboarding_batch, schedule_checkpoint_drop
+from app.services.resume_parser import pdf_limiter
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class CohortMember:
+    email: str
+    resume_path: str
+    full_name: str | None = None
+    location_preference: str | None = None
+    remote_preference: str | None = None
+
+
+def load_manifest(path: str) -> list[CohortMember]:
+    """CSV with a header row: ``email,resume_path`` plus optional
+    ``full_name,location_preference,remote_preference`` columns."""
+    members: dict[str, CohortMember] = {}
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            email = (row.get("email") or "").strip().lower()
+            resume_path = (row.get("resume_path") or "").strip()
+            if not email or not resume_path:
+                continue
+            members[email] = CohortMember(  # a repeated email keeps its last row
+                email=email,
+                resume_path=resume_path,
+                full_name=(row.get("full_name") or "").strip() or None,
+                location_preference=(row.get("location_preference") or "").strip() or None,
+                remote_preference=(row.get("remote_preference") or "").strip() or None,
+            )
+    return list(members.values())
+
+
+async def create_cohort(session, name: str, members: list[CohortMember]) -> Cohort:
+    """Record a cohort, its missing users and one pending run per member."""
+    cohort = Cohort(name=name)
+    session.add(cohort)
+    await session.flush()
+    if not members:
+        return cohort
+
+    # New accounts have no password (login always fails) until the member
+    # redeems their invite (``cohort_invites``)
+    await session.execute(
+        insert(User)
+        .values([{
+            "id": uuid.uuid4(),
+            "email": m.email,
+            "hashed_password": "",
+            "full_name": m.full_name or m.email.split("@")[0],
+            "location_preference": m.location_preference,
+            "remote_preference": m.remote_preference,
+        } for m in members])
+        .on_conflict_do_nothing(index_elements=["email"])
+    )
+    result = await session.execute(select(User.email, User.id).where(User.email.in_([m.email for m in members])))
+    user_ids = dict(result.all())
+
+    await session.execute(insert(PipelineRun).values([{
+        "id": uuid.uuid4(),
+        "user_id": user_ids[m.email],
+        "cohort_id": cohort.id,
+        "status": "pending",
+        "resume_file_path": m.resume_path,
+    } for m in members]))
+    return cohort
+
+
+async def cohort_invites(session, cohort_id: uuid.UUID) -> list[tuple[str, str]]:
+    """``(email, set-password token)`` for the cohort's members without a password.
+
+    Tokens are valid for SET_PASSWORD_TOKEN_EXPIRE_HOURS and until used;
+    calling this again re-issues them for whoever has not signed up yet.
+    """
+    result = await session.execute(
+        select(User.id, User.email, User.hashed_password)
+        .join(PipelineRun, PipelineRun.user_id == User.id)
+        .where(PipelineRun.cohort_id == cohort_id, User.hashed_password == "", User.is_active.is_(True))
+        .distinct()
+    )
+    return [(email, create_set_password_token(str(user_id), hashed)) for user_id, email, hashed in result.all()]
+
+
+async def cohort_status(cohort_id: uuid.UUID) -> dict | None:
+    async with async_session_factory() as session:
+        cohort = await session.get(Cohort, cohort_id)
+        if cohort is None:
+            return None
+        result = await session.execute(
+            select(PipelineRun.status, func.count())
+            .where(PipelineRun.cohort_id == cohort_id)
+            .group_by(PipelineRun.status)
+        )
+        return {
+            "cohort_id": str(cohort.id),
+            "name": cohort.name,
+            "status": cohort.status,
+            "runs": dict(result.all()),
+            "stats": cohort.stats,
+        }
+
+
+# --- Throughput report ---
+
+@dataclass
+class CohortReport:
+    total: int
+    started_at: float = field(default_factory=time.monotonic)
+    completed: int = 0
+    failed: int = 0
+    persisted: int = 0
+    unpersisted: int = 0  # finished, but their batch could not be written
+    node_ms: dict[str, list[float]] = field(default_factory=dict)
+
+    def record(self, state: dict, already_done: set[str]) -> None:
+        self.completed += 1
+        for node, ms in (state.get("node_timings") or {}).items():
+            if node not in already_done:  # nodes of an earlier attempt were counted then
+                self.node_ms.setdefault(node, []).append(ms)
+
+    def as_dict(self, role_searches: dict | None = None) -> dict:
+        elapsed = max(1e-9, time.monotonic() - self.started_at)
+        stages = {}
+        for node, samples in self.node_ms.items():
+            ordered = sorted(samples)
+            stages[node] = {
+                "count": len(samples),
+                "per_second": round(len(samples) / elapsed, 2),
+                "avg_ms": round(sum(samples) / len(samples), 1),
+                "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1),
+            }
+        return {
+            "runs": {"total": self.total, "completed": self.completed, "failed": self.failed,
+                     "persisted": self.persisted, "unpersisted": self.unpersisted},
+            "elapsed_seconds": round(elapsed, 1),
+            "runs_per_minute": round(self.completed / elapsed * 60, 1),
+            "stages": stages,
+            "limiters": {lim.name: lim.as_dict() for lim in (pdf_limiter, llm_limiter, rapidapi_limiter)},
+            "role_searches": role_searches,
+        }
+
+
+# --- Execution ---
+
+async def _execute(run: PipelineRun, location: str | None, remote: str | None) -> tuple[dict, set[str]]:
+    """Start, resume or (if already finished) just load a run; its final state."""
+    run_id = str(run.id)
+    with start_trace("pipeline.run", trace_id=run.id, run_id=run_id, user_id=str(run.user_id),
+                     cohort_id=str(run.cohort_id)):
+        progress = await get_run_progress(run_id)
+        if progress is None:
+            initial = make_initial_state(str(run.user_id), run.resume_file_path, location, remote)
+            return await invoke_pipeline(run_id, initial), set()
+        done = set(progress["completed_nodes"])
+        if progress["finished"]:
+            return progress["state"], done
+        return await invoke_pipeline(run_id), done
+
+
+async def run_cohort(
+    cohort_id: uuid.UUID,
+    concurrency: int | None = None,
+    stop: asyncio.Event | None = None,
+) -> dict:
+    """Run (or resume) every not-yet-completed run of a cohort; returns the report.
+
+    Once ``stop`` is set, no further runs start; those in flight finish and
+    are persisted, and the cohort is left ``interrupted``.
+    """
+    async with async_session_factory() as session:
+        cohort = await session.get(Cohort, cohort_id)
+        if cohort is None:
+            raise ValueError(f"Cohort {cohort_id} not found")
+        cohort.status = "running"
+        result = await session.execute(
+            select(PipelineRun, User.location_preference, User.remote_preference)
+            .join(User, User.id == PipelineRun.user_id)
+            .where(PipelineRun.cohort_id == cohort_id, PipelineRun.status != "completed")
+            .order_by(PipelineRun.created_at)
+        )
+        pending = result.all()
+        await session.commit()
+
+    concurrency = concurrency or settings.COHORT_CONCURRENCY
+    report = CohortReport(total=len(pending))
+    queue: asyncio.Queue = asyncio.Queue()
+    for row in pending:
+        queue.put_nowait(tuple(row))
+    finished: list[tuple[PipelineRun, dict]] = []
+    failures: list[dict] = []
+    flush_lock = asyncio.Lock()
+    logger.info(f"Cohort {cohort_id}: {len(pending)} runs to go, {concurrency} at a time")
+
+    async def flush(force: bool = False) -> None:
+        async with flush_lock:
+            if not finished and not failures:
+                return
+            if not force and len(finished) + len(failures) < settings.COHORT_PERSIST_BATCH_SIZE:
+                return
+            batch, failed = finished[:], failures[:]
+            try:
+                async with async_session_factory() as session:
+                    await persist_onboarding_batch(session, batch)
+                    await schedule_checkpoint_drop(session, [run.id for run, _ in batch])
+                    if failed:
+                        await session.execute(update(PipelineRun), failed)  # bulk UPDATE by primary key
+                    await session.commit()
+            except Exception as e:
+                # Kept for the next flush; the runs' checkpoints are finished either way
+                logger.error(f"Cohort {cohort_id}: writing {len(batch)} finished and {len(failed)} "
+                             f"failed runs failed, retrying with the next batch: {e}")
+                return
+            del finished[:len(batch)]
+            del failures[:len(failed)]
+            report.persisted += len(batch)
+
+    async def worker() -> None:
+        while stop is None or not stop.is_set():
+            try:
+                run, location, remote = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                state, already_done = await _execute(run, location, remote)
+            except Exception as e:
+                logger.warning(f"Cohort run {run.id} failed (resumable): {e}")
+                report.failed += 1
+                failures.append({"id": run.id, "status": "failed", "error": str(e)[:2000]})
+            else:
+                report.record(state, already_done)
+                finished.append((run, state))
+            await flush()
+
+    async def report_progress() -> None:
+        while True:
+            await asyncio.sleep(settings.COHORT_REPORT_SECONDS)
+            stats = report.as_dict(pools.stats.as_dict())
+            logger.info(f"Cohort {cohort_id} progress: {stats['runs']}, {stats['runs_per_minute']} runs/min, "
+                        f"stages={stats['stages']}")
+
+    with shared_role_searches() as pools:
+        reporter = asyncio.create_task(report_progress())
+        try:
+            await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+        finally:
+            reporter.cancel()
+            await flush(force=True)  # whatever finished is kept, even on interruption
+        # Still unwritten after the last try: the next run_cohort loads them from their checkpoints
+        report.unpersisted = len(finished)
+        stats = report.as_dict(pools.stats.as_dict())
+
+    async with async_session_factory() as session:
+        cohort = await session.get(Cohort, cohort_id)
+        if not queue.empty() or finished or failures:
+            cohort.status = "interrupted"
+        else:
+            cohort.status = "failed" if report.failed else "completed"
+        cohort.stats = stats
+        await session.commit()
+    logger.info(f"Cohort {cohort_id} {cohort.status}: {stats}")
+    return stats
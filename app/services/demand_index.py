@@ -0,0 +1,185 @@
+"""Role-skill demand index — mined from real job descriptions.
+
+Job postings are grouped by normalized role (derived from the title) and every
+known skill/keyword term is counted per role. Terms are weighted TF-IDF style:
+how often the role's postings mention the term, discounted by how many roles
+mention it. The result is persisted as a compact JSON artifact by
+``app.workers.demand_index`` and hot-reloaded here when the file changes, so
+the career recommender and ATS scorer pick up fresh data without a restart.
+"""
+
+import json
+import logging
+import math
+import os
+import re
+import time
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from datetime import datetime, timezone
+
+from app.core.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Words stripped from job titles before grouping — level, contract and location noise
+_TITLE_NOISE = {
+    "senior", "sr", "junior", "jr", "lead", "principal", "staff", "head",
+    "intern", "internship", "trainee", "fresher", "freshers", "graduate",
+    "entry", "level", "associate", "i", "ii", "iii", "iv", "remote", "hybrid",
+    "onsite", "contract", "full", "time", "part", "urgent", "hiring",
+}
+_TITLE_CUT = re.compile(r"\s+[-–—|:]\s+|[(\[,]")
+
+
+def normalize_role(title: str) -> str:
+    """Canonical role key for a job title or target role.
+
+    ``"Sr. Backend Developer - Python (Remote)"`` → ``"backend developer"``
+    """
+    head = _TITLE_CUT.split(title.lower(), maxsplit=1)[0]
+    words = re.sub(r"[^a-z0-9/+#.& ]", " ", head).split()
+    words = [w.strip(".") for w in words]
+    return " ".join(w for w in words if w and w not in _TITLE_NOISE)
+
+
+def compile_term_pattern(vocab: Iterable[str]) -> re.Pattern:
+    """One alternation regex matching any vocab term on word boundaries."""
+    terms = sorted({t.lower().strip() for t in vocab if t.strip()}, key=len, reverse=True)
+    return re.compile(r"(?<!\w)(" + "|".join(re.escape(t) for t in terms) + r")(?!\w)")
+
+
+def build_demand_index(
+    jobs: Iterable[dict],
+    vocab: Iterable[str],
+    min_docs: int = 3,
+    max_terms: int = 25,
+    min_share: float = 0.1,
+) -> dict:
+    """Build the demand index artifact from normalized job dicts.
+
+    Each job needs ``title`` and ``description``. Roles with fewer than
+    ``min_docs`` postings are dropped; per role, at most ``max_terms`` terms
+    mentioned by at least ``min_share`` of its postings are kept.
+    """
+    pattern = compile_term_pattern(vocab)
+    docs_per_role: Counter = Counter()
+    term_docs: dict[str, Counter] = defaultdict(Counter)
+    display: dict[str, Counter] = defaultdict(Counter)
+
+    for job in jobs:
+        title = (job.get("title") or "").strip()
+        role = normalize_role(title)
+        if not role:
+            continue
+        text = f"{title}\n{job.get('description') or ''}".lower()
+        docs_per_role[role] += 1
+        display[role][title] += 1
+        term_docs[role].update(set(pattern.findall(text)))
+
+    roles = [r for r, n in docs_per_role.items() if n >= min_docs]
+    roles_with_term: Counter = Counter()
+    for role in roles:
+        roles_with_term.update(t for t, c in term_docs[role].items() if c / docs_per_role[role] >= min_share)
+
+    entries: dict[str, dict] = {}
+    for role in roles:
+        n = docs_per_role[role]
+        weighted = []
+        for term, count in term_docs[role].items():
+            share = count / n
+            if share < min_share:
+                continue
+            idf = math.log((1 + len(roles)) / (1 + roles_with_term[term])) + 1
+            weighted.append((term, round(share * idf, 4)))
+        weighted.sort(key=lambda x: (-x[1], x[0]))
+        if weighted:
+            entries[role] = {
+                "display": display[role].most_common(1)[0][0],
+                "docs": n,
+                "terms": weighted[:max_terms],
+            }
+
+    return {
+        "built_at": datetime.now(timezone.utc).isoformat(),
+        "total_docs": sum(docs_per_role.values()),
+        "roles": entries,
+    }
+
+
+def save_demand_index(index: dict, path: str) -> None:
+    """Write the artifact atomically so readers never see a partial file."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(index, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+class DemandIndex:
+    """Read-only view over a loaded demand index artifact."""
+
+    def __init__(self, data: dict | None = None, version: float = 0.0):
+        data = data or {}
+        self.version = version
+        self.built_at: str | None = data.get("built_at")
+        self.roles: dict[str, dict] = data.get("roles", {})
+
+    def __len__(self) -> int:
+        return len(self.roles)
+
+    def __contains__(self, role: str) -> bool:
+        return normalize_role(role) in self.roles
+
+    def skills_for(self, role: str, limit: int | None = None) -> list[str]:
+        """Most in-demand terms for a role, best first; ``[]`` if unknown."""
+        entry = self.roles.get(normalize_role(role))
+        if not entry:
+            return []
+        terms = [t for t, _ in entry["terms"]]
+        return terms[:limit] if limit else terms
+
+    def taxonomy(self, limit: int | None = None) -> dict[str, list[str]]:
+        """``{display role: [terms]}`` for every mined role."""
+        return {e["display"]: self.skills_for(role, limit) for role, e in self.roles.items()}
+
+
+# --- Hot-reloaded singleton ---
+
+_index = DemandIndex()
+_index_mtime: float | None = None
+_last_check: float | None = None
+
+
+def get_demand_index() -> DemandIndex:
+    """Get the current demand index, reloading it if the artifact changed.
+
+    The file is stat'ed at most once every DEMAND_INDEX_RELOAD_SECONDS. A
+    missing or unreadable artifact keeps serving the last good index.
+    """
+    global _index, _index_mtime, _last_check
+    now = time.monotonic()
+    if _last_check is not None and now - _last_check < settings.DEMAND_INDEX_RELOAD_SECONDS:
+        return _index
+    _last_check = now
+
+    path = settings.DEMAND_INDEX_PATH
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return _index
+    if mtime == _index_mtime:
+        return _index
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Failed to load demand index {path}: {e}")
+        return _index
+
+    _index = DemandIndex(data, version=mtime)
+    _index_mtime = mtime
+    logger.info(f"Demand index loaded: {len(_index)} roles (built {_index.built_at})")
+    return _index
@@ -0,0 +1,114 @@
+"""Shared outbound HTTP client — one pooled ``httpx.AsyncClient`` per process.
+
+Created in the FastAPI ``lifespan`` hook (and lazily by workers), so every
+external call reuses keep-alive HTTP/2 connections instead of paying DNS,
+TCP and TLS setup per request. Tests inject their own client with
+``set_http_client`` (e.g. one pointed at a local stub server or built on
+``httpx.MockTransport``).
+"""
+
+import asyncio
+import logging
+import random
+
+import httpx
+
+from app.core.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+RETRY_STATUSES = {500, 502, 503, 504}
+
+_client: httpx.AsyncClient | None = None
+
+
+def build_http_client(**overrides) -> httpx.AsyncClient:
+    """Construct a client with the tuned pool, timeouts and HTTP/2 settings."""
+    options = {
+        "http2": settings.HTTP_HTTP2,
+        "timeout": httpx.Timeout(
+            connect=settings.HTTP_CONNECT_TIMEOUT,
+            read=settings.HTTP_READ_TIMEOUT,
+            write=settings.HTTP_WRITE_TIMEOUT,
+            pool=settings.HTTP_POOL_TIMEOUT,
+        ),
+        "limits": httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        ),
+    }
+    options.update(overrides)
+    return httpx.AsyncClient(**options)
+
+
+async def start_http_client() -> httpx.AsyncClient:
+    """Create the shared client (called from the app lifespan)."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = build_http_client()
+    return _client
+
+
+async def close_http_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared client, creating it on first use outside the API."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = build_http_client()
+    return _client
+
+
+async def set_http_client(client: httpx.AsyncClient | None) -> None:
+    """Inject a client (tests / stub servers). ``None`` resets to the default.
+
+    The client being replaced is closed, so its pooled connections don't leak.
+    """
+    global _client
+    previous, _client = _client, client
+    if previous is not None and previous is not client:
+        await previous.aclose()
+
+
+async def request_with_retry(
+    method: str,
+    url: str,
+    *,
+    max_retries: int | None = None,
+    **kwargs,
+) -> httpx.Response:
+    """Send a request on the shared client, retrying idempotent calls.
+
+    Idempotent methods are retried on 5xx gateway errors and transport
+    failures with exponential backoff plus full jitter. Non-idempotent
+    methods are sent once.
+    """
+    client = get_http_client()
+    retries = settings.HTTP_MAX_RETRIES if max_retries is None else max_retries
+    if method.upper() not in IDEMPOTENT_METHODS:
+        retries = 0
+
+    attempt = 0
+    while True:
+        try:
+            resp = await client.request(method, url, **kwargs)
+            if resp.status_code not in RETRY_STATUSES or attempt >= retries:
+                return resp
+            reason = f"HTTP {resp.status_code}"
+        except httpx.TransportError as e:
+            if attempt >= retries:
+                raise
+            reason = type(e).__name__
+
+        delay = random.uniform(0, settings.HTTP_RETRY_BACKOFF * (2 ** attempt))
+        attempt += 1
+        logger.info(f"Retrying {method} {url} after {reason} (attempt {attempt}/{retries}, {delay:.2f}s)")
+        await asyncio.sleep(delay)
@@ -0,0 +1,409 @@
+"""Multi-source job aggregation — fan out to every enabled source, merge, rank.
+
+Each source is a ``JobSource`` adapter that returns jobs in the normalized
+``_normalize_jobs`` schema. Each has its own per-call timeout and circuit
+breaker. A source that keeps failing is skipped without waiting until its
+breaker lets a trial call through again. The whole fan-out is bounded by
+JOB_SEARCH_BUDGET_SECONDS: whatever the sources answered within the budget
+is merged (exact and near-duplicate) and ranked. A slow or dead provider
+costs at most the budget, and never fails the search on its own. Only when
+no page at all was answered (every source down, timed out or short-circuited)
+does the search raise ``JobSearchUnavailable``, so callers don't store an
+outage as "no jobs".
+
+Enabled sources come from JOB_SOURCES (comma-separated):
+
+- ``jsearch``: RapidAPI JSearch, through the shared result cache
+- ``file``: a local JSearch-format JSON feed at JOB_SOURCE_FILE_PATH
+  (see scripts/stub_job_feed.json), for tests and offline development
+"""
+
+import abc
+import asyncio
+import json
+import logging
+import os
+from collections.abc import AsyncIterator, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from app.core.config import get_settings
+from app.core.tracing import span
+from app.services.demand_index import normalize_role
+from app.services.job_catalog import search_catalog
+from app.services.job_dedupe import JobDeduplicator
+from app.services.job_ranker import JobRanker
+from app.services.job_search import (
+    QUERY_QUALIFIERS,
+    _normalize_jobs,
+    query_variants,
+    rank_jobs,
+    search_jobs,
+)
+from app.utils.circuit_breaker import CircuitBreaker
+from app.utils.swr_cache import SWRCache
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class JobSearchUnavailable(ConnectionError):
+    """No source answered any page of a search (transient: retry later).
+
+    A ``ConnectionError``, so ``is_transient_error`` and the pipeline's retry
+    policy treat it like any other outage.
+    """
+
+    def __init__(self, report: "FanoutReport"):
+        super().__init__(
+            f"No job source answered: {report.pages} pages, {report.failed} failed, "
+            f"{report.short_circuited} short-circuited, {report.dropped} dropped"
+        )
+        self.report = report
+
+
+class JobSource(abc.ABC):
+    """Adapter for one job provider. Subclasses implement ``search``."""
+
+    name = "base"
+    max_pages: int | None = None  # None: as many as the caller asks for
+
+    def __init__(self, timeout: float | None = None):
+        self.timeout = timeout or settings.JOB_PAGE_TIMEOUT_SECONDS
+        self.breaker = CircuitBreaker(
+            self.name,
+            failure_threshold=settings.JOB_SOURCE_BREAKER_FAILURES,
+            reset_timeout=settings.JOB_SOURCE_BREAKER_RESET_SECONDS,
+        )
+
+    @abc.abstractmethod
+    async def search(
+        self,
+        query: str,
+        location: str | None,
+        remote_only: bool,
+        page: int,
+        date_posted: str,
+        use_cache: bool,
+    ) -> list[dict]:
+        """One page of normalized jobs; raise on failure (counted by the breaker)."""
+
+
+class JSearchSource(JobSource):
+    name = "jsearch"
+
+    async def search(self, query, location, remote_only, page, date_posted, use_cache):
+        return await search_jobs(
+            query, location, remote_only,
+            page=page, date_posted=date_posted, use_cache=use_cache,
+        )
+
+
+class FileJobSource(JobSource):
+    """JSearch-format postings from a local JSON file, filtered like a search.
+
+    A posting matches when its title/description contains every query word
+    except the seniority qualifiers ``query_variants`` adds. The file is
+    re-read (in a worker thread, off the event loop) when it changes.
+    """
+
+    name = "file"
+    max_pages = 1
+
+    def __init__(self, path: str, timeout: float | None = None):
+        super().__init__(timeout)
+        self.path = path
+        self._mtime: float | None = None
+        self._jobs: list[dict] = []
+
+    def _read(self) -> list[dict]:
+        with open(self.path, encoding="utf-8") as f:
+            raw = json.load(f)
+        items = raw.get("data", []) if isinstance(raw, dict) else raw
+        return _normalize_jobs(items)
+
+    async def _load(self) -> list[dict]:
+        mtime = await asyncio.to_thread(os.path.getmtime, self.path)
+        if mtime != self._mtime:
+            self._jobs = await asyncio.to_thread(self._read)
+            self._mtime = mtime
+        return self._jobs
+
+    async def search(self, query, location, remote_only, page, date_posted, use_cache):
+        words = [w for w in query.lower().split() if w not in QUERY_QUALIFIERS]
+        jobs: list[dict] = []
+        for job in await self._load():
+            text = f"{job['title']} {job['description']}".lower()
+            if not all(w in text for w in words):
+                continue
+            if remote_only and not job["is_remote"]:
+                continue
+            if location and location.lower() not in (job["location"] or "").lower() and not job["is_remote"]:
+                continue
+            jobs.append(dict(job))
+        return jobs
+
+
+_sources: list[JobSource] | None = None
+
+
+def build_job_sources(names: str | None = None) -> list[JobSource]:
+    sources: list[JobSource] = []
+    for name in (names if names is not None else settings.JOB_SOURCES).split(","):
+        name = name.strip().lower()
+        if name == "jsearch":
+            sources.append(JSearchSource())
+        elif name == "file":
+            if settings.JOB_SOURCE_FILE_PATH:
+                sources.append(FileJobSource(settings.JOB_SOURCE_FILE_PATH, timeout=1.0))
+            else:
+                logger.warning("Job source 'file' enabled but JOB_SOURCE_FILE_PATH is not set")
+        elif name:
+            logger.warning(f"Unknown job source '{name}' in JOB_SOURCES, ignoring")
+    return sources
+
+
+def get_job_sources() -> list[JobSource]:
+    global _sources
+    if _sources is None:
+        _sources = build_job_sources()
+    return _sources
+
+
+def set_job_sources(sources: list[JobSource] | None) -> None:
+    """Swap the enabled sources (tests / stub feeds). ``None`` resets to settings."""
+    global _sources
+    _sources = sources
+
+
+def get_source_stats() -> dict:
+    return {s.name: s.breaker.as_dict() for s in get_job_sources()}
+
+
+def _dedupe_key(job: dict) -> str | tuple:
+    return job.get("external_job_id") or (
+        (job.get("title") or "").lower(),
+        (job.get("company") or "").lower(),
+        (job.get("location") or "").lower(),
+    )
+
+
+@dataclass
+class FanoutReport:
+    """What happened to the pages of one ``iter_job_pages`` fan-out."""
+
+    pages: int = 0
+    completed: int = 0
+    failed: int = 0  # error or per-page timeout
+    short_circuited: int = 0  # skipped by an open breaker
+    dropped: int = 0  # still pending at the budget deadline
+
+    @property
+    def complete(self) -> bool:
+        """Pages were asked for and every one was answered by its source."""
+        return self.pages > 0 and self.completed == self.pages
+
+
+async def iter_job_pages(
+    queries: list[str],
+    location: str | None = None,
+    remote_only: bool = False,
+    num_pages: int | None = None,
+    date_posted: str = "month",
+    concurrency: int | None = None,
+    page_timeout: float | None = None,
+    use_cache: bool = True,
+    sources: list[JobSource] | None = None,
+    budget: float | None = None,
+    collapse_duplicates: bool = True,
+    report: FanoutReport | None = None,
+) -> AsyncIterator[list[dict]]:
+    """Fetch pages from every source × query concurrently, yielding as they arrive.
+
+    At most ``concurrency`` pages are in flight. Each is bounded by its
+    source's timeout (or ``page_timeout``), and the whole fan-out by
+    ``budget``. Pages that fail, time out, hit an open breaker or miss the
+    budget are skipped, so callers get partial results instead of an error,
+    unless every page was skipped: then ``JobSearchUnavailable`` is raised
+    once the pages are exhausted.
+    Failures, timeouts and pages still running at the budget deadline count
+    against their source's breaker; pages cancelled because the caller
+    stopped iterating (or was itself cancelled) do not.
+    Jobs already yielded by an earlier page (same ``external_job_id``) are
+    dropped. With ``collapse_duplicates``, near-duplicate reposts are merged
+    into the first copy seen (``alternate_locations`` / ``alternate_urls`` on
+    that already-yielded dict) instead of being yielded. Pass a
+    ``FanoutReport`` to find out whether anything was skipped.
+    """
+    num_pages = num_pages or settings.JOB_SEARCH_PAGES
+    sources = get_job_sources() if sources is None else sources
+    sem = asyncio.Semaphore(concurrency or settings.JOB_FANOUT_CONCURRENCY)
+    report = report if report is not None else FanoutReport()
+    in_flight: dict[object, JobSource] = {}  # pages calling their source right now
+
+    async def fetch(source: JobSource, query: str, page: int) -> list[dict]:
+        async with sem:
+            if not source.breaker.allow():
+                report.short_circuited += 1
+                return []
+            call = object()
+            in_flight[call] = source
+            try:
+                jobs = await asyncio.wait_for(
+                    source.search(query, location, remote_only, page, date_posted, use_cache),
+                    page_timeout or source.timeout,
+                )
+            except asyncio.CancelledError:
+                # Abandoned: by the budget (counted there) or by a caller that stopped early
+                source.breaker.release()
+                raise
+            except Exception as e:
+                source.breaker.record_failure()
+                raise RuntimeError(f"{source.name} page {page} for '{query}': {e!r}") from e
+            finally:
+                in_flight.pop(call, None)
+            source.breaker.record_success()
+        report.completed += 1
+        for job in jobs:
+            job.setdefault("source", source.name)
+        return jobs
+
+    tasks = [
+        asyncio.create_task(fetch(s, q, p))
+        for s in sources
+        for q in dict.fromkeys(queries)
+        for p in range(1, min(num_pages, s.max_pages or num_pages) + 1)
+    ]
+    report.pages += len(tasks)
+    answered_before = report.completed
+    skipped_before = report.short_circuited
+    seen: set = set()
+    dedupe = JobDeduplicator()
+    try:
+        for next_page in asyncio.as_completed(tasks, timeout=budget or settings.JOB_SEARCH_BUDGET_SECONDS):
+            try:
+                jobs = await next_page
+            except asyncio.TimeoutError:
+                raise
+            except Exception as e:
+                report.failed += 1
+                logger.warning(f"Job source page failed, continuing with partial results: {e}")
+                continue
+            fresh: list[dict] = []
+            for job in jobs:
+                key = _dedupe_key(job)
+                if key in seen:
+                    continue
+                seen.add(key)
+                if not collapse_duplicates or dedupe.add(job):
+                    fresh.append(job)
+            if fresh:
+                yield fresh
+    except asyncio.TimeoutError:
+        # Pages still calling their source at the deadline are as bad as a timeout
+        for source in list(in_flight.values()):
+            source.breaker.record_failure()
+        in_flight.clear()
+        pending = sum(1 for t in tasks if not t.done())
+        report.dropped += pending
+        logger.warning(f"Job search budget exhausted, returning partial results ({pending} pages dropped)")
+    finally:
+        for task in tasks:
+            task.cancel()
+    if tasks and report.completed == answered_before:
+        if report.short_circuited - skipped_before == len(tasks):
+            open_sources = sorted({s.name for s in sources})
+            logger.error(f"Every job source is short-circuited (breaker open): {', '.join(open_sources)}")
+        raise JobSearchUnavailable(report)
+
+
+# Unranked job pools per (role, location, remote) while ``shared_role_searches`` is active
+_role_pools: ContextVar[SWRCache | None] = ContextVar("role_pools", default=None)
+
+
+@contextmanager
+def shared_role_searches() -> Iterator[SWRCache]:
+    """Within the block, identical role searches share one fetch; only ranking is per user.
+
+    For batch onboarding: a cohort asks for the same few roles again and again.
+    Concurrent callers share the in-flight fetch (single-flight) and later ones
+    reuse the pool for COHORT_ROLE_POOL_TTL_SECONDS. The cache's stats count
+    the fetches saved.
+    """
+    pools = SWRCache(
+        fresh_ttl=settings.COHORT_ROLE_POOL_TTL_SECONDS,
+        stale_ttl=settings.COHORT_ROLE_POOL_TTL_SECONDS,
+        max_entries=1000,
+    )
+    token = _role_pools.set(pools)
+    try:
+        yield pools
+    finally:
+        _role_pools.reset(token)
+
+
+async def collect_role_jobs(role: str, location: str | None = None, remote_only: bool = False) -> list[dict]:
+    """Unranked jobs for a role: the local catalog if warm, else every live page."""
+    try:
+        local = await search_catalog(role, location, remote_only)
+    except Exception as e:
+        logger.warning(f"Catalog search failed, going live: {e}")
+        local = []
+    if len(local) >= settings.CATALOG_MIN_RESULTS:
+        return local
+    jobs: list[dict] = []
+    async for page in iter_job_pages(query_variants(role), location, remote_only):
+        jobs.extend(page)
+    return jobs
+
+
+async def find_jobs_for_role(
+    role: str,
+    user_skills: list[str],
+    location: str | None = None,
+    remote_only: bool = False,
+) -> list[dict]:
+    """Top ranked jobs for a role: local catalog if warm, else live search."""
+    pools = _role_pools.get()
+    if pools is not None:
+        with span("job_search.find_jobs", role=role, source="shared_pool"):
+            pool = await pools.get(
+                (normalize_role(role), location, remote_only),
+                lambda: collect_role_jobs(role, location, remote_only),
+            )
+            with span("job_search.rank", jobs=len(pool)):
+                # The pool is shared; ranking returns new dicts and never mutates it
+                return rank_jobs(pool, user_skills, location)
+
+    with span("job_search.find_jobs", role=role) as current:
+        try:
+            local = await search_catalog(role, location, remote_only)
+        except Exception as e:
+            logger.warning(f"Catalog search failed, going live: {e}")
+            local = []
+        if len(local) >= settings.CATALOG_MIN_RESULTS:
+            if current is not None:
+                current.set(source="catalog")
+            with span("job_search.rank", jobs=len(local)):
+                return rank_jobs(local, user_skills, location)
+        if current is not None:
+            current.set(source="live")
+        return await search_and_rank(query_variants(role), user_skills, location, remote_only)
+
+
+async def search_and_rank(
+    queries: list[str],
+    user_skills: list[str],
+    location: str | None = None,
+    remote_only: bool = False,
+    num_pages: int | None = None,
+) -> list[dict]:
+    """Fan out over sources × queries × pages and score jobs as each page arrives."""
+    ranker = JobRanker(user_skills, location)
+    scored: list[tuple[float, dict]] = []
+    async for page in iter_job_pages(queries, location, remote_only, num_pages):
+        with span("job_search.rank_page", jobs=len(page)):
+            scored.extend(ranker.score_all(page))
+    with span("job_search.rank", jobs=len(scored)):
+        return ranker.top(scored, 20)
@@ -0,0 +1,241 @@
+"""Local job catalog — Postgres full-text search over synced postings.
+
+``app.workers.catalog_sync`` keeps the ``jobs`` table populated with
+incremental per-role/location syncs. ``/jobs/search`` and the pipeline read
+from here first and only go live to RapidAPI for cold queries the catalog
+can't answer.
+
+Near-duplicate postings are linked at ingest: each upserted posting gets a
+MinHash signature and LSH band keys, and is pointed (``canonical_job_id``) at
+the earliest live posting it repeats. Searches collapse each cluster to one
+result carrying the other copies' locations and apply URLs.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import case, delete, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import aliased
+
+from app.core.config import get_settings
+from app.db.session import async_session_factory
+from app.models.job import CatalogJob, JobSearchSnapshot
+from app.services.job_dedupe import (
+    NearDuplicateIndex,
+    band_keys,
+    merge_duplicate,
+    minhash,
+    signature_from_db,
+    signature_to_db,
+)
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+_JOB_FIELDS = (
+    "external_job_id", "title", "company", "location", "is_remote",
+    "apply_url", "description", "salary_range",
+)
+
+
+def _parse_posted_at(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+async def upsert_catalog_jobs(session, jobs: list[dict]) -> int:
+    """Insert or refresh normalized jobs in one statement; returns rows written."""
+    now = datetime.now(timezone.utc)
+    expires_at = now + timedelta(days=settings.CATALOG_JOB_TTL_DAYS)
+    rows: dict[str, dict] = {}
+    for job in jobs:
+        if not job.get("external_job_id"):
+            continue
+        row = {f: job.get(f) for f in _JOB_FIELDS}
+        row["title"] = row["title"] or ""
+        row["company"] = row["company"] or ""
+        row["is_remote"] = bool(row["is_remote"])
+        row["posted_at"] = _parse_posted_at(job.get("posted_at"))
+        signature = minhash(row)
+        row["dedupe_signature"] = signature_to_db(signature)
+        row["dedupe_bands"] = band_keys(signature)
+        row["last_seen_at"] = now
+        row["expires_at"] = expires_at
+        rows[row["external_job_id"]] = row  # last one wins within a batch
+    if not rows:
+        return 0
+
+    stmt = insert(CatalogJob).values(list(rows.values()))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["external_job_id"],
+        set_={
+            **{f: stmt.excluded[f] for f in _JOB_FIELDS if f != "external_job_id"},
+            "posted_at": func.coalesce(stmt.excluded.posted_at, CatalogJob.posted_at),
+            "dedupe_signature": stmt.excluded.dedupe_signature,
+            "dedupe_bands": stmt.excluded.dedupe_bands,
+            "last_seen_at": stmt.excluded.last_seen_at,
+            "expires_at": stmt.excluded.expires_at,
+        },
+    )
+    await session.execute(stmt)
+    await link_near_duplicates(session, set(rows))
+    return len(rows)
+
+
+async def link_near_duplicates(session, external_ids: set[str]) -> int:
+    """Point each given posting at the earliest live posting it near-duplicates.
+
+    One query pulls every live posting sharing an LSH band with the batch;
+    candidates are then verified against their MinHash signatures in memory.
+    A canonical posting that turns out to repeat an older one hands its
+    duplicates over to that one, so clusters never chain. Returns how many of
+    the given postings are duplicates.
+    """
+    if not external_ids:
+        return 0
+    result = await session.execute(
+        select(CatalogJob.dedupe_bands).where(CatalogJob.external_job_id.in_(external_ids))
+    )
+    bands = {key for keys in result.scalars() for key in keys or ()}
+    if not bands:
+        return 0
+
+    result = await session.execute(
+        select(
+            CatalogJob.id,
+            CatalogJob.external_job_id,
+            CatalogJob.dedupe_signature,
+            CatalogJob.dedupe_bands,
+            CatalogJob.canonical_job_id,
+        )
+        .where(
+            CatalogJob.dedupe_bands.overlap(list(bands)),
+            CatalogJob.expires_at > datetime.now(timezone.utc),
+        )
+        .order_by(CatalogJob.first_seen_at, CatalogJob.external_job_id)
+    )
+
+    # Oldest first, so the first posting of a cluster stays its canonical one
+    index = NearDuplicateIndex()
+    updates: list[dict] = []
+    repointed: dict[str, str] = {}  # former canonical -> its new canonical
+    duplicates = 0
+    for pk, external_id, signature, keys, canonical_id in result.all():
+        if not signature:
+            continue
+        signature = signature_from_db(signature)
+        if external_id not in external_ids:
+            if canonical_id is None:
+                index.add(signature, external_id, keys)
+            continue
+        match = index.find(signature, keys)
+        if match is None:
+            index.add(signature, external_id, keys)
+        else:
+            duplicates += 1
+            if canonical_id is None:
+                repointed[external_id] = match
+        if match != canonical_id:
+            updates.append({"id": pk, "canonical_job_id": match})
+
+    if repointed:
+        await session.execute(
+            update(CatalogJob)
+            .where(CatalogJob.canonical_job_id.in_(repointed))
+            .values(canonical_job_id=case(repointed, value=CatalogJob.canonical_job_id))
+        )
+    # After the re-point, so a batch posting's own match wins
+    if updates:
+        await session.execute(update(CatalogJob), updates)
+    return duplicates
+
+
+async def expire_catalog_jobs(session) -> int:
+    """Delete postings not seen by any sync within their TTL.
+
+    Duplicates of a deleted posting become canonical again, and the next sync
+    that sees them re-links them.
+    """
+    result = await session.execute(
+        delete(CatalogJob).where(CatalogJob.expires_at < datetime.now(timezone.utc))
+    )
+    canonical = aliased(CatalogJob)
+    await session.execute(
+        update(CatalogJob)
+        .where(
+            CatalogJob.canonical_job_id.is_not(None),
+            ~select(canonical.id)
+            .where(canonical.external_job_id == CatalogJob.canonical_job_id)
+            .exists(),
+        )
+        .values(canonical_job_id=None)
+    )
+    return result.rowcount or 0
+
+
+async def expire_search_snapshots(session, user_id=None) -> int:
+    """Delete expired ``/jobs/search`` snapshots, of one user or of everyone."""
+    stmt = delete(JobSearchSnapshot).where(JobSearchSnapshot.expires_at < datetime.now(timezone.utc))
+    if user_id is not None:
+        stmt = stmt.where(JobSearchSnapshot.user_id == user_id)
+    result = await session.execute(stmt)
+    return result.rowcount or 0
+
+
+def _to_job_dict(job: CatalogJob) -> dict:
+    data = {f: getattr(job, f) for f in _JOB_FIELDS}
+    data["posted_at"] = job.posted_at.isoformat() if job.posted_at else None
+    return data
+
+
+async def search_catalog(
+    role: str,
+    location: str | None = None,
+    remote_only: bool = False,
+    limit: int | None = None,
+) -> list[dict]:
+    """Full-text search the catalog for a role, best text match first.
+
+    Near-duplicates collapse into their best-matching posting, with the other
+    copies' locations / URLs listed as alternates.
+    """
+    tsquery = func.websearch_to_tsquery("english", role)
+    stmt = (
+        select(CatalogJob)
+        .where(
+            CatalogJob.search_vector.op("@@")(tsquery),
+            CatalogJob.expires_at > datetime.now(timezone.utc),
+        )
+        .order_by(
+            func.ts_rank_cd(CatalogJob.search_vector, tsquery).desc(),
+            CatalogJob.posted_at.desc().nulls_last(),
+        )
+        .limit(limit or settings.CATALOG_SEARCH_LIMIT)
+    )
+    if remote_only:
+        stmt = stmt.where(CatalogJob.is_remote.is_(True))
+    elif location:
+        stmt = stmt.where(
+            or_(CatalogJob.location.icontains(location, autoescape=True), CatalogJob.is_remote.is_(True))
+        )
+
+    async with async_session_factory() as session:
+        result = await session.execute(stmt)
+        rows = result.scalars().all()
+
+    jobs: list[dict] = []
+    clusters: dict[str, dict] = {}
+    for row in rows:
+        job = _to_job_dict(row)
+        key = row.canonical_job_id or row.external_job_id
+        if key in clusters:
+            merge_duplicate(clusters[key], job)
+        else:
+            clusters[key] = job
+            jobs.append(job)
+    return jobs
@@ -0,0 +1,184 @@
+"""Near-duplicate job detection — MinHash signatures with LSH banding.
+
+Aggregators repost the same job, often once per city, with small edits.
+Each posting is reduced to a set of features: 3-word shingles of its
+normalized description plus its title and company tokens. Location is left
+out so cross-city reposts match. A 64-value MinHash signature estimates the
+Jaccard similarity of two feature sets, and postings at or above
+``JOB_DEDUPE_MIN_SIMILARITY`` are treated as one job.
+
+Candidates come from LSH banding. The signature is cut into 16 bands of 4
+rows, and postings that share any band are compared. A pair at 0.7
+similarity shares a band with ~99% probability, while a pair at 0.3 does so
+only ~12% of the time. Lookups stay sub-linear. Band keys are 63-bit ints,
+so the catalog stores them in a GIN-indexed Postgres array (``dedupe_bands``).
+
+Clusters collapse to one canonical job, the first one seen. Later copies add
+their location and apply URL to the canonical job's ``alternate_locations``
+and ``alternate_urls``.
+"""
+
+import hashlib
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.services.job_ranker import tokenize
+
+settings = get_settings()
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+_K1 = np.uint64(0xFF51AFD7ED558CCD)
+_K2 = np.uint64(0xC4CEB9FE1A85EC53)
+_K3 = np.uint64(0x94D049BB133111EB)
+_SALT_TITLE = np.uint64(0x9E3779B97F4A7C15)
+_SALT_COMPANY = np.uint64(0xC2B2AE3D27D4EB4F)
+
+# Fixed seeds: signatures must stay comparable across processes and restarts
+_rng = np.random.default_rng(0x6A6F6264)
+_PERM_SEEDS = _rng.integers(0, 2**63, size=NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_BAND_SEEDS = _rng.integers(0, 2**63, size=(BANDS, ROWS), dtype=np.uint64) | np.uint64(1)
+_EMPTY_SIGNATURE = np.full(NUM_PERM, np.iinfo(np.uint64).max, dtype=np.uint64)
+
+_token_hashes: dict[str, int] = {}
+_TOKEN_HASH_CACHE_SIZE = 200_000
+
+
+def _token_hash(token: str) -> int:
+    # Stable across processes (unlike hash()), so stored signatures stay valid
+    h = _token_hashes.get(token)
+    if h is None:
+        if len(_token_hashes) >= _TOKEN_HASH_CACHE_SIZE:
+            _token_hashes.clear()
+        h = int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little")
+        _token_hashes[token] = h
+    return h
+
+
+def _hash_tokens(tokens: list[str]) -> np.ndarray:
+    return np.fromiter((_token_hash(t) for t in tokens), dtype=np.uint64, count=len(tokens))
+
+
+def _mix(h: np.ndarray) -> np.ndarray:
+    # splitmix64 finalizer, vectorized (uint64 arithmetic wraps)
+    h = (h ^ (h >> np.uint64(30))) * _K1
+    h = (h ^ (h >> np.uint64(27))) * _K2
+    return h ^ (h >> np.uint64(31))
+
+
+def _features(job: dict) -> np.ndarray:
+    title = _hash_tokens(tokenize(job.get("title") or ""))
+    company = _hash_tokens(tokenize(job.get("company") or ""))
+    desc = _hash_tokens(tokenize(job.get("description") or ""))
+    if len(desc) >= 3:
+        with np.errstate(over="ignore"):
+            desc = desc[:-2] * _K1 + desc[1:-1] * _K2 + desc[2:] * _K3
+    return np.unique(np.concatenate((title ^ _SALT_TITLE, company ^ _SALT_COMPANY, desc)))
+
+
+def minhash(job: dict) -> np.ndarray:
+    """``NUM_PERM`` uint64 MinHash values over the job's features."""
+    features = _features(job)
+    if not len(features):
+        return _EMPTY_SIGNATURE.copy()
+    with np.errstate(over="ignore"):
+        return _mix(features[:, None] * _PERM_SEEDS).min(axis=0)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+
+def band_keys(signature: np.ndarray) -> list[int]:
+    """One non-negative 63-bit key per band (fits a Postgres BIGINT)."""
+    with np.errstate(over="ignore"):
+        bands = signature.reshape(BANDS, ROWS) * _BAND_SEEDS
+        keys = _mix(np.bitwise_xor.reduce(bands, axis=1) + np.arange(BANDS, dtype=np.uint64))
+    return (keys >> np.uint64(1)).astype(np.int64).tolist()
+
+
+def signature_to_db(signature: np.ndarray) -> list[int]:
+    return signature.view(np.int64).tolist()
+
+
+def signature_from_db(values: list[int]) -> np.ndarray:
+    return np.asarray(values, dtype=np.int64).view(np.uint64)
+
+
+class NearDuplicateIndex:
+    """Incremental LSH index mapping signatures to canonical items."""
+
+    def __init__(self, min_similarity: float | None = None):
+        self.min_similarity = (
+            settings.JOB_DEDUPE_MIN_SIMILARITY if min_similarity is None else min_similarity
+        )
+        self._signatures: list[np.ndarray] = []
+        self._items: list = []
+        self._buckets: dict[int, list[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def find(self, signature: np.ndarray, keys: list[int] | None = None):
+        """The most similar indexed item at or above ``min_similarity``, if any."""
+        best, best_sim = None, self.min_similarity
+        checked: set[int] = set()
+        for key in keys if keys is not None else band_keys(signature):
+            for i in self._buckets.get(key, ()):
+                if i in checked:
+                    continue
+                checked.add(i)
+                sim = similarity(signature, self._signatures[i])
+                if sim >= best_sim:
+                    best, best_sim = self._items[i], sim
+        return best
+
+    def add(self, signature: np.ndarray, item, keys: list[int] | None = None) -> None:
+        i = len(self._items)
+        self._signatures.append(signature)
+        self._items.append(item)
+        for key in keys if keys is not None else band_keys(signature):
+            self._buckets.setdefault(key, []).append(i)
+
+
+def merge_duplicate(canonical: dict, duplicate: dict) -> None:
+    """Record a duplicate's location / apply URL on its canonical job."""
+    for field, alt_field in (("location", "alternate_locations"), ("apply_url", "alternate_urls")):
+        value = duplicate.get(field)
+        alternates = canonical.setdefault(alt_field, [])
+        if value and value != canonical.get(field) and value not in alternates:
+            alternates.append(value)
+
+
+class JobDeduplicator:
+    """Streaming collapse of near-duplicate jobs into canonical ones.
+
+    ``add`` returns True for a new canonical job and False when the job was
+    merged into one seen earlier. The merge mutates the canonical dict, so
+    callers should hold dicts they own.
+    """
+
+    def __init__(self, min_similarity: float | None = None):
+        self.index = NearDuplicateIndex(min_similarity)
+        self.duplicates = 0
+
+    def add(self, job: dict) -> bool:
+        signature = minhash(job)
+        keys = band_keys(signature)
+        canonical = self.index.find(signature, keys)
+        if canonical is not None:
+            merge_duplicate(canonical, job)
+            self.duplicates += 1
+            return False
+        self.index.add(signature, job, keys)
+        return True
+
+
+def collapse_near_duplicates(jobs: list[dict], min_similarity: float | None = None) -> list[dict]:
+    """Canonical jobs only, in input order, with duplicates merged in."""
+    dedupe = JobDeduplicator(min_similarity)
+    return [job for job in jobs if dedupe.add(job)]
@@ -0,0 +1,205 @@
+"""Precomputed per-user job feeds — "today's matches" served from a table.
+
+Most users open the app once a day, so ranking on every visit is wasted
+work. A user's feed is their top USER_JOB_FEED_SIZE catalog jobs for the
+selected career role, ranked with their resume skills and location
+preference. It is stored in ``user_job_feed`` keyed by (user, rank), so
+``GET /jobs/feed`` is a keyset point lookup instead of a search fan-out.
+
+Recomputation is incremental. A feed is rebuilt only when one of these holds:
+
+- its inputs changed (role, skills, location, remote preference)
+- the catalog synced the user's role since the feed was computed
+- the feed is older than USER_JOB_FEED_MAX_AGE_HOURS, which catches expiry
+  and postings that arrived through other roles' syncs
+
+``GET /jobs/feed`` does not wait for the worker when the inputs changed: a
+feed computed for another role, skill set or location is recomputed inline
+(``current_user_feed``). Entries store list items (``to_stored_job``); the
+description stays in the catalog.
+"""
+
+import hashlib
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import and_, delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import get_settings
+from app.db.session import async_session_factory
+from app.models.career import CareerRecommendation
+from app.models.job import CatalogSyncState, UserFeedState, UserJobFeedEntry
+from app.models.resume import ResumeProfile
+from app.models.user import User
+from app.schemas.job import to_stored_job
+from app.services.job_catalog import search_catalog
+from app.services.job_search import rank_jobs
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class FeedInputs:
+    user_id: uuid.UUID
+    role: str
+    skills: list[str]
+    location: str | None
+    remote_only: bool
+
+    def fingerprint(self) -> str:
+        skills = ",".join(sorted({s.lower() for s in self.skills}))
+        payload = f"{self.role.lower()}|{skills}|{(self.location or '').lower()}|{self.remote_only}"
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+
+async def load_feed_inputs(session, user_id: uuid.UUID | None = None) -> list[FeedInputs]:
+    """Feed inputs for active users with a selected career role."""
+    stmt = (
+        select(
+            User.id,
+            CareerRecommendation.job_role,
+            ResumeProfile.skills,
+            User.location_preference,
+            User.remote_preference,
+        )
+        .join(
+            CareerRecommendation,
+            and_(
+                CareerRecommendation.user_id == User.id,
+                CareerRecommendation.is_selected.is_(True),
+            ),
+        )
+        .outerjoin(ResumeProfile, ResumeProfile.user_id == User.id)
+        .where(User.is_active.is_(True))
+        .order_by(User.id, CareerRecommendation.created_at)
+    )
+    if user_id is not None:
+        stmt = stmt.where(User.id == user_id)
+    result = await session.execute(stmt)
+
+    inputs: dict[uuid.UUID, FeedInputs] = {}
+    for uid, role, skills, location, remote in result.all():
+        # Latest selected role wins if several are flagged
+        inputs[uid] = FeedInputs(uid, role, skills or [], location, remote == "remote")
+    return list(inputs.values())
+
+
+async def compute_user_feed(
+    session,
+    inputs: FeedInputs,
+    catalog_cache: dict | None = None,
+) -> UserFeedState:
+    """Rank the catalog for one user and replace their stored feed."""
+    key = (inputs.role.lower(), (inputs.location or "").lower(), inputs.remote_only)
+    if catalog_cache is not None and key in catalog_cache:
+        candidates = catalog_cache[key]
+    else:
+        candidates = await search_catalog(inputs.role, inputs.location, inputs.remote_only)
+        if catalog_cache is not None:
+            catalog_cache[key] = candidates
+    ranked = rank_jobs(candidates, inputs.skills, inputs.location, limit=settings.USER_JOB_FEED_SIZE)
+
+    now = datetime.now(timezone.utc)
+    await session.execute(delete(UserJobFeedEntry).where(UserJobFeedEntry.user_id == inputs.user_id))
+    if ranked:
+        await session.execute(
+            insert(UserJobFeedEntry).values([
+                {
+                    "user_id": inputs.user_id,
+                    "position": position,
+                    "external_job_id": job.get("external_job_id"),
+                    "match_score": job.get("match_score", 0.0),
+                    "job": to_stored_job(job),
+                }
+                for position, job in enumerate(ranked)
+            ])
+        )
+
+    state = {
+        "user_id": inputs.user_id,
+        "role": inputs.role,
+        "inputs_hash": inputs.fingerprint(),
+        "job_count": len(ranked),
+        "computed_at": now,
+    }
+    stmt = insert(UserFeedState).values(state)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={k: stmt.excluded[k] for k in state if k != "user_id"},
+    )
+    await session.execute(stmt)
+    return UserFeedState(**state)
+
+
+async def current_user_feed(session, user_id: uuid.UUID) -> UserFeedState | None:
+    """A user's feed state, computed now if missing or built from other inputs.
+
+    None when the user has no selected role. Covers the first visit before
+    the worker ran and a role / skills / location change since it last did.
+    """
+    inputs = await load_feed_inputs(session, user_id)
+    if not inputs:
+        return None
+    state = await session.get(UserFeedState, user_id)
+    if state is None or state.inputs_hash != inputs[0].fingerprint():
+        state = await compute_user_feed(session, inputs[0])
+    return state
+
+
+def needs_refresh(
+    inputs: FeedInputs,
+    state: UserFeedState | None,
+    role_synced_at: dict[str, datetime],
+    now: datetime,
+) -> bool:
+    if state is None or state.inputs_hash != inputs.fingerprint():
+        return True
+    if state.computed_at < now - timedelta(hours=settings.USER_JOB_FEED_MAX_AGE_HOURS):
+        return True
+    synced_at = role_synced_at.get(inputs.role.lower())
+    return synced_at is not None and synced_at > state.computed_at
+
+
+async def refresh_user_feeds(force: bool = False) -> dict:
+    """Recompute the feeds whose inputs or catalog slice changed."""
+    now = datetime.now(timezone.utc)
+    async with async_session_factory() as session:
+        all_inputs = await load_feed_inputs(session)
+        result = await session.execute(select(UserFeedState))
+        states = {s.user_id: s for s in result.scalars()}
+        result = await session.execute(
+            select(func.lower(CatalogSyncState.role), func.max(CatalogSyncState.last_synced_at))
+            .group_by(func.lower(CatalogSyncState.role))
+        )
+        role_synced_at = dict(result.all())
+
+    stale = [
+        inputs for inputs in all_inputs
+        if force or needs_refresh(inputs, states.get(inputs.user_id), role_synced_at, now)
+    ]
+
+    # Users sharing a role/location share one catalog query
+    catalog_cache: dict = {}
+    refreshed = failures = 0
+    for inputs in stale:
+        try:
+            async with async_session_factory() as session:
+                await compute_user_feed(session, inputs, catalog_cache)
+                await session.commit()
+            refreshed += 1
+        except Exception as e:
+            failures += 1
+            logger.error(f"Job feed refresh failed for user {inputs.user_id}: {e}")
+
+    summary = {
+        "users": len(all_inputs),
+        "refreshed": refreshed,
+        "unchanged": len(all_inputs) - len(stale),
+        "failed": failures,
+    }
+    logger.info(f"Job feeds: {summary}")
+    return summary
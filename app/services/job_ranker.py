@@ -0,0 +1,205 @@
+"""Job ranking engine — tokenize each job once, match skills on word boundaries.
+
+Each job is normalized a single time — one ``bytes.translate`` pass lowercases
+it and turns everything but alphanumerics, ``+`` and ``#`` into spaces — and
+split into a token set plus a space-joined text; seniority / fresher markers
+are resolved in that same pass. Those per-job features don't depend on the
+user, so they are kept in an LRU cache bounded by JOB_FEATURE_CACHE_MB, keyed
+by ``external_job_id`` plus a hash of title and description, and shared across
+requests — a catalog job is tokenized once per version, not once per search.
+
+A user's skills are normalized the same way into single-token terms (matched
+with one set intersection) and multi-token terms such as "machine learning",
+"node.js" or "ci/cd" (first-token set check, then a substring check against
+the joined text). Both are exact word-boundary matches, so "go" no longer
+matches "good" and "java" no longer matches "javascript".
+The top results are picked with ``heapq.nlargest`` and input dicts are never
+mutated.
+"""
+
+import heapq
+import re
+import sys
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# Alphanumeric runs plus the symbols skills use (c++, c#, node.js, ci/cd, 0-1)
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+(?:[./\-][a-z0-9+#]+)*")
+
+# Byte table for the ranker: A-Z lowercased, a-z 0-9 + # kept, everything else
+# (separators, punctuation and the "?" non-ASCII characters encode to) a space
+_RANK_TABLE = bytes(
+    c + 32 if 65 <= c <= 90 else c if chr(c) in "abcdefghijklmnopqrstuvwxyz0123456789+#" else 32
+    for c in range(256)
+)
+
+SENIOR_MARKERS = [
+    "5+ years", "4+ years", "3+ years", "senior", "lead", "principal",
+]
+FRESHER_MARKERS = [
+    "entry level", "entry-level", "fresher", "freshers", "0-1 year", "0-1 years",
+    "junior", "intern", "internship", "graduate",
+]
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _rank_text(text: str) -> str:
+    """Ranker normalization: one C-level translate, no per-token regex work."""
+    return text.encode("ascii", "replace").translate(_RANK_TABLE).decode("ascii")
+
+
+class _TermSet:
+    """Terms compiled for word-boundary lookup against ``JobFeatures``."""
+
+    def __init__(self, terms: Iterable[str]):
+        self.single: set[str] = set()
+        self.multi: list[tuple[str, str]] = []
+        for term in terms:
+            tokens = _rank_text(term).split()
+            if len(tokens) == 1:
+                self.single.add(tokens[0])
+            elif tokens:
+                self.multi.append((tokens[0], f" {' '.join(tokens)} "))
+
+    def count(self, tokens: set[str], text: str) -> int:
+        hits = len(self.single & tokens)
+        for first, phrase in self.multi:
+            if first in tokens and phrase in text:
+                hits += 1
+        return hits
+
+
+_SENIOR = _TermSet(SENIOR_MARKERS)
+_FRESHER = _TermSet(FRESHER_MARKERS)
+
+
+@dataclass(slots=True)
+class JobFeatures:
+    tokens: set[str]  # built once, never mutated after extraction
+    text: str  # " tok tok ... " over title + description
+    experience_score: int
+    location: str
+
+    @property
+    def nbytes(self) -> int:
+        # The set's table, ~56 bytes per short token string, and the text
+        return sys.getsizeof(self.tokens) + 56 * len(self.tokens) + sys.getsizeof(self.text)
+
+
+def extract_features(job: dict) -> JobFeatures:
+    title_words = _rank_text(job.get("title") or "").split()
+    desc_words = _rank_text(job.get("description") or "").split()
+
+    # Experience fit — fresher friendly (0-20); markers only count in the description
+    tokens = set(desc_words)
+    desc_text = f" {' '.join(desc_words)} "
+    exp_score = 20  # Default: assume entry level
+    if _SENIOR.count(tokens, desc_text):
+        exp_score = 0
+    if _FRESHER.count(tokens, desc_text):
+        exp_score = 20
+
+    # Not interned or frozen: each extra pass over the tokens costs as much as the split
+    tokens.update(title_words)
+    return JobFeatures(
+        tokens=tokens,
+        # Title and description are separated so phrases can't span the two
+        text=f" {' '.join(title_words)} |{desc_text}",
+        experience_score=exp_score,
+        location=(job.get("location") or "").lower(),
+    )
+
+
+_feature_cache: OrderedDict[tuple, JobFeatures] = OrderedDict()
+_feature_cache_bytes = 0
+
+
+def get_features(job: dict) -> JobFeatures:
+    """Per-job features, cached across users by posting id and content.
+
+    The content part of the key is Python's (SipHash) string hash: an edited
+    posting gets new features even if its length is unchanged, at a fraction
+    of a cryptographic digest's cost on the warm path. Least recently used
+    entries are evicted once the cache holds JOB_FEATURE_CACHE_MB.
+    """
+    global _feature_cache_bytes
+    job_id = job.get("external_job_id")
+    if not job_id:
+        return extract_features(job)
+    key = (job_id, hash((job.get("title") or "", job.get("description") or "")))
+    features = _feature_cache.get(key)
+    if features is not None:
+        _feature_cache.move_to_end(key)
+        return features
+    features = _feature_cache[key] = extract_features(job)
+    _feature_cache_bytes += features.nbytes
+    limit = settings.JOB_FEATURE_CACHE_MB * 1024 * 1024
+    while _feature_cache_bytes > limit and len(_feature_cache) > 1:
+        _, evicted = _feature_cache.popitem(last=False)
+        _feature_cache_bytes -= evicted.nbytes
+    return features
+
+
+def clear_feature_cache() -> None:
+    global _feature_cache_bytes
+    _feature_cache.clear()
+    _feature_cache_bytes = 0
+
+
+class JobRanker:
+    """A user's skills and location compiled once, applied to many jobs."""
+
+    def __init__(self, user_skills: list[str], location_pref: str | None = None):
+        skill_set = {s.lower() for s in user_skills}
+        self.skill_count = max(len(skill_set), 1)
+        self.skills = _TermSet(skill_set)
+        self.location_pref = location_pref.lower() if location_pref else None
+
+    def _components(self, job: dict, f: JobFeatures) -> tuple[float, int, int]:
+        # Skill match (0-60)
+        skill_hits = self.skills.count(f.tokens, f.text)
+        skill_score = min(60, (skill_hits / self.skill_count) * 60)
+
+        # Location match (0-20)
+        loc_score = 0
+        if self.location_pref:
+            if self.location_pref in f.location:
+                loc_score = 20
+            elif job.get("is_remote"):
+                loc_score = 15
+
+        return skill_score, loc_score, f.experience_score
+
+    def score(self, job: dict) -> float:
+        skill_score, loc_score, exp_score = self._components(job, get_features(job))
+        return round(skill_score + loc_score + exp_score, 1)
+
+    def score_all(self, jobs: Iterable[dict]) -> list[tuple[float, dict]]:
+        return [(self.score(job), job) for job in jobs]
+
+    def top(self, scored: list[tuple[float, dict]], limit: int = 20) -> list[dict]:
+        """Best ``limit`` jobs as new dicts; ties keep their input order."""
+        ranked: list[dict] = []
+        for score, job in heapq.nlargest(limit, scored, key=lambda s: s[0]):
+            skill_score, loc_score, exp_score = self._components(job, get_features(job))
+            ranked.append({
+                **job,
+                "match_score": score,
+                "match_details": {
+                    "skill_score": round(skill_score, 1),
+                    "location_score": loc_score,
+                    "experience_score": exp_score,
+                },
+            })
+        return ranked
+
+    def rank(self, jobs: Iterable[dict], limit: int = 20) -> list[dict]:
+        return self.top(self.score_all(jobs), limit)
@@ -1,10 +1,49 @@
-"""Job search integration via RapidAPI (JSearch)."""
+"""Job search — RapidAPI (JSearch) client, result normalization and ranking.
 
-import httpx
+Raw (unranked) live results are shared across users through a
+stale-while-revalidate cache keyed by the normalized query; ranking stays
+per-user on top of them. Descriptions are kept in full (no truncation) and
+held zlib-compressed while cached. Fan-out across sources (and the local catalog
+fallback) lives in ``app.services.job_aggregator``.
+"""
+
+import logging
+import zlib
 
 from app.core.config import get_settings
+from app.core.tracing import span
+from app.services.http_client import request_with_retry
+from app.services.job_ranker import JobRanker
+from app.utils.limiter import ConcurrencyLimiter
+from app.utils.swr_cache import SWRCache
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+_search_cache = SWRCache(
+    fresh_ttl=settings.JOB_CACHE_FRESH_SECONDS,
+    stale_ttl=settings.JOB_CACHE_STALE_SECONDS,
+    max_entries=settings.JOB_CACHE_MAX_ENTRIES,
+)
+
+# Process-wide cap on concurrent RapidAPI requests (RAPIDAPI_MAX_CONCURRENCY)
+rapidapi_limiter = ConcurrencyLimiter("rapidapi", settings.RAPIDAPI_MAX_CONCURRENCY)
+
+
+def _cache_key(
+    query: str,
+    location: str | None,
+    remote_only: bool,
+    page: int,
+    num_pages: int,
+    date_posted: str,
+) -> tuple:
+    norm = lambda v: " ".join((v or "").lower().split())  # noqa: E731
+    return (norm(query), norm(location), remote_only, page, num_pages, date_posted)
+
+
+def get_search_cache_stats() -> dict:
+    return {**_search_cache.stats.as_dict(), "entries": len(_search_cache)}
 
 
 async def search_jobs(
@@ -13,6 +52,53 @@ async def search_jobs(
     remote_only: bool = False,
     page: int = 1,
     num_pages: int = 1,
+    date_posted: str = "month",
+    use_cache: bool = True,
+) -> list[dict]:
+    """Search for jobs, served from the shared result cache when possible.
+
+    Returns fresh copies of the job dicts, so callers may rank/mutate them
+    without touching the cached results.
+    """
+    with span("job_search.search", query=query, page=page, cached=use_cache) as current:
+        if not use_cache:
+            return await _fetch_jobs(query, location, remote_only, page, num_pages, date_posted)
+
+        async def load() -> list[dict]:
+            if current is not None:
+                current.set(cached=False)
+            jobs = await _fetch_jobs(query, location, remote_only, page, num_pages, date_posted)
+            return [_compress_description(j) for j in jobs]
+
+        key = _cache_key(query, location, remote_only, page, num_pages, date_posted)
+        return [_expand_description(j) for j in await _search_cache.get(key, load)]
+
+
+def _compress_description(job: dict) -> dict:
+    return {**job, "description": zlib.compress((job.get("description") or "").encode())}
+
+
+def _expand_description(job: dict) -> dict:
+    return {**job, "description": zlib.decompress(job["description"]).decode()}
+
+
+# Seniority words query_variants adds around a role
+QUERY_QUALIFIERS = {"fresher", "entry", "level", "junior", "graduate"}
+
+
+def query_variants(role: str) -> list[str]:
+    """Search phrasings for a role, capped at JOB_SEARCH_QUERY_VARIANTS."""
+    variants = [f"{role} fresher entry level", f"junior {role}", f"{role} graduate"]
+    return variants[: max(1, settings.JOB_SEARCH_QUERY_VARIANTS)]
+
+
+async def _fetch_jobs(
+    query: str,
+    location: str | None,
+    remote_only: bool,
+    page: int,
+    num_pages: int,
+    date_posted: str,
 ) -> list[dict]:
     """Search for jobs via RapidAPI JSearch endpoint.
 
@@ -23,7 +109,7 @@ async def search_jobs(
         "query": query,
         "page": str(page),
         "num_pages": str(num_pages),
-        "date_posted": "month",
+        "date_posted": date_posted,
     }
     if remote_only:
         params["remote_jobs_only"] = "true"
@@ -35,12 +121,16 @@ async def search_jobs(
         "X-RapidAPI-Host": settings.RAPIDAPI_HOST,
     }
 
-    async with httpx.AsyncClient(timeout=30) as client:
-        resp = await client.get(
-            f"{settings.RAPIDAPI_BASE_URL}/search",
-            params=params,
-            headers=headers,
-        )
+    with span("rapidapi.search", query=params["query"], page=page) as current:
+        async with rapidapi_limiter.slot():
+            resp = await request_with_retry(
+                "GET",
+                f"{settings.RAPIDAPI_BASE_URL}/search",
+                params=params,
+                headers=headers,
+            )
+        if current is not None:
+            current.set(**{"http.status_code": resp.status_code})
         resp.raise_for_status()
         data = resp.json()
 
@@ -59,8 +149,9 @@ def _normalize_jobs(raw: list[dict]) -> list[dict]:
             "location": item.get("job_city", "") or item.get("job_country", ""),
             "is_remote": item.get("job_is_remote", False),
             "apply_url": item.get("job_apply_link", ""),
-            "description": item.get("job_description", "")[:2000],  # Truncate
+            "description": item.get("job_description", ""),
             "salary_range": _extract_salary(item),
+            "posted_at": item.get("job_posted_at_datetime_utc"),
         })
     return jobs
 
@@ -76,44 +167,11 @@ def _extract_salary(item: dict) -> str | None:
     return None
 
 
-def rank_jobs(jobs: list[dict], user_skills: list[str], location_pref: str | None = None) -> list[dict]:
+def rank_jobs(
+    jobs: list[dict],
+    user_skills: list[str],
+    location_pref: str | None = None,
+    limit: int = 20,
+) -> list[dict]:
     """Rank jobs by match score based on skill overlap, location, and experience fit."""
-    user_skill_set = {s.lower() for s in user_skills}
-
-    for job in jobs:
-        desc_lower = (job.get("description") or "").lower()
-        title_lower = (job.get("title") or "").lower()
-
-        # Skill match (0-60)
-        skill_hits = sum(1 for s in user_skill_set if s in desc_lower or s in title_lower)
-        skill_score = min(60, (skill_hits / max(len(user_skill_set), 1)) * 60)
-
-        # Location match (0-20)
-        loc_score = 0
-        if location_pref:
-            job_loc = (job.get("location") or "").lower()
-            if location_pref.lower() in job_loc:
-                loc_score = 20
-            elif job.get("is_remote"):
-                loc_score = 15
-
-        # Experience fit — fresher friendly (0-20)
-        exp_score = 20  # Default: assume entry level
-        for marker in ["5+ years", "4+ years", "3+ years", "senior", "lead", "principal"]:
-            if marker in desc_lower:
-                exp_score = 0
-                break
-        for marker in ["entry level", "fresher", "0-1 year", "junior", "intern", "graduate"]:
-            if marker in desc_lower:
-                exp_score = 20
-                break
-
-        job["match_score"] = round(skill_score + loc_score + exp_score, 1)
-        job["match_details"] = {
-            "skill_score": round(skill_score, 1),
-            "location_score": loc_score,
-            "experience_score": exp_score,
-        }
-
-    jobs.sort(key=lambda j: j["match_score"], reverse=True)
-    return jobs[:20]
+    return JobRanker(user_skills, location_pref).rank(jobs, limit)
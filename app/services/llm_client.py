@@ -3,9 +3,14 @@
 import json
 
 import google.generativeai as genai
+import httpx
+import openai
+from google.api_core import exceptions as google_exceptions
 from openai import AsyncOpenAI
 
 from app.core.config import get_settings
+from app.core.tracing import span, traced
+from app.utils.limiter import ConcurrencyLimiter
 
 settings = get_settings()
 
@@ -14,6 +19,9 @@ settings = get_settings()
 _gemini_configured = False
 _openai_client: AsyncOpenAI | None = None
 
+# Process-wide cap on concurrent provider calls (LLM_MAX_CONCURRENCY)
+llm_limiter = ConcurrencyLimiter("llm", settings.LLM_MAX_CONCURRENCY)
+
 
 def _get_gemini_model() -> genai.GenerativeModel:
     global _gemini_configured
@@ -36,14 +44,46 @@ def _get_openai_client() -> AsyncOpenAI:
     return _openai_client
 
 
+# --- Error classification ---
+
+_TRANSIENT_ERRORS = (
+    TimeoutError,
+    ConnectionError,
+    httpx.TransportError,
+    openai.APIConnectionError,  # includes APITimeoutError
+    openai.RateLimitError,
+    openai.InternalServerError,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.ResourceExhausted,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.InternalServerError,
+    google_exceptions.TooManyRequests,
+)
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """Provider outage, rate limit or timeout: the same call may succeed later."""
+    return isinstance(exc, _TRANSIENT_ERRORS)
+
+
 # --- Core generation functions ---
 
 
 async def generate_text(prompt: str, system_prompt: str = "") -> str:
     """Generate text using the configured LLM provider."""
-    if settings.LLM_PROVIDER == "openai":
-        return await _call_openai(prompt, system_prompt)
-    return await _call_gemini(prompt, system_prompt)
+    with span(
+        "llm.generate",
+        **{"llm.provider": settings.LLM_PROVIDER, "llm.model": settings.LLM_MODEL,
+           "llm.prompt_chars": len(prompt) + len(system_prompt)},
+    ) as current:
+        async with llm_limiter.slot():
+            if settings.LLM_PROVIDER == "openai":
+                text = await _call_openai(prompt, system_prompt)
+            else:
+                text = await _call_gemini(prompt, system_prompt)
+        if current is not None:
+            current.set(**{"llm.response_chars": len(text or "")})
+        return text
 
 
 async def generate_json(prompt: str, system_prompt: str = "") -> dict | list:
@@ -95,6 +135,7 @@ async def _call_openai(prompt: str, system_prompt: str) -> str:
 # --- Domain-specific generation functions ---
 
 
+@traced("llm.extract_resume")
 async def extract_resume_structured(resume_text: str) -> dict:
     """Use LLM to extract structured data from resume text."""
     system_prompt = (
@@ -131,6 +172,7 @@ Return JSON in this exact format:
     return await generate_json(prompt, system_prompt)
 
 
+@traced("llm.recommend_roles")
 async def recommend_roles_llm(skills: list[str], education: list[dict], experience: list[dict]) -> list[dict]:
     """Use LLM to recommend career roles based on profile."""
     system_prompt = (
@@ -165,6 +207,7 @@ Order by match_score descending. Scores should be between 0-100."""
     return await generate_json(prompt, system_prompt)
 
 
+@traced("llm.score_resume")
 async def score_resume_llm(resume_text: str, target_role: str) -> dict:
     """Use LLM to perform deep ATS scoring analysis."""
     system_prompt = (
@@ -202,6 +245,27 @@ Return JSON:
     return await generate_json(prompt, system_prompt)
 
 
+@traced("llm.role_keywords")
+async def generate_role_keywords_llm(target_role: str) -> dict:
+    """Use LLM to generate the ATS keyword and skill list for a role."""
+    system_prompt = (
+        "You are an ATS (Applicant Tracking System) expert and technical recruiter. "
+        "You know which terms recruiters and ATS filters look for in fresher resumes."
+    )
+    prompt = f"""List what an ATS screens for in resumes for the role: {target_role}
+
+Return JSON:
+{{
+    "keywords": ["12-15 lowercase terms an ATS would match for this role"],
+    "skills": ["8-12 lowercase hard skills / tools a fresher in this role needs"]
+}}
+
+Use short terms (1-3 words) exactly as they would appear in a resume."""
+
+    return await generate_json(prompt, system_prompt)
+
+
+@traced("llm.referral_message")
 async def generate_referral_message(job_role: str, company_name: str, user_background: str) -> dict:
     """Generate a personalized referral/cold outreach message."""
     system_prompt = (
@@ -223,6 +287,7 @@ Return JSON:
     return await generate_json(prompt, system_prompt)
 
 
+@traced("llm.roadmap")
 async def generate_personalized_roadmap(
     target_role: str,
     skills: list[str],
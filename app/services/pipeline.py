@@ -1,28 +1,61 @@
 """LangGraph multi-step AI pipeline for Job Dhundo.
 
 Orchestrates the full user onboarding flow:
-  Resume Upload → LLM Parse → Career Recommend → Job Search & Match → ATS Score
-
-Each node is an independent step that can be retried or run individually.
-State flows through the graph as a TypedDict.
+  Resume Upload → LLM Parse → Career Recommend → (Job Search & Match ‖ ATS Score)
+
+Job search and ATS scoring both depend only on the parsed resume and the
+selected role, so they run concurrently in one superstep and join before
+END. Each node is an independent step that can be retried or run
+individually. State flows through the graph as a TypedDict. ``errors`` and
+``node_timings`` use reducers, so parallel branches merge instead of
+overwriting each other.
+
+Every run has a run id (the LangGraph ``thread_id``) and is checkpointed
+after each superstep (see ``pipeline_checkpoint``). Nodes raise transient
+LLM / network errors instead of degrading, so their ``RetryPolicy`` retries
+them with exponential backoff. A run that still fails, or whose process
+died, continues from its last checkpoint: ``stream_pipeline(run_id)``
+without an initial state. Completed nodes are never run again.
+
+Job search is speculative: while ``recommend_careers`` waits on the LLM, the
+job search for the keyword matcher's top role (microseconds to compute, and
+usually the LLM's pick too) is already in flight. If the LLM agrees,
+``search_jobs`` awaits that search instead of starting one, which takes a
+full external round-trip off onboarding. Otherwise the guess is cancelled and
+``search_jobs`` searches the LLM's role. ``get_speculation_stats`` reports
+the hit rate.
 """
 
+import asyncio
 import logging
+import operator
+import time
 import uuid
-from typing import Any, TypedDict
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Annotated, Any, TypedDict
 
 from langgraph.graph import END, StateGraph
+from langgraph.types import RetryPolicy
 
+from app.core.config import get_settings
+from app.core.tracing import span, start_trace
 from app.services.ats_scorer import score_resume
-from app.services.career_recommender import recommend_roles
-from app.services.job_search import rank_jobs, search_jobs
+from app.services.career_recommender import predict_top_role, recommend_roles, same_role
+from app.services.job_aggregator import find_jobs_for_role
+from app.services.llm_client import is_transient_error
+from app.services.pipeline_checkpoint import get_checkpointer
 from app.services.resume_parser import parse_resume_with_llm
 
+settings = get_settings()
 logger = logging.getLogger(__name__)
 
 
 # --- Pipeline State ---
 
+def _merge_dicts(left: dict, right: dict) -> dict:
+    return {**(left or {}), **(right or {})}
+
+
 class PipelineState(TypedDict, total=False):
     """State that flows through the LangGraph pipeline."""
     # Input
@@ -42,6 +75,7 @@ class PipelineState(TypedDict, total=False):
     # After career recommendation
     recommendations: list[dict]
     selected_role: str
+    speculation: dict  # keyword-guessed role whose job search started early, and whether it hit
 
     # After job search
     matched_jobs: list[dict]
@@ -49,8 +83,76 @@ class PipelineState(TypedDict, total=False):
     # After ATS scoring
     ats_result: dict
 
-    # Error tracking
-    errors: list[str]
+    # Error tracking (each node returns only its new errors)
+    errors: Annotated[list[str], operator.add]
+
+    # Observability: wall time per node (ms) and the join's summary
+    node_timings: Annotated[dict[str, float], _merge_dicts]
+    timings: dict
+
+
+# --- Speculative job search ---
+
+# In-flight searches for guessed roles, keyed by ``speculation["key"]``. They
+# live in this process only: a run resumed elsewhere simply searches again.
+# search_jobs or join_results takes each one out; a run that dies before
+# either does leaves it to expire after PIPELINE_SPECULATION_TTL_SECONDS.
+_speculative_searches: dict[str, asyncio.Task] = {}
+_speculation_stats = {"hits": 0, "misses": 0}
+
+
+def get_speculation_stats() -> dict:
+    total = _speculation_stats["hits"] + _speculation_stats["misses"]
+    return {
+        **_speculation_stats,
+        "hit_rate": round(_speculation_stats["hits"] / total, 3) if total else None,
+        "in_flight": len(_speculative_searches),
+    }
+
+
+def _search_args(state: PipelineState, role: str) -> tuple:
+    return role, state.get("skills", []), state.get("location_preference"), state.get("remote_preference") == "remote"
+
+
+def _start_speculative_search(state: PipelineState) -> dict | None:
+    """Start the job search for the keyword top role; None if there is no guess."""
+    if not settings.PIPELINE_SPECULATIVE_SEARCH:
+        return None
+    role = predict_top_role(state.get("skills", []))
+    if role is None:
+        return None
+    key = uuid.uuid4().hex
+    task = asyncio.create_task(find_jobs_for_role(*_search_args(state, role)))
+    # A cancelled or abandoned guess must not log "exception was never retrieved"
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    _speculative_searches[key] = task
+    speculation = {"key": key, "role": role}
+    asyncio.get_running_loop().call_later(settings.PIPELINE_SPECULATION_TTL_SECONDS, _drop_speculation, speculation)
+    return speculation
+
+
+def _drop_speculation(speculation: dict | None) -> None:
+    if not speculation:
+        return
+    task = _speculative_searches.pop(speculation["key"], None)
+    if task is not None:
+        task.cancel()
+
+
+def _settle_speculation(speculation: dict | None, selected_role: str | None) -> dict:
+    """Keep the in-flight search if the LLM picked the guessed role, else cancel it.
+
+    ``selected_role`` is None when no search will follow (no recommendations).
+    """
+    if speculation is None:
+        return {}
+    hit = same_role(speculation["role"], selected_role)
+    if selected_role is not None:
+        _speculation_stats["hits" if hit else "misses"] += 1
+    if not hit:
+        _drop_speculation(speculation)
+    logger.info(f"Speculative job search for '{speculation['role']}': {'hit' if hit else 'miss'}")
+    return {"speculation": {**speculation, "hit": hit}}
 
 
 # --- Pipeline Nodes ---
@@ -59,7 +161,7 @@ async def parse_resume_node(state: PipelineState) -> dict:
     """Node 1: Parse the uploaded resume using LLM."""
     logger.info(f"Pipeline: Parsing resume for user {state.get('user_id')}")
     try:
-        parsed = await parse_resume_with_llm(state["resume_file_path"])
+        parsed = await parse_resume_with_llm(state["resume_file_path"], raise_transient=True)
         return {
             "raw_text": parsed.get("raw_text", ""),
             "skills": parsed.get("skills", []),
@@ -67,11 +169,12 @@ async def parse_resume_node(state: PipelineState) -> dict:
             "education": parsed.get("education", []),
             "total_experience_years": parsed.get("total_experience_years", 0.0),
             "summary": parsed.get("summary", ""),
-            "errors": state.get("errors", []),
         }
     except Exception as e:
+        if is_transient_error(e):
+            raise  # RetryPolicy retries; the parse is only checkpointed once it succeeds
         logger.error(f"Resume parsing failed: {e}")
-        return {"errors": state.get("errors", []) + [f"Resume parsing failed: {str(e)}"]}
+        return {"errors": [f"Resume parsing failed: {str(e)}"]}
 
 
 async def recommend_careers_node(state: PipelineState) -> dict:
@@ -81,27 +184,33 @@ async def recommend_careers_node(state: PipelineState) -> dict:
     if not skills:
         return {
             "recommendations": [],
-            "errors": state.get("errors", []) + ["No skills found in resume"],
+            "errors": ["No skills found in resume"],
         }
 
+    speculation = _start_speculative_search(state)
     try:
         recs = await recommend_roles(
             user_skills=skills,
             education=state.get("education"),
             experience=state.get("experience"),
+            raise_transient=True,
         )
         # Auto-select the top role
         selected = recs[0]["job_role"] if recs else "Software Developer"
         return {
             "recommendations": recs,
             "selected_role": selected,
+            **_settle_speculation(speculation, selected if recs else None),
         }
     except Exception as e:
+        _drop_speculation(speculation)
+        if is_transient_error(e):
+            raise
         logger.error(f"Career recommendation failed: {e}")
         return {
             "recommendations": [],
             "selected_role": "Software Developer",
-            "errors": state.get("errors", []) + [f"Career recommendation failed: {str(e)}"],
+            "errors": [f"Career recommendation failed: {str(e)}"],
         }
 
 
@@ -109,23 +218,23 @@ async def search_jobs_node(state: PipelineState) -> dict:
     """Node 3: Search and rank jobs for the selected role."""
     logger.info(f"Pipeline: Searching jobs for role '{state.get('selected_role')}'")
     role = state.get("selected_role", "Software Developer")
-    skills = state.get("skills", [])
-    location = state.get("location_preference")
-    remote = state.get("remote_preference") == "remote"
+    speculation = state.get("speculation") or {}
+    # Popped even when it fails, so a retry searches afresh
+    early = _speculative_searches.pop(speculation["key"], None) if speculation.get("hit") else None
 
     try:
-        raw_jobs = await search_jobs(
-            query=f"{role} fresher entry level",
-            location=location,
-            remote_only=remote,
-        )
-        ranked = rank_jobs(raw_jobs, skills, location)
+        if early is not None:
+            ranked = await early  # started during recommend_careers
+        else:
+            ranked = await find_jobs_for_role(*_search_args(state, role))
         return {"matched_jobs": ranked}
     except Exception as e:
+        if is_transient_error(e):
+            raise  # includes JobSearchUnavailable: an outage is retried, never stored as "no jobs"
         logger.error(f"Job search failed: {e}")
         return {
             "matched_jobs": [],
-            "errors": state.get("errors", []) + [f"Job search failed: {str(e)}"],
+            "errors": [f"Job search failed: {str(e)}"],
         }
 
 
@@ -139,16 +248,47 @@ async def ats_score_node(state: PipelineState) -> dict:
         return {"ats_result": {"score": 0, "suggestions": ["No resume text available"]}}
 
     try:
-        result = await score_resume(raw_text, role)
+        result = await score_resume(raw_text, role, raise_transient=True)
         return {"ats_result": result}
     except Exception as e:
+        if is_transient_error(e):
+            raise
         logger.error(f"ATS scoring failed: {e}")
         return {
             "ats_result": {"score": 0, "suggestions": ["Scoring failed"]},
-            "errors": state.get("errors", []) + [f"ATS scoring failed: {str(e)}"],
+            "errors": [f"ATS scoring failed: {str(e)}"],
         }
 
 
+async def join_results_node(state: PipelineState) -> dict:
+    """Join: runs once both branches are done; summarizes where time went."""
+    t = state.get("node_timings", {})
+    sequential = t.get("parse_resume", 0.0) + t.get("recommend_careers", 0.0)
+    branches = [t[n] for n in ("search_jobs", "ats_score") if n in t]
+    timings = {
+        "nodes": t,
+        # What onboarding waits for now vs. with search → score chained
+        "critical_path_ms": round(sequential + max(branches, default=0.0), 1),
+        "sequential_ms": round(sequential + sum(branches), 1),
+    }
+    if state.get("speculation"):
+        timings["speculative_search"] = {k: state["speculation"][k] for k in ("role", "hit")}
+        _drop_speculation(state["speculation"])  # unclaimed if search_jobs never ran here
+    logger.info(f"Pipeline timings for user {state.get('user_id')}: {timings}")
+    return {"timings": timings}
+
+
+def _timed(name: str, node: Callable[[PipelineState], Awaitable[dict]]):
+    """Wrap a node so its wall time lands in ``node_timings`` (and a trace span)."""
+    async def run(state: PipelineState) -> dict:
+        start = time.perf_counter()
+        with span(f"pipeline.{name}", node=name):
+            update = await node(state)
+        elapsed = round((time.perf_counter() - start) * 1000, 1)
+        return {**update, "node_timings": {name: elapsed}}
+    return run
+
+
 # --- Conditional edges ---
 
 def should_continue_after_parse(state: PipelineState) -> str:
@@ -158,30 +298,44 @@ def should_continue_after_parse(state: PipelineState) -> str:
     return "end"
 
 
-def should_search_jobs(state: PipelineState) -> str:
-    """Only search jobs if we have recommendations."""
+def should_search_jobs(state: PipelineState) -> list[str]:
+    """Search jobs and score in parallel; score alone without recommendations."""
     if state.get("recommendations"):
-        return "search"
-    return "score"  # Skip to scoring even without job search
+        return ["search_jobs", "ats_score"]
+    return ["ats_score"]  # Skip to scoring even without job search
 
 
 # --- Build the graph ---
 
+def node_retry_policy() -> RetryPolicy:
+    """Exponential backoff with jitter for transient LLM / network errors."""
+    return RetryPolicy(
+        initial_interval=settings.PIPELINE_RETRY_INITIAL_SECONDS,
+        backoff_factor=settings.PIPELINE_RETRY_BACKOFF,
+        max_interval=settings.PIPELINE_RETRY_MAX_SECONDS,
+        max_attempts=settings.PIPELINE_NODE_MAX_ATTEMPTS,
+        retry_on=is_transient_error,
+    )
+
+
 def build_pipeline() -> StateGraph:
     """Construct the LangGraph pipeline.
 
     Flow:
         parse_resume → [has skills?]
-            → recommend_careers → search_jobs → ats_score → END
+            → recommend_careers → ┬ search_jobs ┬ → join_results → END
+                                  └ ats_score ──┘
             → END (if no skills extracted)
     """
     workflow = StateGraph(PipelineState)
+    retry = node_retry_policy()
 
-    # Add nodes
-    workflow.add_node("parse_resume", parse_resume_node)
-    workflow.add_node("recommend_careers", recommend_careers_node)
-    workflow.add_node("search_jobs", search_jobs_node)
-    workflow.add_node("ats_score", ats_score_node)
+    # Add nodes (each retried on its own; finished siblings are not re-run)
+    workflow.add_node("parse_resume", _timed("parse_resume", parse_resume_node), retry=retry)
+    workflow.add_node("recommend_careers", _timed("recommend_careers", recommend_careers_node), retry=retry)
+    workflow.add_node("search_jobs", _timed("search_jobs", search_jobs_node), retry=retry)
+    workflow.add_node("ats_score", _timed("ats_score", ats_score_node), retry=retry)
+    workflow.add_node("join_results", join_results_node)
 
     # Set entry point
     workflow.set_entry_point("parse_resume")
@@ -193,16 +347,17 @@ def build_pipeline() -> StateGraph:
         {"recommend": "recommend_careers", "end": END},
     )
 
-    # Conditional: after recommendation, check if we should search
+    # Fan out: search and score run concurrently in the same superstep
     workflow.add_conditional_edges(
         "recommend_careers",
         should_search_jobs,
-        {"search": "search_jobs", "score": "ats_score"},
+        ["search_jobs", "ats_score"],
     )
 
-    # Linear: search → score → end
-    workflow.add_edge("search_jobs", "ats_score")
-    workflow.add_edge("ats_score", END)
+    # Join: both branches finish in that superstep, so this runs once after them
+    workflow.add_edge("search_jobs", "join_results")
+    workflow.add_edge("ats_score", "join_results")
+    workflow.add_edge("join_results", END)
 
     return workflow
 
@@ -210,30 +365,30 @@ def build_pipeline() -> StateGraph:
 # --- Compiled pipeline (singleton) ---
 
 _compiled_pipeline = None
+_compiled_checkpointer = None
 
 
 def get_pipeline():
-    """Get the compiled LangGraph pipeline (cached)."""
-    global _compiled_pipeline
-    if _compiled_pipeline is None:
-        _compiled_pipeline = build_pipeline().compile()
+    """Get the compiled LangGraph pipeline (cached per checkpoint store)."""
+    global _compiled_pipeline, _compiled_checkpointer
+    checkpointer = get_checkpointer()
+    if _compiled_pipeline is None or _compiled_checkpointer is not checkpointer:
+        _compiled_pipeline = build_pipeline().compile(checkpointer=checkpointer)
+        _compiled_checkpointer = checkpointer
     return _compiled_pipeline
 
 
-async def run_full_pipeline(
+def _run_config(run_id: str) -> dict:
+    return {"configurable": {"thread_id": str(run_id)}}
+
+
+def make_initial_state(
     user_id: str,
     resume_file_path: str,
     location_preference: str | None = None,
     remote_preference: str | None = None,
 ) -> PipelineState:
-    """Execute the full onboarding pipeline.
-
-    Returns the final state with all extracted data, recommendations,
-    matched jobs, and ATS score.
-    """
-    pipeline = get_pipeline()
-
-    initial_state: PipelineState = {
+    return {
         "user_id": user_id,
         "resume_file_path": resume_file_path,
         "location_preference": location_preference,
@@ -241,5 +396,59 @@ async def run_full_pipeline(
         "errors": [],
     }
 
-    result = await pipeline.ainvoke(initial_state)
+
+async def run_full_pipeline(
+    user_id: str,
+    resume_file_path: str,
+    location_preference: str | None = None,
+    remote_preference: str | None = None,
+    run_id: str | None = None,
+) -> PipelineState:
+    """Execute the full onboarding pipeline.
+
+    Returns the final state with all extracted data, recommendations,
+    matched jobs, and ATS score. Progress is checkpointed under ``run_id``
+    (a fresh id when omitted), so a failed run can be resumed.
+    """
+    pipeline = get_pipeline()
+    initial_state = make_initial_state(user_id, resume_file_path, location_preference, remote_preference)
+    run_id = run_id or uuid.uuid4().hex
+    with start_trace("pipeline.run", trace_id=run_id, run_id=run_id, user_id=user_id):
+        result = await pipeline.ainvoke(initial_state, _run_config(run_id))
     return result
+
+
+async def invoke_pipeline(run_id: str, initial_state: PipelineState | None = None) -> PipelineState:
+    """Start (``initial_state``) or resume (None) a run and return its final state."""
+    return await get_pipeline().ainvoke(initial_state, _run_config(run_id))
+
+
+async def stream_pipeline(
+    run_id: str,
+    initial_state: PipelineState | None = None,
+) -> AsyncIterator[tuple[str, dict]]:
+    """Start (``initial_state``) or resume (None) a run, yielding per-node updates.
+
+    Yields ``(node, update)`` as each node finishes, so callers can publish
+    partial state (skills first, then roles, jobs and ATS) before the run
+    ends. Every update is checkpointed before it is yielded.
+    """
+    config = _run_config(run_id)
+    async for chunk in get_pipeline().astream(initial_state, config, stream_mode="updates"):
+        if chunk.get("__metadata__", {}).get("cached"):
+            continue  # A finished sibling's writes replayed on resume, not new work
+        for node, update in chunk.items():
+            yield node, update or {}
+
+
+async def get_run_progress(run_id: str) -> dict | None:
+    """Checkpointed progress of a run, or None if it never checkpointed."""
+    snapshot = await get_pipeline().aget_state(_run_config(run_id))
+    if not snapshot.values:
+        return None
+    return {
+        "completed_nodes": list(snapshot.values.get("node_timings", {})),
+        "next_nodes": list(snapshot.next),
+        "finished": not snapshot.next,
+        "state": snapshot.values,
+    }
@@ -0,0 +1,108 @@
+"""Durable LangGraph checkpoints for the onboarding pipeline.
+
+The compiled pipeline writes a checkpoint after every superstep, keyed by
+the run id (LangGraph ``thread_id``). A run that dies mid-way, whether from
+a node that exhausted its retries or a restarted process, can be resumed:
+LangGraph reloads the last checkpoint and runs only the nodes that had not
+finished. A completed LLM parse is never paid for twice.
+
+Checkpoints go to Postgres (``checkpoints*`` tables, created on startup by
+``AsyncPostgresSaver.setup``) through a small psycopg pool next to the
+asyncpg engine. With PIPELINE_CHECKPOINTS off, an in-memory saver is used:
+runs can still be resumed within one process, but not after a restart.
+With it on, ``start_checkpointer`` must run first; ``get_checkpointer``
+refuses to fall back to memory silently.
+
+A completed run's checkpoints are dropped PIPELINE_CHECKPOINT_RETENTION_HOURS
+after it finished (``delete_checkpoints``, from a delayed task).
+"""
+
+import logging
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import MemorySaver
+from sqlalchemy.engine import make_url
+
+from app.core.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+_saver: BaseCheckpointSaver | None = None
+_pool = None
+
+
+def checkpoint_conninfo() -> str:
+    """libpq connection string for DATABASE_URL (drops the ``+asyncpg`` driver)."""
+    url = make_url(settings.DATABASE_URL).set(drivername="postgresql")
+    return url.render_as_string(hide_password=False)
+
+
+async def start_checkpointer() -> BaseCheckpointSaver:
+    """Open the checkpoint store (called from the app lifespan / workers)."""
+    global _saver, _pool
+    if _saver is not None:
+        return _saver
+    if not settings.PIPELINE_CHECKPOINTS:
+        _saver = MemorySaver()
+        return _saver
+
+    from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+    from psycopg.rows import dict_row
+    from psycopg_pool import AsyncConnectionPool
+
+    pool = AsyncConnectionPool(
+        checkpoint_conninfo(),
+        max_size=settings.PIPELINE_CHECKPOINT_POOL_SIZE,
+        kwargs={"autocommit": True, "prepare_threshold": 0, "row_factory": dict_row},
+        open=False,
+    )
+    await pool.open()
+    saver = AsyncPostgresSaver(pool)
+    await saver.setup()
+    _pool, _saver = pool, saver
+    logger.info("Pipeline checkpoints: Postgres")
+    return _saver
+
+
+async def close_checkpointer() -> None:
+    global _saver, _pool
+    if _pool is not None:
+        await _pool.close()
+    _saver = _pool = None
+
+
+def get_checkpointer() -> BaseCheckpointSaver:
+    """The open checkpoint store.
+
+    In-memory if ``start_checkpointer`` never ran and PIPELINE_CHECKPOINTS is
+    off; with it on, that is a startup bug, and runs would lose their resume.
+    """
+    global _saver
+    if _saver is None:
+        if settings.PIPELINE_CHECKPOINTS:
+            raise RuntimeError("PIPELINE_CHECKPOINTS is on but start_checkpointer() was never called")
+        _saver = MemorySaver()
+    return _saver
+
+
+async def delete_checkpoints(thread_ids: list[str]) -> None:
+    """Drop every checkpoint of these runs (the pinned savers have no ``adelete_thread``)."""
+    if not thread_ids:
+        return
+    saver = get_checkpointer()
+    if isinstance(saver, MemorySaver):
+        for thread_id in thread_ids:
+            saver.storage.pop(thread_id, None)
+        for key in [k for k in saver.writes if k[0] in thread_ids]:
+            del saver.writes[key]
+        return
+    async with _pool.connection() as conn, conn.transaction():
+        for table in ("checkpoint_writes", "checkpoint_blobs", "checkpoints"):
+            await conn.execute(f"DELETE FROM {table} WHERE thread_id = ANY(%s)", (thread_ids,))
+
+
+def set_checkpointer(saver: BaseCheckpointSaver | None) -> None:
+    """Swap the checkpoint store (tests). ``None`` resets it."""
+    global _saver
+    _saver = saver
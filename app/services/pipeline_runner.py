@@ -0,0 +1,377 @@
+"""Background onboarding runs with persisted, streamable progress events.
+
+``POST /pipeline/onboard`` records a ``PipelineRun``, queues it as a
+``pipeline.run`` task, and answers 202 right away. A task worker executes it
+(``execute_run``), streaming the graph with ``stream_pipeline``.
+As each node finishes, its slice of the state (skills, then roles, then
+jobs and ATS score) is stored as a ``PipelineRunEvent``, and in-process SSE
+listeners are woken. Listeners in other processes see the event on their
+next poll (PIPELINE_EVENTS_POLL_SECONDS). Once the graph ends, the results
+are persisted to the profile and recommendations, and a terminal
+``completed`` (or ``failed``) event is written.
+
+A failing run raises, so the task queue retries it with backoff. Every
+attempt resumes from the last checkpoint; so does a crashed worker's task
+when it is re-claimed. An attempt first records a ``resumed`` event, and
+nodes that already finished are not run again. A failed attempt with
+attempts left records a ``retrying`` event and the run stays ``running``.
+The run is marked ``failed`` (terminal ``failed`` event) once its task is
+dead-lettered, whether it raised, timed out or its lease lapsed. It can then
+be resumed by hand.
+
+Completing a run queues a ``pipeline.drop_checkpoint`` task delayed by
+PIPELINE_CHECKPOINT_RETENTION_HOURS. Until it runs, ``GET /runs/{id}`` serves
+the result from the checkpoint (any ``?fields=``); after, from the stored
+``completed`` event (default job fields).
+"""
+
+import asyncio
+import logging
+import uuid
+from collections.abc import AsyncIterator
+
+from sqlalchemy import delete, func, null, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import get_settings
+from app.core.tracing import span, start_trace
+from app.db.session import async_session_factory
+from app.models.career import CareerRecommendation
+from app.models.pipeline import PipelineRun, PipelineRunEvent
+from app.models.resume import ResumeProfile
+from app.models.task import Task
+from app.models.user import User
+from app.schemas.job import JOB_LIST_DEFAULT_FIELDS, to_list_item
+from app.services.pipeline import get_run_progress, make_initial_state, stream_pipeline
+from app.services.pipeline_checkpoint import delete_checkpoints
+from app.services.role_insights import insight_rows_from_state, upsert_insights
+from app.services.task_queue import enqueue
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+TERMINAL_EVENTS = ("completed", "failed")
+LIVE_TASK_STATUSES = ("queued", "running")
+
+_signals: dict[uuid.UUID, asyncio.Event] = {}
+
+
+# --- Result shaping ---
+
+def _list_items(jobs: list[dict], fields: tuple[str, ...]) -> list[dict]:
+    # Top 10, as compact list items
+    return [to_list_item(j, fields).model_dump(mode="json", exclude_unset=True) for j in jobs[:10]]
+
+
+def node_event_data(node: str, update: dict) -> dict:
+    """The part of a node's state update a client can render right away."""
+    data: dict = {}
+    if node == "parse_resume":
+        data = {
+            "skills_extracted": update.get("skills", []),
+            "experience_years": update.get("total_experience_years", 0),
+            "summary": update.get("summary", ""),
+        }
+    elif node == "recommend_careers":
+        data = {
+            "career_recommendations": update.get("recommendations", []),
+            "top_role": update.get("selected_role", ""),
+        }
+    elif node == "search_jobs":
+        data = {"matched_jobs": _list_items(update.get("matched_jobs", []), JOB_LIST_DEFAULT_FIELDS)}
+    elif node == "ats_score":
+        data = {"ats_score": update.get("ats_result", {})}
+    elif node == "join_results":
+        data = {"timings": update.get("timings", {})}
+    if update.get("errors"):
+        data["errors"] = update["errors"]
+    return data
+
+
+def onboarding_result(state: dict, fields: tuple[str, ...] = JOB_LIST_DEFAULT_FIELDS) -> dict:
+    """The full onboarding response for a finished run's final state."""
+    return {
+        "skills_extracted": state.get("skills", []),
+        "experience_years": state.get("total_experience_years", 0),
+        "career_recommendations": state.get("recommendations", []),
+        "top_role": state.get("selected_role", ""),
+        "matched_jobs": _list_items(state.get("matched_jobs", []), fields),
+        "ats_score": state.get("ats_result", {}),
+        "errors": state.get("errors", []),
+        "timings": state.get("timings", {}),
+    }
+
+
+# --- Persistence ---
+
+async def _write_onboarding(session, results: dict[uuid.UUID, tuple[str, dict]]) -> None:
+    """Profiles, recommendations and top-role insights of finished runs, by user.
+
+    One upsert for all profiles, one delete + one multi-row insert for the
+    recommendations (a re-run replaces them) and one upsert seeding the top
+    roles' insights, whatever the number of users.
+    """
+    profiles = []
+    recs = []
+    for user_id, (file_path, state) in results.items():
+        ats = state.get("ats_result") or None
+        profiles.append({
+            "id": uuid.uuid4(),
+            "user_id": user_id,
+            "resume_file_path": file_path,
+            "raw_text": state.get("raw_text", ""),
+            "skills": state.get("skills", []),
+            "experience": state.get("experience", []),
+            "education": state.get("education", []),
+            "total_experience_years": state.get("total_experience_years", 0.0),
+            "ats_score": ats.get("score", 0) if ats else None,
+            "ats_feedback": ats if ats else null(),  # SQL NULL, not JSON null, for the coalesce
+        })
+        recs.extend({
+            "id": uuid.uuid4(),
+            "user_id": user_id,
+            "job_role": r["job_role"],
+            "match_score": r["match_score"],
+            "matched_skills": r.get("matched_skills", []),
+            "missing_skills": r.get("missing_skills", []),
+        } for r in state.get("recommendations", []))
+
+    stmt = insert(ResumeProfile).values(profiles)
+    await session.execute(stmt.on_conflict_do_update(
+        index_elements=[ResumeProfile.user_id],
+        set_={
+            "resume_file_path": stmt.excluded.resume_file_path,
+            "raw_text": stmt.excluded.raw_text,
+            "skills": stmt.excluded.skills,
+            "experience": stmt.excluded.experience,
+            "education": stmt.excluded.education,
+            "total_experience_years": stmt.excluded.total_experience_years,
+            # A run without an ATS result keeps the previous score
+            "ats_score": func.coalesce(stmt.excluded.ats_score, ResumeProfile.ats_score),
+            "ats_feedback": func.coalesce(stmt.excluded.ats_feedback, ResumeProfile.ats_feedback),
+            "updated_at": func.now(),
+        },
+    ))
+    await session.execute(delete(CareerRecommendation).where(CareerRecommendation.user_id.in_(list(results))))
+    if recs:
+        await session.execute(insert(CareerRecommendation).values(recs))
+    await upsert_insights(session, [
+        row for user_id, (_, state) in results.items() for row in insight_rows_from_state(user_id, state)
+    ])
+
+
+async def persist_onboarding_results(session, user_id: uuid.UUID, file_path: str, state: dict) -> None:
+    """Write the parsed profile, ATS score and recommendations of a run (set-based; the caller commits)."""
+    await _write_onboarding(session, {user_id: (file_path, state)})
+
+
+async def persist_onboarding_batch(session, runs: list[tuple[PipelineRun, dict]]) -> None:
+    """``persist_onboarding_results`` for many finished runs in a few statements.
+
+    The same statements as for one run, plus one update marking the runs
+    completed. Used by cohort onboarding; the caller commits.
+    """
+    if not runs:
+        return
+    # One row per user: an upsert cannot touch the same profile twice
+    await _write_onboarding(session, {run.user_id: (run.resume_file_path, state) for run, state in runs})
+    await session.execute(
+        update(PipelineRun)
+        .where(PipelineRun.id.in_([run.id for run, _ in runs]))
+        .values(status="completed", error=None)
+    )
+
+
+async def schedule_checkpoint_drop(session, run_ids: list[uuid.UUID]) -> None:
+    """Queue the deletion of completed runs' checkpoints after the retention window."""
+    if not run_ids:
+        return
+    await enqueue(
+        session,
+        "pipeline.drop_checkpoint",
+        {"run_ids": [str(run_id) for run_id in run_ids]},
+        delay=settings.PIPELINE_CHECKPOINT_RETENTION_HOURS * 3600,
+    )
+
+
+async def drop_checkpoints(run_ids: list[uuid.UUID]) -> int:
+    """Delete the checkpoints of those runs that are (still) completed."""
+    async with async_session_factory() as session:
+        result = await session.execute(
+            select(PipelineRun.id).where(PipelineRun.id.in_(run_ids), PipelineRun.status == "completed")
+        )
+        completed = [str(run_id) for run_id in result.scalars()]
+    await delete_checkpoints(completed)
+    return len(completed)
+
+
+async def completed_result(session, run_id: uuid.UUID) -> dict | None:
+    """The result stored with a run's ``completed`` event (once its checkpoint is gone)."""
+    result = await session.execute(
+        select(PipelineRunEvent.data)
+        .where(PipelineRunEvent.run_id == run_id, PipelineRunEvent.event == "completed")
+        .order_by(PipelineRunEvent.id.desc())
+        .limit(1)
+    )
+    return result.scalar()
+
+
+async def record_event(run_id: uuid.UUID, event: str, data: dict) -> None:
+    """Persist one progress event and wake this process's listeners."""
+    async with async_session_factory() as session:
+        session.add(PipelineRunEvent(run_id=run_id, event=event, data=data))
+        await session.commit()
+    signal = _signals.get(run_id)
+    if signal is not None:
+        # Fresh event for the next round; whoever holds the old one wakes now
+        _signals[run_id] = asyncio.Event()
+        signal.set()
+
+
+async def list_events(session, run_id: uuid.UUID, after_id: int = 0) -> list[PipelineRunEvent]:
+    result = await session.execute(
+        select(PipelineRunEvent)
+        .where(PipelineRunEvent.run_id == run_id, PipelineRunEvent.id > after_id)
+        .order_by(PipelineRunEvent.id)
+    )
+    return list(result.scalars())
+
+
+async def follow_events(run_id: uuid.UUID, after_id: int = 0) -> AsyncIterator[PipelineRunEvent | None]:
+    """Stored events after ``after_id``, then live ones until the run ends.
+
+    A ``failed`` event from an earlier attempt does not end the stream when
+    the run was resumed after it.
+
+    Yields None whenever PIPELINE_EVENTS_POLL_SECONDS pass without news (SSE
+    keep-alive). Wakes at once for runs executing in this process, and polls
+    for runs executing elsewhere.
+    """
+    while True:
+        # Taken before the query, so an event recorded in between still wakes us
+        signal = _signals.get(run_id)
+        async with async_session_factory() as session:
+            events = await list_events(session, run_id, after_id)
+        for event in events:
+            yield event
+            after_id = event.id
+        if events:
+            # A terminal event ends the stream unless the run was resumed since
+            if events[-1].event in TERMINAL_EVENTS:
+                async with async_session_factory() as session:
+                    run = await session.get(PipelineRun, run_id)
+                if run is None or run.status != "running":
+                    return
+            continue
+        try:
+            if signal is None:
+                await asyncio.sleep(settings.PIPELINE_EVENTS_POLL_SECONDS)
+            else:
+                await asyncio.wait_for(signal.wait(), settings.PIPELINE_EVENTS_POLL_SECONDS)
+                continue
+        except asyncio.TimeoutError:
+            pass
+        yield None
+
+
+# --- Execution ---
+
+async def execute_run(run_id: uuid.UUID, final_attempt: bool = True) -> None:
+    """Run the graph for a recorded run, publishing node events.
+
+    A run that already has a checkpoint (failed, or its worker died) resumes
+    from it instead of starting over. Errors are re-raised after they are
+    recorded, for the task queue to retry; only the ``final_attempt`` marks
+    the run failed.
+    """
+    async with async_session_factory() as session:
+        run = await session.get(PipelineRun, run_id)
+        user = await session.get(User, run.user_id) if run else None
+    if run is None or user is None:
+        logger.error(f"Pipeline run {run_id} not found")
+        return
+
+    initial_state = make_initial_state(
+        str(user.id), run.resume_file_path, user.location_preference, user.remote_preference,
+    )
+    _signals[run_id] = asyncio.Event()
+    try:
+        with start_trace("pipeline.run", trace_id=run_id, run_id=str(run_id), user_id=str(user.id)) as root:
+            progress = await get_run_progress(str(run_id))
+            if progress is not None:
+                # Continue from the checkpoint; a finished run streams nothing
+                initial_state = None
+                if root is not None:
+                    root.set(resumed=True)
+                await record_event(run_id, "resumed", {"completed_nodes": progress["completed_nodes"]})
+            async for node, node_update in stream_pipeline(str(run_id), initial_state):
+                await record_event(run_id, node, node_event_data(node, node_update))
+
+            state = (await get_run_progress(str(run_id)))["state"]
+            with span("pipeline.persist_results"):
+                async with async_session_factory() as session:
+                    run = await session.get(PipelineRun, run_id)
+                    if run.status != "completed":
+                        await persist_onboarding_results(session, run.user_id, run.resume_file_path, state)
+                        run.status = "completed"
+                        run.error = None
+                        if settings.ROLE_INSIGHTS_AFTER_ONBOARDING:
+                            # Evaluate the other recommended roles before the user flips to them
+                            await enqueue(session, "career.explore", {}, user_id=run.user_id,
+                                          idempotency_key=f"career.explore:{run_id}")
+                        await schedule_checkpoint_drop(session, [run_id])
+                    await session.commit()
+        await record_event(run_id, "completed", onboarding_result(state))
+        logger.info(f"Pipeline run {run_id} completed")
+    except Exception as e:
+        logger.error(f"Pipeline run {run_id} failed: {e}")
+        if final_attempt:
+            await fail_run(run_id, str(e))
+        else:
+            await record_event(run_id, "retrying", {
+                "error": str(e)[:2000],
+                "message": "Retrying from the last completed step",
+            })
+        raise
+    finally:
+        _signals.pop(run_id, None)
+
+
+async def fail_run(run_id: uuid.UUID, error: str) -> None:
+    """Mark a running run failed and publish its terminal event (no-op otherwise)."""
+    async with async_session_factory() as session:
+        run = await session.get(PipelineRun, run_id)
+        if run is None or run.status != "running":
+            return
+        run.status = "failed"
+        run.error = error[:2000]
+        await session.commit()
+    await record_event(run_id, "failed", {
+        "error": error[:2000],
+        "message": "Completed steps are saved; resume the run to continue",
+    })
+
+
+async def has_live_task(session, run_id: uuid.UUID) -> bool:
+    """Whether a queued or running ``pipeline.run`` task will still execute the run."""
+    result = await session.execute(
+        select(Task.id).where(
+            Task.kind == "pipeline.run",
+            Task.payload["run_id"].astext == str(run_id),
+            Task.status.in_(LIVE_TASK_STATUSES),
+        ).limit(1)
+    )
+    return result.scalar() is not None
+
+
+async def enqueue_run(session, run: PipelineRun, resume: bool = False) -> Task:
+    """Queue a run for the task workers (in the caller's transaction)."""
+    return await enqueue(
+        session,
+        "pipeline.run",
+        # The run id doubles as the trace id of every attempt
+        {"run_id": str(run.id), "trace_id": run.id.hex},
+        user_id=run.user_id,
+        # A first start is submitted once; each resume is a new attempt
+        idempotency_key=None if resume else f"pipeline.run:{run.id}",
+    )
@@ -1,21 +1,49 @@
 """Resume parser — PDF text extraction + LLM-powered structured extraction.
 
 Strategy:
-1. Extract raw text from PDF via pdfplumber
+1. Extract raw text from PDF via pdfplumber (in a thread or process pool)
 2. Run LLM extraction for accurate skill/experience/education parsing
 3. Fall back to regex-based extraction if LLM fails (rate limit, API down, etc.)
 """
 
+import asyncio
 import logging
+import multiprocessing
+import os
 import re
+import uuid
+from concurrent.futures import ProcessPoolExecutor
 
 import pdfplumber
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
 
-from app.services.llm_client import extract_resume_structured
+from app.core.config import get_settings
+from app.core.tracing import span
+from app.models.resume import ResumeProfile
+from app.services.llm_client import extract_resume_structured, is_transient_error
+from app.utils.limiter import ConcurrencyLimiter
 
+settings = get_settings()
 logger = logging.getLogger(__name__)
 
 
+# --- Uploaded files ---
+
+def upload_path(user_id: uuid.UUID) -> str:
+    """A new server-chosen path for one of the user's resume uploads."""
+    return os.path.join(settings.UPLOAD_DIR, f"{user_id}_{uuid.uuid4().hex}.pdf")
+
+
+def is_user_upload(file_path: str, user_id: uuid.UUID) -> bool:
+    """Whether ``file_path`` is one of the user's own files directly in UPLOAD_DIR."""
+    real = os.path.realpath(file_path)
+    return (
+        os.path.dirname(real) == os.path.realpath(settings.UPLOAD_DIR)
+        and os.path.basename(real).startswith(f"{user_id}_")
+    )
+
+
 # --- PDF text extraction ---
 
 def extract_text_from_pdf(file_path: str) -> str:
@@ -29,15 +57,49 @@ def extract_text_from_pdf(file_path: str) -> str:
     return "\n".join(text_parts)
 
 
+# pdfplumber is CPU-bound: run it off the event loop, PDF_MAX_CONCURRENCY at a time
+pdf_limiter = ConcurrencyLimiter("pdf", settings.PDF_MAX_CONCURRENCY)
+_pdf_pool: ProcessPoolExecutor | None = None
+
+
+def _get_pdf_pool() -> ProcessPoolExecutor | None:
+    global _pdf_pool
+    if settings.PDF_PROCESS_WORKERS > 0 and _pdf_pool is None:
+        _pdf_pool = ProcessPoolExecutor(settings.PDF_PROCESS_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _pdf_pool
+
+
+def shutdown_pdf_pool() -> None:
+    global _pdf_pool
+    if _pdf_pool is not None:
+        _pdf_pool.shutdown(cancel_futures=True)
+        _pdf_pool = None
+
+
+async def extract_pdf_text(file_path: str) -> str:
+    """``extract_text_from_pdf`` in the PDF process pool (PDF_PROCESS_WORKERS) or a thread."""
+    with span("resume.extract_pdf") as current:
+        async with pdf_limiter.slot():
+            pool = _get_pdf_pool()
+            if pool is not None:
+                text = await asyncio.get_running_loop().run_in_executor(pool, extract_text_from_pdf, file_path)
+            else:
+                text = await asyncio.to_thread(extract_text_from_pdf, file_path)
+        if current is not None:
+            current.set(chars=len(text), process_pool=pool is not None)
+        return text
+
+
 # --- LLM-powered parsing (primary) ---
 
-async def parse_resume_with_llm(file_path: str) -> dict:
+async def parse_resume_with_llm(file_path: str, raise_transient: bool = False) -> dict:
     """Parse resume using LLM for high-accuracy extraction.
 
     Returns structured dict with skills, experience, education, etc.
-    Falls back to regex if LLM call fails.
+    Falls back to regex if LLM call fails. With ``raise_transient``, provider
+    outages and rate limits are raised instead so the caller can retry.
     """
-    raw_text = extract_text_from_pdf(file_path)
+    raw_text = await extract_pdf_text(file_path)
     if not raw_text.strip():
         return {
             "raw_text": "",
@@ -70,10 +132,44 @@ async def parse_resume_with_llm(file_path: str) -> dict:
         }
 
     except Exception as e:
+        if raise_transient and is_transient_error(e):
+            raise
         logger.warning(f"LLM resume parsing failed, falling back to regex: {e}")
         return _parse_resume_regex(raw_text)
 
 
+async def save_parsed_resume(session, user_id: uuid.UUID, file_path: str, parsed: dict) -> ResumeProfile:
+    """Create or update the user's profile from a parse result.
+
+    One ``INSERT ... ON CONFLICT (user_id) DO UPDATE``, so two concurrent
+    uploads cannot both insert. The stored ATS score is kept.
+    """
+    stmt = insert(ResumeProfile).values(
+        user_id=user_id,
+        resume_file_path=file_path,
+        raw_text=parsed["raw_text"],
+        skills=parsed["skills"],
+        experience=parsed["experience"],
+        education=parsed["education"],
+        total_experience_years=parsed["total_experience_years"],
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ResumeProfile.user_id],
+        set_={
+            "resume_file_path": stmt.excluded.resume_file_path,
+            "raw_text": stmt.excluded.raw_text,
+            "skills": stmt.excluded.skills,
+            "experience": stmt.excluded.experience,
+            "education": stmt.excluded.education,
+            "total_experience_years": stmt.excluded.total_experience_years,
+            "updated_at": func.now(),
+        },
+    ).returning(ResumeProfile)
+    # populate_existing: a profile already loaded in this session gets the new values
+    result = await session.scalars(stmt, execution_options={"populate_existing": True})
+    return result.one()
+
+
 # --- Regex fallback parser ---
 
 SKILL_PATTERNS: set[str] = {
@@ -1,9 +1,15 @@
 """Daily roadmap generation — LLM-personalized with template fallback."""
 
 import logging
+import uuid
 from datetime import date, timedelta
 
-from app.services.llm_client import generate_personalized_roadmap
+from sqlalchemy import insert, select
+
+from app.models.career import CareerRecommendation
+from app.models.resume import ResumeProfile
+from app.models.roadmap import RoadmapEntry
+from app.services.llm_client import generate_personalized_roadmap, is_transient_error
 
 logger = logging.getLogger(__name__)
 
@@ -15,11 +21,13 @@ async def generate_daily_roadmap(
     total_days: int = 7,
     start_date: date | None = None,
     use_llm: bool = True,
+    raise_transient: bool = False,
 ) -> list[dict]:
     """Generate a structured daily action plan.
 
     Uses LLM for personalized, context-aware planning.
-    Falls back to template-based generation.
+    Falls back to template-based generation (transient provider errors are
+    raised instead with ``raise_transient``).
     """
     if start_date is None:
         start_date = date.today()
@@ -49,11 +57,58 @@ async def generate_daily_roadmap(
             if entries:
                 return entries
         except Exception as e:
+            if raise_transient and is_transient_error(e):
+                raise
             logger.warning(f"LLM roadmap generation failed, using template: {e}")
 
     return _generate_template_roadmap(target_role, total_days, start_date)
 
 
+async def create_roadmap(
+    session,
+    user_id: uuid.UUID,
+    profile: ResumeProfile | None,
+    days: int = 7,
+    raise_transient: bool = False,
+) -> list[RoadmapEntry]:
+    """Plan ``days`` for the user's selected role and insert the entries (one statement)."""
+    result = await session.execute(
+        select(CareerRecommendation).where(
+            CareerRecommendation.user_id == user_id,
+            CareerRecommendation.is_selected.is_(True),
+        )
+    )
+    selected = result.scalars().first()
+    target_role = selected.job_role if selected else "Software Developer"
+
+    # Get user skills for personalized roadmap
+    skills = profile.skills if profile else []
+    exp_years = profile.total_experience_years if profile else 0.0
+
+    plan = await generate_daily_roadmap(
+        target_role=target_role,
+        skills=skills,
+        experience_years=exp_years,
+        total_days=days,
+        raise_transient=raise_transient,
+    )
+
+    if not plan:
+        return []
+    entries = await session.scalars(
+        insert(RoadmapEntry).returning(RoadmapEntry, sort_by_parameter_order=True),
+        [{
+            "user_id": user_id,
+            "date": date.fromisoformat(item["date"]),
+            "jobs_to_apply": item["jobs_to_apply"],
+            "referrals_to_send": item["referrals_to_send"],
+            "recruiters_to_connect": item["recruiters_to_connect"],
+            "daily_tips": item["daily_tips"],
+        } for item in plan],
+    )
+    return list(entries)
+
+
 def _generate_template_roadmap(
     target_role: str,
     total_days: int,
@@ -0,0 +1,219 @@
+"""What-if role insights — jobs and ATS score for every recommended role.
+
+Onboarding evaluates only the top recommended role, but users flip between
+all of them, and each flip used to cost a job search plus an ATS scoring.
+``explore_roles`` evaluates all recommended roles (up to
+ROLE_INSIGHTS_MAX_ROLES) from the stored profile. A role's job search and
+ATS scoring run concurrently, and ROLE_INSIGHTS_CONCURRENCY roles are in
+flight at a time; the process-wide LLM / RapidAPI limiters still apply
+underneath. Results are stored in ``role_insights`` keyed by (user, role),
+so switching roles (``GET /career/explore``, ``/jobs/search?role=``,
+``/resume/ats-score``) is a primary-key read.
+
+A stored insight is used while it is younger than ROLE_INSIGHTS_TTL_MINUTES
+and its inputs fingerprint (role, skills, resume text, location, remote,
+ATS mode) still matches; otherwise it is recomputed. A finished onboarding
+run seeds its top role from the pipeline state.
+
+Jobs are stored as list items (``to_stored_job``: ids, list fields and a
+snippet, no description). A role whose search found no jobs is not stored,
+so an empty answer is retried on the next request instead of being served
+for the whole TTL.
+"""
+
+import asyncio
+import hashlib
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import get_settings
+from app.core.tracing import span
+from app.models.career import CareerRecommendation, RoleInsight
+from app.models.resume import ResumeProfile
+from app.models.user import User
+from app.schemas.job import to_stored_job
+from app.services.ats_scorer import score_resume
+from app.services.demand_index import normalize_role
+from app.services.job_aggregator import find_jobs_for_role
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+_stats = {"hits": 0, "misses": 0, "computed": 0, "failures": 0, "empty": 0}
+
+
+def get_insight_stats() -> dict:
+    lookups = _stats["hits"] + _stats["misses"]
+    return {**_stats, "hit_rate": round(_stats["hits"] / lookups, 4) if lookups else 0.0}
+
+
+def role_key(role: str) -> str:
+    return normalize_role(role) or role.strip().lower()
+
+
+@dataclass(slots=True)
+class InsightInputs:
+    user_id: uuid.UUID
+    skills: list[str]
+    raw_text: str
+    location: str | None
+    remote_only: bool
+    use_llm: bool
+
+    @classmethod
+    def for_user(cls, user: User, profile: ResumeProfile) -> "InsightInputs":
+        return cls(
+            user.id, profile.skills or [], profile.raw_text or "",
+            user.location_preference, user.remote_preference == "remote", settings.ATS_USE_LLM,
+        )
+
+    def fingerprint(self, role: str) -> str:
+        skills = ",".join(sorted({s.lower() for s in self.skills}))
+        text = hashlib.sha256(self.raw_text.encode()).hexdigest()
+        payload = f"{role_key(role)}|{skills}|{text}|{(self.location or '').lower()}|{self.remote_only}|{self.use_llm}"
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _row(inputs: InsightInputs, role: str, jobs: list[dict], ats: dict | None, now: datetime) -> dict:
+    return {
+        "user_id": inputs.user_id,
+        "role_key": role_key(role),
+        "job_role": role,
+        "inputs_hash": inputs.fingerprint(role),
+        "jobs": [to_stored_job(j) for j in jobs],
+        "ats": ats,
+        "computed_at": now,
+    }
+
+
+async def upsert_insights(session, rows: list[dict]) -> None:
+    """Store insights (one multi-row upsert); the caller commits."""
+    if not rows:
+        return
+    stmt = insert(RoleInsight).values(rows)
+    await session.execute(stmt.on_conflict_do_update(
+        index_elements=["user_id", "role_key"],
+        set_={k: stmt.excluded[k] for k in ("job_role", "inputs_hash", "jobs", "ats", "computed_at")},
+    ))
+
+
+def _is_fresh(insight: RoleInsight | None, inputs: InsightInputs, role: str) -> bool:
+    if insight is None or insight.inputs_hash != inputs.fingerprint(role):
+        return False
+    return datetime.now(timezone.utc) - insight.computed_at < timedelta(minutes=settings.ROLE_INSIGHTS_TTL_MINUTES)
+
+
+async def _load(session, user_id: uuid.UUID, roles: list[str]) -> dict[str, RoleInsight]:
+    result = await session.execute(
+        select(RoleInsight).where(
+            RoleInsight.user_id == user_id,
+            RoleInsight.role_key.in_([role_key(r) for r in roles]),
+        )
+    )
+    return {i.role_key: i for i in result.scalars()}
+
+
+async def _evaluate(role: str, inputs: InsightInputs, raise_transient: bool) -> tuple[list[dict], dict]:
+    with span("role_insights.evaluate", role=role):
+        return await asyncio.gather(
+            find_jobs_for_role(role, inputs.skills, inputs.location, inputs.remote_only),
+            score_resume(inputs.raw_text, role, use_llm=inputs.use_llm, raise_transient=raise_transient),
+        )
+
+
+async def recommended_roles(session, user_id: uuid.UUID) -> list[str]:
+    result = await session.execute(
+        select(CareerRecommendation.job_role)
+        .where(CareerRecommendation.user_id == user_id)
+        .order_by(CareerRecommendation.match_score.desc())
+        .limit(settings.ROLE_INSIGHTS_MAX_ROLES)
+    )
+    return list(result.scalars())
+
+
+async def explore_roles(
+    session,
+    user: User,
+    profile: ResumeProfile,
+    roles: list[str] | None = None,
+    refresh: bool = False,
+    raise_transient: bool = False,
+) -> list[RoleInsight]:
+    """Insights for ``roles`` (default: the recommended ones), computing only stale ones.
+
+    Roles that fail to evaluate are left out; with ``raise_transient`` the
+    first failure is raised once the other roles are committed. Otherwise
+    the caller commits.
+    """
+    if roles is None:
+        roles = await recommended_roles(session, user.id)
+    unique: dict[str, str] = {}
+    for role in roles:
+        unique.setdefault(role_key(role), role)  # "Sr. X" and "X" are one insight
+    roles = list(unique.values())
+    inputs = InsightInputs.for_user(user, profile)
+    stored = await _load(session, user.id, roles)
+    todo = [r for r in roles if refresh or not _is_fresh(stored.get(role_key(r)), inputs, r)]
+    _stats["hits"] += len(roles) - len(todo)
+    _stats["misses"] += len(todo)
+
+    if todo:
+        limit = asyncio.Semaphore(max(1, settings.ROLE_INSIGHTS_CONCURRENCY))
+
+        async def evaluate(role: str) -> tuple[list[dict], dict]:
+            async with limit:
+                return await _evaluate(role, inputs, raise_transient)
+
+        with span("role_insights.explore", roles=len(roles), computed=len(todo)):
+            results = await asyncio.gather(*(evaluate(r) for r in todo), return_exceptions=True)
+
+        now = datetime.now(timezone.utc)
+        rows, error = [], None
+        for role, result in zip(todo, results):
+            if isinstance(result, BaseException):
+                _stats["failures"] += 1
+                logger.warning(f"Role insight for '{role}' failed: {result}")
+                error = error or result
+                continue
+            jobs, ats = result
+            if not jobs:
+                _stats["empty"] += 1
+                logger.info(f"Role insight for '{role}' found no jobs, not storing it")
+                continue
+            rows.append(_row(inputs, role, jobs, ats, now))
+        _stats["computed"] += len(rows)
+        await upsert_insights(session, rows)
+        for row in rows:
+            stored[row["role_key"]] = RoleInsight(**row)
+        if error is not None and raise_transient:
+            await session.commit()  # keep the roles that did finish
+            raise error
+
+    return [stored[role_key(r)] for r in roles if role_key(r) in stored]
+
+
+async def cached_role_insight(session, user: User, profile: ResumeProfile, role: str) -> RoleInsight | None:
+    """A fresh stored insight for one role, or None (nothing is computed)."""
+    insight = await session.get(RoleInsight, (user.id, role_key(role)))
+    if _is_fresh(insight, InsightInputs.for_user(user, profile), role):
+        _stats["hits"] += 1
+        return insight
+    _stats["misses"] += 1
+    return None
+
+
+def insight_rows_from_state(user_id: uuid.UUID, state: dict, now: datetime | None = None) -> list[dict]:
+    """The top role's insight from a finished onboarding run (nothing if it had errors or no jobs)."""
+    role = state.get("selected_role")
+    if not role or state.get("errors") or not state.get("ats_result") or not state.get("matched_jobs"):
+        return []
+    inputs = InsightInputs(
+        user_id, state.get("skills", []), state.get("raw_text", ""), state.get("location_preference"),
+        state.get("remote_preference") == "remote", settings.ATS_USE_LLM,
+    )
+    return [_row(inputs, role, state.get("matched_jobs", []), state["ats_result"], now or datetime.now(timezone.utc))]
@@ -0,0 +1,138 @@
+"""Role-keyword registry — one LLM call per role instead of one per resume.
+
+The rule-based ATS scorer matches a resume against the target role's keywords
+and hard skills. Lookup order:
+
+1. Hand-written ``ROLE_KEYWORDS`` and the mined demand index (no LLM)
+2. In-process LRU cache
+3. ``role_keyword_sets`` table (shared by every API process)
+4. A single LLM call, persisted to Postgres and cached for every later resume
+
+Concurrent first requests for the same role share one LLM call. Failed
+generations are remembered for ROLE_KEYWORDS_RETRY_SECONDS so an LLM outage
+does not turn every request into a slow failure.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import get_settings
+from app.db.session import async_session_factory
+from app.models.role_keywords import RoleKeywordSet
+from app.services.demand_index import get_demand_index, normalize_role
+from app.services.llm_client import generate_role_keywords_llm
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+_cache: OrderedDict[str, dict] = OrderedDict()
+_locks: dict[str, asyncio.Lock] = {}
+_failed_at: dict[str, float] = {}
+
+
+def _cache_get(key: str) -> dict | None:
+    entry = _cache.get(key)
+    if entry is not None:
+        _cache.move_to_end(key)
+    return entry
+
+
+def _cache_put(key: str, entry: dict) -> None:
+    _cache[key] = entry
+    _cache.move_to_end(key)
+    while len(_cache) > settings.ROLE_KEYWORDS_CACHE_SIZE:
+        _cache.popitem(last=False)
+
+
+def _clean_terms(terms: list, limit: int) -> list[str]:
+    seen: dict[str, None] = {}
+    for t in terms or []:
+        if isinstance(t, str) and t.strip():
+            seen.setdefault(t.lower().strip(), None)
+    return list(seen)[:limit]
+
+
+async def _load_from_db(key: str) -> dict | None:
+    async with async_session_factory() as session:
+        result = await session.execute(select(RoleKeywordSet).where(RoleKeywordSet.role_key == key))
+        row = result.scalar_one_or_none()
+        if not row:
+            return None
+        return {"keywords": list(row.keywords or []), "skills": list(row.skills or [])}
+
+
+async def _generate_and_store(key: str, target_role: str) -> dict:
+    raw = await generate_role_keywords_llm(target_role)
+    entry = {
+        "keywords": _clean_terms(raw.get("keywords", []), 20),
+        "skills": _clean_terms(raw.get("skills", []), 15),
+    }
+    if not entry["keywords"]:
+        raise ValueError("LLM returned no keywords")
+
+    async with async_session_factory() as session:
+        # Another process may have won the race — keep its row, it is equally valid
+        await session.execute(
+            insert(RoleKeywordSet)
+            .values(role_key=key, display_role=target_role.strip(), **entry)
+            .on_conflict_do_nothing(index_elements=["role_key"])
+        )
+        await session.commit()
+    logger.info(f"Generated ATS keywords for new role '{key}'")
+    return entry
+
+
+async def get_role_keyword_set(target_role: str) -> dict | None:
+    """Keywords and skills for any role; ``None`` if they can't be resolved now."""
+    key = normalize_role(target_role)
+    if not key:
+        return None
+
+    mined = get_demand_index().skills_for(target_role, limit=settings.DEMAND_INDEX_ROLE_SKILLS)
+    if mined:
+        return {"keywords": mined, "skills": mined}
+
+    entry = _cache_get(key)
+    if entry is not None:
+        return entry
+
+    if _recently_failed(key):
+        return None
+
+    lock = _locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        try:
+            # Waiters re-check: the first caller has either filled the cache or failed
+            entry = _cache_get(key)
+            if entry is not None:
+                return entry
+            if _recently_failed(key):
+                return None
+            try:
+                entry = await _load_from_db(key) or await _generate_and_store(key, target_role)
+            except Exception as e:
+                logger.warning(f"Role keyword lookup failed for '{key}': {e}")
+                _failed_at[key] = time.monotonic()
+                return None
+            _failed_at.pop(key, None)
+            _cache_put(key, entry)
+            return entry
+        finally:
+            # Later callers hit the cache (or the failure) first; only current waiters need the lock
+            if _locks.get(key) is lock:
+                del _locks[key]
+
+
+def _recently_failed(key: str) -> bool:
+    failed_at = _failed_at.get(key)
+    if failed_at is None:
+        return False
+    if time.monotonic() - failed_at < settings.ROLE_KEYWORDS_RETRY_SECONDS:
+        return True
+    del _failed_at[key]
+    return False
@@ -0,0 +1,165 @@
+"""Vectorized role matcher — role × skill taxonomy compiled into a CSR matrix.
+
+The taxonomy is compiled once into a sparse incidence matrix (roles as rows,
+skills as columns) plus its transpose. Scoring a user is a single sparse
+vector product: the user's skill ids select columns of the transpose, a
+``bincount`` gives matched-skill counts per role, and ``argpartition`` picks
+the top-k without sorting the whole taxonomy. Matched / missing skill lists
+are only materialized for the winners.
+
+The arrays can be saved as ``.npy`` files and loaded with ``mmap_mode="r"``
+so every gunicorn worker shares one copy through the page cache.
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_ARRAYS = ("indptr", "indices", "t_indptr", "t_indices")
+
+
+def normalize_skill(skill: str) -> str:
+    return skill.lower().strip()
+
+
+class RoleMatcher:
+    """Precompiled role/skill incidence matrix with top-k scoring."""
+
+    def __init__(
+        self,
+        roles: list[str],
+        skills: list[str],
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        t_indptr: np.ndarray,
+        t_indices: np.ndarray,
+    ):
+        self.roles = roles
+        self.skills = skills
+        self.skill_index = {s: i for i, s in enumerate(skills)}
+        # CSR: role i owns skill ids indices[indptr[i]:indptr[i + 1]]
+        self.indptr = indptr
+        self.indices = indices
+        # Transpose: skill j appears in roles t_indices[t_indptr[j]:t_indptr[j + 1]]
+        self.t_indptr = t_indptr
+        self.t_indices = t_indices
+        self.role_sizes = np.diff(indptr).astype(np.float64)
+
+    def __len__(self) -> int:
+        return len(self.roles)
+
+    # --- Construction ---
+
+    @classmethod
+    def from_mapping(cls, mapping: dict[str, list[str]]) -> "RoleMatcher":
+        """Compile a ``{role: [skills]}`` mapping into CSR form."""
+        roles = list(mapping)
+        skill_index: dict[str, int] = {}
+        indptr = np.zeros(len(roles) + 1, dtype=np.int64)
+        cols: list[int] = []
+        for i, role in enumerate(roles):
+            role_skill_ids = {
+                skill_index.setdefault(s, len(skill_index))
+                for s in (normalize_skill(x) for x in mapping[role])
+                if s
+            }
+            cols.extend(sorted(role_skill_ids))
+            indptr[i + 1] = len(cols)
+
+        indices = np.asarray(cols, dtype=np.int32)
+        skills = list(skill_index)
+
+        # Build the transpose with a stable sort so roles stay in taxonomy order
+        row_ids = np.repeat(np.arange(len(roles), dtype=np.int32), np.diff(indptr))
+        order = np.argsort(indices, kind="stable")
+        t_indices = row_ids[order]
+        t_indptr = np.zeros(len(skills) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(indices, minlength=len(skills)), out=t_indptr[1:])
+
+        return cls(roles, skills, indptr, indices, t_indptr, t_indices)
+
+    def save(self, directory: str | Path) -> None:
+        """Persist the compiled matrix as ``.npy`` files plus a JSON vocabulary."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in _ARRAYS:
+            np.save(directory / f"{name}.npy", getattr(self, name))
+        tmp = directory / "vocab.json.tmp"
+        tmp.write_text(json.dumps({"roles": self.roles, "skills": self.skills}))
+        os.replace(tmp, directory / "vocab.json")
+
+    @classmethod
+    def load(cls, directory: str | Path, mmap: bool = True) -> "RoleMatcher":
+        """Load a saved matrix, memory-mapped read-only by default."""
+        directory = Path(directory)
+        vocab = json.loads((directory / "vocab.json").read_text())
+        mode = "r" if mmap else None
+        arrays = [np.load(directory / f"{name}.npy", mmap_mode=mode) for name in _ARRAYS]
+        return cls(vocab["roles"], vocab["skills"], *arrays)
+
+    # --- Scoring ---
+
+    def scores(self, user_skills: list[str]) -> np.ndarray:
+        """Fraction of each role's skills the user has, for every role."""
+        ids = sorted({
+            self.skill_index[s]
+            for s in (normalize_skill(x) for x in user_skills)
+            if s in self.skill_index
+        })
+        if not ids:
+            return np.zeros(len(self.roles), dtype=np.float64)
+        hits = np.concatenate([self.t_indices[self.t_indptr[j]:self.t_indptr[j + 1]] for j in ids])
+        counts = np.bincount(hits, minlength=len(self.roles))
+        return counts / (self.role_sizes + 1e-6)
+
+    def top_k(self, user_skills: list[str], k: int = 5) -> list[dict]:
+        """Return the k best roles, ties broken by taxonomy order."""
+        if k <= 0 or not self.roles:
+            return []
+        scores = self.scores(user_skills)
+        # Rank on the rounded percentage so equal displayed scores keep taxonomy order
+        winners = _top_indices(np.round(scores * 100, 1), k)
+
+        user_skill_set = {normalize_skill(s) for s in user_skills}
+        results: list[dict] = []
+        for i in winners:
+            role_skills = [self.skills[j] for j in self.indices[self.indptr[i]:self.indptr[i + 1]]]
+            results.append({
+                "job_role": self.roles[i],
+                "match_score": round(float(scores[i]) * 100, 1),
+                "matched_skills": sorted(s for s in role_skills if s in user_skill_set),
+                "missing_skills": sorted(s for s in role_skills if s not in user_skill_set),
+            })
+        return results
+
+
+def _top_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest scores, descending, stable on ties."""
+    n = len(scores)
+    if k >= n:
+        return np.argsort(-scores, kind="stable")
+    part = np.argpartition(-scores, k - 1)[:k]
+    threshold = scores[part].min()
+    above = np.flatnonzero(scores > threshold)
+    tied = np.flatnonzero(scores == threshold)[: k - len(above)]
+    candidates = np.concatenate([above, tied])
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def load_taxonomy_dir(directory: str | Path) -> dict[str, list[str]]:
+    """Read every ``*.json`` file (``{role: [skills]}``) in a directory."""
+    mapping: dict[str, list[str]] = {}
+    for path in sorted(Path(directory).glob("*.json")):
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Skipping unreadable role taxonomy file {path}: {e}")
+            continue
+        for role, skills in data.items():
+            mapping.setdefault(role, []).extend(skills)
+    return mapping
@@ -0,0 +1,340 @@
+"""Durable task queue on Postgres — ``FOR UPDATE SKIP LOCKED`` consumers.
+
+LLM-heavy work (resume parsing, recommendations, ATS scoring, roadmaps,
+onboarding runs) is enqueued as ``Task`` rows and executed by worker
+processes (``python -m app.workers.task_worker``), so API pods stay
+responsive and capacity scales on its own.
+
+- **Enqueue** inside the caller's transaction: a task exists iff the request
+  that created it committed. An ``idempotency_key`` makes re-submits return
+  the existing task.
+- **Claim**: each consumer atomically takes the highest-priority ready task
+  with ``SKIP LOCKED``, so any number of consumers never block on or
+  double-claim a row. The claim leases the task for
+  TASK_VISIBILITY_TIMEOUT_SECONDS, and a heartbeat extends the lease while
+  the handler runs. If the worker dies, the lease lapses and another
+  consumer picks the task up.
+- **Retry**: a failed attempt is re-queued with exponential backoff and
+  jitter. Once ``max_attempts`` are used, the task is dead-lettered
+  (``status = 'dead'``) and kept for inspection / ``requeue_dead``. A kind
+  can register an ``on_dead`` callback to settle its own records then
+  (failure, timeout or a lease that lapsed on the last attempt alike).
+
+Handlers register by kind with ``@task_handler("kind")``; see
+``app.workers.tasks``.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import socket
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import timedelta
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import get_settings
+from app.core.tracing import current_trace_id, start_trace
+from app.db.session import async_session_factory
+from app.models.task import Task
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+TaskHandler = Callable[[Task], Awaitable[dict | None]]
+DeadHandler = Callable[[Task, str], Awaitable[None]]
+
+
+class PermanentTaskError(Exception):
+    """Raised by a handler when retrying cannot help; dead-letters at once."""
+
+
+@dataclass(slots=True)
+class TaskSpec:
+    kind: str
+    handler: TaskHandler
+    priority: int
+    max_attempts: int
+    timeout: float
+    on_dead: DeadHandler | None = None
+
+
+_registry: dict[str, TaskSpec] = {}
+
+
+def task_handler(
+    kind: str,
+    priority: int = 0,
+    max_attempts: int | None = None,
+    timeout: float | None = None,
+    on_dead: DeadHandler | None = None,
+):
+    """Register an async ``handler(task) -> result dict`` for a task kind.
+
+    ``on_dead(task, error)`` runs once the task is dead-lettered.
+    """
+    def register(handler: TaskHandler) -> TaskHandler:
+        _registry[kind] = TaskSpec(
+            kind=kind,
+            handler=handler,
+            priority=priority,
+            max_attempts=max_attempts or settings.TASK_MAX_ATTEMPTS,
+            timeout=timeout or settings.TASK_DEFAULT_TIMEOUT_SECONDS,
+            on_dead=on_dead,
+        )
+        return handler
+    return register
+
+
+def get_task_spec(kind: str) -> TaskSpec | None:
+    if not _registry:
+        import app.workers.tasks  # noqa: F401  (registers the service task wrappers)
+    return _registry.get(kind)
+
+
+# --- Producer side ---
+
+async def enqueue(
+    session,
+    kind: str,
+    payload: dict | None = None,
+    *,
+    user_id: uuid.UUID | None = None,
+    priority: int | None = None,
+    idempotency_key: str | None = None,
+    delay: float = 0.0,
+) -> Task:
+    """Add a task in the caller's transaction (committed with it).
+
+    With ``idempotency_key``, an existing task with that key is returned
+    instead of enqueuing a second one.
+    """
+    spec = get_task_spec(kind)
+    if spec is None:
+        raise ValueError(f"Unknown task kind '{kind}'")
+
+    payload = dict(payload or {})
+    request_id = current_trace_id()
+    if request_id:
+        payload.setdefault("request_id", request_id)  # links the task's trace to the request's
+
+    values = {
+        "id": uuid.uuid4(),
+        "kind": kind,
+        "payload": payload,
+        "user_id": user_id,
+        "idempotency_key": idempotency_key,
+        "status": "queued",
+        "priority": spec.priority if priority is None else priority,
+        "attempts": 0,
+        "max_attempts": spec.max_attempts,
+        "run_at": func.now() + timedelta(seconds=delay),
+    }
+    stmt = insert(Task).values(values).returning(Task)
+    if idempotency_key is not None:
+        stmt = stmt.on_conflict_do_nothing(index_elements=["idempotency_key"])
+    task = (await session.execute(stmt)).scalar_one_or_none()
+    if task is None:
+        result = await session.execute(select(Task).where(Task.idempotency_key == idempotency_key))
+        task = result.scalar_one()
+    return task
+
+
+async def get_task(session, task_id: uuid.UUID) -> Task | None:
+    return await session.get(Task, task_id)
+
+
+async def requeue_dead(kinds: list[str] | None = None) -> int:
+    """Give dead-lettered tasks a fresh set of attempts."""
+    stmt = (
+        update(Task)
+        .where(Task.status == "dead")
+        .values(status="queued", attempts=0, run_at=func.now(), finished_at=None)
+    )
+    if kinds:
+        stmt = stmt.where(Task.kind.in_(kinds))
+    async with async_session_factory() as session:
+        result = await session.execute(stmt)
+        await session.commit()
+    return result.rowcount
+
+
+async def queue_stats() -> dict:
+    """Task counts by kind and status."""
+    async with async_session_factory() as session:
+        result = await session.execute(
+            select(Task.kind, Task.status, func.count()).group_by(Task.kind, Task.status)
+        )
+    stats: dict[str, dict[str, int]] = {}
+    for kind, status, count in result.all():
+        stats.setdefault(kind, {})[status] = count
+    return stats
+
+
+# --- Consumer side ---
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff with jitter for the next attempt."""
+    delay = min(settings.TASK_RETRY_MAX_SECONDS, settings.TASK_RETRY_BASE_SECONDS * 2 ** max(0, attempts - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+async def claim(worker_id: str, kinds: list[str] | None = None) -> Task | None:
+    """Atomically lease the next ready task (queued, or running with a lapsed lease)."""
+    now = func.now()
+    ready = (
+        select(Task.id)
+        .where(or_(
+            and_(Task.status == "queued", Task.run_at <= now),
+            and_(Task.status == "running", Task.locked_until <= now),
+        ))
+        .order_by(Task.priority.desc(), Task.run_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    if kinds:
+        ready = ready.where(Task.kind.in_(kinds))
+    stmt = (
+        update(Task)
+        .where(Task.id == ready.scalar_subquery())
+        .values(
+            status="running",
+            attempts=Task.attempts + 1,
+            locked_by=worker_id,
+            locked_until=now + timedelta(seconds=settings.TASK_VISIBILITY_TIMEOUT_SECONDS),
+        )
+        .returning(Task)
+    )
+    async with async_session_factory() as session:
+        task = (await session.execute(stmt)).scalar_one_or_none()
+        await session.commit()
+    return task
+
+
+async def _heartbeat(task_id: uuid.UUID, worker_id: str) -> None:
+    # Keep the lease ahead of the clock while the handler runs
+    interval = max(1.0, settings.TASK_VISIBILITY_TIMEOUT_SECONDS / 3)
+    while True:
+        await asyncio.sleep(interval)
+        async with async_session_factory() as session:
+            await session.execute(
+                update(Task)
+                .where(Task.id == task_id, Task.locked_by == worker_id, Task.status == "running")
+                .values(locked_until=func.now() + timedelta(seconds=settings.TASK_VISIBILITY_TIMEOUT_SECONDS))
+            )
+            await session.commit()
+
+
+async def _finish(task: Task, worker_id: str, **values) -> None:
+    async with async_session_factory() as session:
+        await session.execute(
+            update(Task)
+            .where(Task.id == task.id, Task.locked_by == worker_id)
+            .values(locked_until=None, locked_by=None, **values)
+        )
+        await session.commit()
+
+
+async def _dead_letter(spec: TaskSpec, task: Task, worker_id: str, error: str) -> None:
+    await _finish(task, worker_id, status="dead", last_error=error, finished_at=func.now())
+    if spec.on_dead is None:
+        return
+    try:
+        await spec.on_dead(task, error)
+    except Exception as e:
+        logger.error(f"on_dead for task {task.kind} {task.id} failed: {e}")
+
+
+async def execute(task: Task, worker_id: str) -> None:
+    """Run a claimed task's handler and record success, retry or dead-letter."""
+    spec = get_task_spec(task.kind)
+    if spec is None:
+        await _finish(task, worker_id, status="dead", last_error=f"No handler for '{task.kind}'",
+                      finished_at=func.now())
+        return
+    if task.attempts > task.max_attempts:
+        # Lease lapsed on the final attempt (worker died mid-task)
+        await _dead_letter(spec, task, worker_id, task.last_error or "Lease expired")
+        return
+
+    heartbeat = asyncio.create_task(_heartbeat(task.id, worker_id))
+    try:
+        with start_trace(
+            f"task.{task.kind}",
+            trace_id=task.payload.get("trace_id"),
+            task_id=str(task.id),
+            attempt=task.attempts,
+            request_id=task.payload.get("request_id"),
+        ):
+            result = await asyncio.wait_for(spec.handler(task), spec.timeout)
+    except asyncio.CancelledError:
+        # Shutdown: hand the task back without spending an attempt
+        await _finish(task, worker_id, status="queued", attempts=task.attempts - 1, run_at=func.now())
+        raise
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"[:2000]
+        if isinstance(e, PermanentTaskError) or task.attempts >= task.max_attempts:
+            logger.error(f"Task {task.kind} {task.id} dead after {task.attempts} attempts: {error}")
+            await _dead_letter(spec, task, worker_id, error)
+        else:
+            delay = retry_delay(task.attempts)
+            logger.warning(f"Task {task.kind} {task.id} attempt {task.attempts} failed, retrying in {delay:.1f}s: {error}")
+            await _finish(task, worker_id, status="queued", last_error=error,
+                          run_at=func.now() + timedelta(seconds=delay))
+    else:
+        await _finish(task, worker_id, status="succeeded", result=result, finished_at=func.now())
+    finally:
+        heartbeat.cancel()
+
+
+def make_worker_id(index: int = 0) -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{index}"
+
+
+async def consume(
+    worker_id: str,
+    stop: asyncio.Event,
+    kinds: list[str] | None = None,
+) -> None:
+    """One consumer: claim and execute tasks until ``stop`` is set."""
+    while not stop.is_set():
+        try:
+            task = await claim(worker_id, kinds)
+        except Exception as e:
+            logger.error(f"Task claim failed ({worker_id}): {e}")
+            task = None
+        if task is None:
+            try:
+                await asyncio.wait_for(stop.wait(), settings.TASK_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            continue
+        await execute(task, worker_id)
+
+
+_api_consumers: list[asyncio.Task] = []
+_api_stop: asyncio.Event | None = None
+
+
+async def start_api_consumers(count: int | None = None) -> None:
+    """Run ``TASK_API_CONSUMERS`` consumers inside the API process (local dev)."""
+    global _api_stop
+    count = settings.TASK_API_CONSUMERS if count is None else count
+    if count <= 0 or _api_consumers:
+        return
+    _api_stop = asyncio.Event()
+    for i in range(count):
+        _api_consumers.append(asyncio.create_task(consume(make_worker_id(i), _api_stop)))
+
+
+async def stop_api_consumers() -> None:
+    if _api_stop is not None:
+        _api_stop.set()
+    for consumer in _api_consumers:
+        consumer.cancel()
+    await asyncio.gather(*_api_consumers, return_exceptions=True)
+    _api_consumers.clear()
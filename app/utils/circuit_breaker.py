@@ -0,0 +1,73 @@
+"""Minimal async-friendly circuit breaker.
+
+``closed``: calls go through and consecutive failures are counted. At
+``failure_threshold`` failures the breaker opens, and calls are refused
+immediately for ``reset_timeout`` seconds. After that one trial call is let
+through (``half_open``). If it succeeds the breaker closes; if it fails the
+breaker opens again.
+"""
+
+import time
+from dataclasses import dataclass
+
+
+@dataclass
+class BreakerStats:
+    calls: int = 0
+    failures: int = 0
+    short_circuits: int = 0
+    opened: int = 0
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.stats = BreakerStats()
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    def allow(self) -> bool:
+        """Whether a call may go through now (claims the trial when half-open)."""
+        if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self.state = "half_open"
+            self._trial_in_flight = False
+        if self.state == "closed" or (self.state == "half_open" and not self._trial_in_flight):
+            if self.state == "half_open":
+                self._trial_in_flight = True
+            self.stats.calls += 1
+            return True
+        self.stats.short_circuits += 1
+        return False
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self._consecutive_failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.stats.failures += 1
+        self._consecutive_failures += 1
+        self._trial_in_flight = False
+        if self.state == "half_open" or self._consecutive_failures >= self.failure_threshold:
+            if self.state != "open":
+                self.stats.opened += 1
+            self.state = "open"
+            self._opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """A call abandoned by its caller: neither outcome, but it frees the half-open trial."""
+        self._trial_in_flight = False
+
+    def as_dict(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._consecutive_failures,
+            "calls": self.stats.calls,
+            "failures": self.stats.failures,
+            "short_circuits": self.stats.short_circuits,
+            "opened": self.stats.opened,
+        }
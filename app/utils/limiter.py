@@ -0,0 +1,97 @@
+"""Per-stage concurrency limiter with throughput counters.
+
+One limiter guards one kind of external work (LLM calls, RapidAPI requests,
+PDF extraction) for the whole process, however many requests, tasks or
+cohort runs are active. ``limit <= 0`` means unlimited. The limit can be
+changed at runtime (e.g. a batch job raising it); waiters are re-checked
+against the new limit.
+"""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+
+@dataclass
+class LimiterStats:
+    calls: int = 0
+    failures: int = 0
+    waited: int = 0
+    max_in_flight: int = 0
+    wait_seconds: float = 0.0
+    busy_seconds: float = 0.0
+
+    def as_dict(self) -> dict:
+        done = max(1, self.calls)
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "waited": self.waited,
+            "max_in_flight": self.max_in_flight,
+            "avg_wait_ms": round(self.wait_seconds / done * 1000, 1),
+            "avg_call_ms": round(self.busy_seconds / done * 1000, 1),
+        }
+
+
+class ConcurrencyLimiter:
+    def __init__(self, name: str, limit: int = 0):
+        self.name = name
+        self.limit = limit
+        self.stats = LimiterStats()
+        self.in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    def _has_room(self) -> bool:
+        return self.limit <= 0 or self.in_flight < self.limit
+
+    def _wake(self) -> None:
+        # Release is synchronous, so a cancelled holder can never leak its slot
+        room = len(self._waiters) if self.limit <= 0 else self.limit - self.in_flight
+        while room > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                room -= 1
+
+    def set_limit(self, limit: int) -> None:
+        self.limit = limit
+        self._wake()
+
+    async def _acquire(self) -> None:
+        if not self._has_room():
+            self.stats.waited += 1
+        while not self._has_room():
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self._wake()  # pass the wake-up on
+                raise
+        self.in_flight += 1
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one slot for the duration of the block."""
+        start = time.monotonic()
+        await self._acquire()
+        acquired = time.monotonic()
+        self.stats.wait_seconds += acquired - start
+        self.stats.max_in_flight = max(self.stats.max_in_flight, self.in_flight)
+        try:
+            yield
+        except BaseException:
+            self.stats.failures += 1
+            raise
+        finally:
+            self.stats.calls += 1
+            self.stats.busy_seconds += time.monotonic() - acquired
+            self.in_flight -= 1
+            self._wake()
+
+    def as_dict(self) -> dict:
+        return {"limit": self.limit, "in_flight": self.in_flight, **self.stats.as_dict()}
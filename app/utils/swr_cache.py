@@ -0,0 +1,134 @@
+"""In-process stale-while-revalidate cache with single-flight loading.
+
+Entries are *fresh* for ``fresh_ttl`` seconds and then *stale* until
+``stale_ttl``. A fresh hit returns immediately. A stale hit also returns
+immediately and starts one background refresh per key. A miss (or an entry
+past ``stale_ttl``) loads inline, and concurrent misses for the same key share
+one load. The cache is bounded LRU and counts hits so callers can report how
+many upstream calls it saved.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheStats:
+    fresh_hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    refreshes: int = 0
+    refresh_failures: int = 0
+    upstream_calls: int = 0
+
+    def as_dict(self) -> dict:
+        lookups = self.fresh_hits + self.stale_hits + self.misses
+        hits = self.fresh_hits + self.stale_hits
+        return {
+            "lookups": lookups,
+            "fresh_hits": self.fresh_hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "upstream_calls": self.upstream_calls,
+            "upstream_calls_saved": max(0, lookups - self.upstream_calls),
+        }
+
+
+@dataclass
+class _Entry:
+    value: Any
+    stored_at: float = field(default_factory=time.monotonic)
+
+
+class SWRCache:
+    def __init__(self, fresh_ttl: float, stale_ttl: float, max_entries: int = 1000):
+        self.fresh_ttl = fresh_ttl
+        self.stale_ttl = max(stale_ttl, fresh_ttl)
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self._refreshing: dict[Hashable, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry.stored_at
+            if age < self.fresh_ttl:
+                self.stats.fresh_hits += 1
+                self._entries.move_to_end(key)
+                return entry.value
+            if age < self.stale_ttl:
+                self.stats.stale_hits += 1
+                self._entries.move_to_end(key)
+                self._schedule_refresh(key, loader)
+                return entry.value
+
+        self.stats.misses += 1
+        return await self._load(key, loader)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = _Entry(value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        # The load runs in its own task: a caller that times out or is
+        # cancelled stops waiting, but the shared load still fills the cache.
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._run_loader(key, loader))
+            task.add_done_callback(_consume_exception)
+            self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _run_loader(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            self.stats.upstream_calls += 1
+            value = await loader()
+            self._store(key, value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def _schedule_refresh(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._refreshing or key in self._inflight:
+            return
+        self._refreshing[key] = asyncio.create_task(self._refresh(key, loader))
+
+    async def _refresh(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> None:
+        self.stats.refreshes += 1
+        try:
+            await self._load(key, loader)
+        except Exception as e:
+            # Keep serving the stale value; the next stale hit retries
+            self.stats.refresh_failures += 1
+            logger.warning(f"Background cache refresh failed for {key!r}: {e}")
+        finally:
+            self._refreshing.pop(key, None)
+
+
+def _consume_exception(task: asyncio.Task) -> None:
+    # Avoid "exception was never retrieved" when every waiter gave up
+    if not task.cancelled():
+        task.exception()
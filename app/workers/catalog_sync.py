@@ -0,0 +1,162 @@
+"""Background job — sync popular role/location searches into the local job catalog.
+
+Usage:
+    python -m app.workers.catalog_sync           # one sync pass
+    python -m app.workers.catalog_sync --loop    # every CATALOG_SYNC_INTERVAL_SECONDS
+
+Each (role, location) pair only asks for postings newer than its last
+complete sync (JSearch ``date_posted`` window); a pass in which any page
+failed, timed out or was skipped keeps the old cursor, so the missed window
+is asked for again next time. Postings not seen again within
+CATALOG_JOB_TTL_DAYS are expired, as are all users' expired ``/jobs/search``
+snapshots. Per-user job feeds are refreshed after each
+pass (USER_JOB_FEED_AFTER_SYNC). Set CATALOG_FEED_PATH to a JSON file of
+JSearch-format postings (see scripts/stub_job_feed.json) to sync from a local
+stub feed instead of RapidAPI.
+"""
+
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select
+
+from app.core.config import get_settings
+from app.db.session import async_session_factory
+from app.models.career import CareerRecommendation
+from app.models.job import CatalogSyncState
+from app.models.user import User
+from app.services.career_recommender import ROLE_SKILL_MAP
+from app.services.job_catalog import expire_catalog_jobs, expire_search_snapshots, upsert_catalog_jobs
+from app.services.job_feed import refresh_user_feeds
+from app.services.job_aggregator import FanoutReport, FileJobSource, JobSearchUnavailable, iter_job_pages
+from app.services.job_search import query_variants
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+async def popular_queries() -> list[tuple[str, str | None]]:
+    """Most-selected (role, location) pairs, topped up with the known roles."""
+    async with async_session_factory() as session:
+        result = await session.execute(
+            select(CareerRecommendation.job_role, User.location_preference)
+            .join(User, User.id == CareerRecommendation.user_id)
+            .where(CareerRecommendation.is_selected.is_(True))
+            .group_by(CareerRecommendation.job_role, User.location_preference)
+            .order_by(func.count().desc())
+            .limit(settings.CATALOG_SYNC_MAX_QUERIES)
+        )
+        pairs = [(role, location or None) for role, location in result.all()]
+
+    for role in ROLE_SKILL_MAP:
+        if len(pairs) >= settings.CATALOG_SYNC_MAX_QUERIES:
+            break
+        if (role, None) not in pairs:
+            pairs.append((role, None))
+    return pairs
+
+
+def date_posted_window(last_synced_at: datetime | None) -> str:
+    """Smallest JSearch ``date_posted`` window covering the time since last sync."""
+    if last_synced_at is None:
+        return "month"
+    age_days = (datetime.now(timezone.utc) - last_synced_at).total_seconds() / 86400
+    if age_days <= 1:
+        return "today"
+    if age_days <= 3:
+        return "3days"
+    if age_days <= 7:
+        return "week"
+    return "month"
+
+
+async def fetch_postings(role: str, location: str | None, date_posted: str) -> tuple[list[dict], bool]:
+    """Postings for one query, and whether every page of it was fetched."""
+    # Near-duplicates are kept: the catalog links them itself on upsert
+    sources = [FileJobSource(settings.CATALOG_FEED_PATH)] if settings.CATALOG_FEED_PATH else None
+    report = FanoutReport()
+    jobs: list[dict] = []
+    try:
+        async for page in iter_job_pages(
+            query_variants(role),
+            location,
+            num_pages=settings.CATALOG_SYNC_PAGES,
+            date_posted=date_posted,
+            use_cache=False,
+            sources=sources,
+            collapse_duplicates=False,
+            report=report,
+        ):
+            jobs.extend(page)
+    except JobSearchUnavailable:
+        pass  # reported below as incomplete
+    if not report.complete:
+        logger.warning(f"Catalog fetch for '{role}' @ {location or 'any'} incomplete: {report}")
+    return jobs, report.complete
+
+
+async def sync_query(role: str, location: str | None) -> int:
+    key = f"{role.lower()}|{(location or '').lower()}"
+    async with async_session_factory() as session:
+        state = await session.get(CatalogSyncState, key)
+        window = date_posted_window(state.last_synced_at if state else None)
+    # No connection is held while the sources are called
+    synced_at = datetime.now(timezone.utc)
+    jobs, complete = await fetch_postings(role, location, window)
+    async with async_session_factory() as session:
+        written = await upsert_catalog_jobs(session, jobs)
+        if complete:
+            # Only a complete pass moves the cursor; otherwise the same window is asked for again
+            await session.merge(CatalogSyncState(
+                query_key=key, role=role, location=location, last_synced_at=synced_at, jobs_seen=written,
+            ))
+        await session.commit()
+    logger.info(f"Catalog sync '{role}' @ {location or 'any'} [{window}]: {written} postings"
+                f"{'' if complete else ' (incomplete, cursor kept)'}")
+    return written
+
+
+async def run_sync() -> dict:
+    total = 0
+    failures = 0
+    for role, location in await popular_queries():
+        try:
+            total += await sync_query(role, location)
+        except Exception as e:
+            failures += 1
+            logger.error(f"Catalog sync failed for '{role}' @ {location or 'any'}: {e}")
+
+    async with async_session_factory() as session:
+        expired = await expire_catalog_jobs(session)
+        # Users who stop searching never trigger /jobs/search's own cleanup
+        expired_snapshots = await expire_search_snapshots(session)
+        await session.commit()
+
+    logger.info(f"Catalog sync done: {total} upserted, {expired} expired, {failures} failed queries, "
+                f"{expired_snapshots} search snapshots expired")
+    summary = {"upserted": total, "expired": expired, "failed_queries": failures,
+               "expired_snapshots": expired_snapshots}
+    if settings.USER_JOB_FEED_AFTER_SYNC:
+        try:
+            summary["feeds"] = await refresh_user_feeds()
+        except Exception as e:
+            logger.error(f"Job feed refresh after sync failed: {e}")
+    return summary
+
+
+async def main(loop: bool = False) -> None:
+    while True:
+        await run_sync()
+        if not loop:
+            return
+        await asyncio.sleep(settings.CATALOG_SYNC_INTERVAL_SECONDS)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--loop", action="store_true", help="sync periodically")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(loop=args.loop))
@@ -0,0 +1,130 @@
+"""Background job — onboard a whole cohort of users in one batch.
+
+Usage:
+    python -m app.workers.cohort_onboard create --name "CSE 2026" manifest.csv
+    python -m app.workers.cohort_onboard invites <cohort_id> --out invites.csv
+    python -m app.workers.cohort_onboard run <cohort_id>
+    python -m app.workers.cohort_onboard run <cohort_id> --concurrency 64 --llm-concurrency 32 --pdf-workers 4
+    python -m app.workers.cohort_onboard status <cohort_id>
+
+The manifest is a CSV with ``email,resume_path`` columns (optional:
+``full_name,location_preference,remote_preference``). ``create`` records the
+cohort, creates missing users (without a password) and one pending pipeline
+run per member, and writes an ``email,token`` invites CSV next to the
+manifest. Members redeem their token with ``POST /auth/set-password``;
+``invites`` re-issues tokens for those who have not yet.
+``run`` executes them (see ``app.services.cohort_runner``) and prints the
+stage throughput report. On SIGTERM / SIGINT no further runs start; those in
+flight finish and are saved. Interrupted or partly failed cohorts continue
+with another ``run``: completed members are skipped and the others resume
+from their last checkpointed node.
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import signal
+import uuid
+
+from app.core.config import get_settings
+from app.core.tracing import flush_traces
+from app.db.session import async_session_factory
+from app.services.cohort_runner import cohort_invites, cohort_status, create_cohort, load_manifest, run_cohort
+from app.services.http_client import close_http_client, start_http_client
+from app.services.job_search import rapidapi_limiter
+from app.services.llm_client import llm_limiter
+from app.services.pipeline_checkpoint import close_checkpointer, start_checkpointer
+from app.services.resume_parser import pdf_limiter, shutdown_pdf_pool
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+async def create(name: str, manifest: str) -> None:
+    members = load_manifest(manifest)
+    async with async_session_factory() as session:
+        cohort = await create_cohort(session, name, members)
+        await session.commit()
+    print(f"Cohort {cohort.id} created with {len(members)} members")
+    await invites(cohort.id, f"{manifest.rsplit('.', 1)[0]}.invites.csv")
+
+
+async def invites(cohort_id: uuid.UUID, out: str) -> None:
+    async with async_session_factory() as session:
+        rows = await cohort_invites(session, cohort_id)
+    with open(out, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["email", "token"])
+        writer.writerows(rows)
+    print(f"{len(rows)} invites written to {out}")
+
+
+async def run(cohort_id: uuid.UUID, concurrency: int | None) -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
+    await start_http_client()
+    await start_checkpointer()
+    try:
+        stats = await run_cohort(cohort_id, concurrency, stop)
+    finally:
+        await close_checkpointer()
+        await flush_traces()
+        await close_http_client()
+        shutdown_pdf_pool()
+    print(json.dumps(stats, indent=2))
+
+
+async def status(cohort_id: uuid.UUID) -> None:
+    info = await cohort_status(cohort_id)
+    if info is None:
+        raise SystemExit(f"Cohort {cohort_id} not found")
+    print(json.dumps(info, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    create_cmd = commands.add_parser("create", help="create a cohort from a CSV manifest")
+    create_cmd.add_argument("--name", required=True)
+    create_cmd.add_argument("manifest")
+
+    invites_cmd = commands.add_parser("invites", help="set-password tokens for members without a password")
+    invites_cmd.add_argument("cohort_id", type=uuid.UUID)
+    invites_cmd.add_argument("--out", required=True, help="CSV to write (email,token)")
+
+    run_cmd = commands.add_parser("run", help="run (or resume) a cohort")
+    run_cmd.add_argument("cohort_id", type=uuid.UUID)
+    run_cmd.add_argument("--concurrency", type=int, default=settings.COHORT_CONCURRENCY,
+                         help="pipeline runs in flight")
+    run_cmd.add_argument("--llm-concurrency", type=int, default=settings.LLM_MAX_CONCURRENCY)
+    run_cmd.add_argument("--rapidapi-concurrency", type=int, default=settings.RAPIDAPI_MAX_CONCURRENCY)
+    run_cmd.add_argument("--pdf-workers", type=int, default=settings.PDF_PROCESS_WORKERS,
+                         help="processes for PDF extraction (0: threads)")
+
+    status_cmd = commands.add_parser("status", help="run counts and the last report of a cohort")
+    status_cmd.add_argument("cohort_id", type=uuid.UUID)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command == "create":
+        asyncio.run(create(args.name, args.manifest))
+    elif args.command == "invites":
+        asyncio.run(invites(args.cohort_id, args.out))
+    elif args.command == "status":
+        asyncio.run(status(args.cohort_id))
+    else:
+        llm_limiter.set_limit(args.llm_concurrency)
+        rapidapi_limiter.set_limit(args.rapidapi_concurrency)
+        settings.PDF_PROCESS_WORKERS = args.pdf_workers
+        if args.pdf_workers > 0:
+            pdf_limiter.set_limit(max(settings.PDF_MAX_CONCURRENCY, args.pdf_workers))  # keep every process busy
+        # Every in-flight run may hold a checkpoint connection
+        settings.PIPELINE_CHECKPOINT_POOL_SIZE = max(settings.PIPELINE_CHECKPOINT_POOL_SIZE, min(args.concurrency, 50))
+        asyncio.run(run(args.cohort_id, args.concurrency))
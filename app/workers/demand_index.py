@@ -0,0 +1,100 @@
+"""Background job — rebuild the role-skill demand index from job descriptions.
+
+Usage:
+    python -m app.workers.demand_index           # rebuild once
+    python -m app.workers.demand_index --loop    # rebuild every DEMAND_INDEX_REFRESH_SECONDS
+
+The API processes hot-reload the artifact at DEMAND_INDEX_PATH; no restart needed.
+"""
+
+import argparse
+import asyncio
+import logging
+
+from sqlalchemy import select
+
+from app.core.config import get_settings
+from app.db.session import async_session_factory
+from app.models.job import CatalogJob, JobSearchSnapshot, SavedJob
+from app.services.ats_scorer import ROLE_KEYWORDS
+from app.services.career_recommender import ROLE_SKILL_MAP
+from app.services.demand_index import build_demand_index, save_demand_index
+from app.services.resume_parser import SKILL_PATTERNS
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+def build_vocab() -> set[str]:
+    """Every skill/keyword term the services already know how to use."""
+    vocab = set(SKILL_PATTERNS)
+    for skills in ROLE_SKILL_MAP.values():
+        vocab.update(skills)
+    for keywords in ROLE_KEYWORDS.values():
+        vocab.update(keywords)
+    return {v.lower().strip() for v in vocab}
+
+
+async def collect_job_documents() -> list[dict]:
+    """Load (title, description) pairs from the catalog, saved jobs and search snapshots."""
+    docs: list[dict] = []
+    seen: set[str] = set()
+
+    def add(external_id: str | None, title: str, description: str | None) -> None:
+        # The same posting saved or searched by many users counts once
+        if external_id:
+            if external_id in seen:
+                return
+            seen.add(external_id)
+        docs.append({"title": title, "description": description})
+
+    async with async_session_factory() as session:
+        result = await session.execute(
+            select(CatalogJob.external_job_id, CatalogJob.title, CatalogJob.description)
+        )
+        for external_id, title, description in result.all():
+            add(external_id, title, description)
+
+        result = await session.execute(
+            select(SavedJob.external_job_id, SavedJob.title, SavedJob.description)
+        )
+        for external_id, title, description in result.all():
+            add(external_id, title, description)
+
+        result = await session.execute(select(JobSearchSnapshot.jobs))
+        for jobs in result.scalars():
+            for job in jobs or []:
+                add(job.get("external_job_id"), job.get("title", ""), job.get("description"))
+    return docs
+
+
+async def rebuild_demand_index() -> dict:
+    docs = await collect_job_documents()
+    index = build_demand_index(docs, build_vocab(), min_docs=settings.DEMAND_INDEX_MIN_DOCS)
+    save_demand_index(index, settings.DEMAND_INDEX_PATH)
+    logger.info(
+        f"Demand index rebuilt: {len(index['roles'])} roles from {index['total_docs']} postings "
+        f"-> {settings.DEMAND_INDEX_PATH}"
+    )
+    return index
+
+
+async def main(loop: bool = False) -> None:
+    while True:
+        try:
+            await rebuild_demand_index()
+        except Exception as e:
+            if not loop:
+                raise
+            logger.error(f"Demand index rebuild failed: {e}")
+        if not loop:
+            return
+        await asyncio.sleep(settings.DEMAND_INDEX_REFRESH_SECONDS)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--loop", action="store_true", help="rebuild periodically")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(loop=args.loop))
@@ -0,0 +1,106 @@
+"""Background job — consume the Postgres task queue.
+
+Usage:
+    python -m app.workers.task_worker                          # TASK_WORKER_PROCESSES × TASK_WORKER_CONCURRENCY
+    python -m app.workers.task_worker --processes 4 --concurrency 8
+    python -m app.workers.task_worker --kinds pipeline.run     # only some task kinds
+    python -m app.workers.task_worker --stats                  # task counts by kind / status
+    python -m app.workers.task_worker --requeue-dead           # retry dead-lettered tasks
+
+Each process runs ``--concurrency`` async consumers, and each consumer claims
+one task at a time with ``FOR UPDATE SKIP LOCKED``. Add processes (or hosts)
+for CPU-bound work and consumers for I/O-bound LLM calls. On SIGTERM /
+SIGINT, consumers stop claiming and finish their current task. A worker
+killed outright leaves its tasks' leases to expire, and other consumers
+pick them up.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import signal
+
+from app.core.config import get_settings
+from app.core.tracing import flush_traces
+from app.services.http_client import close_http_client, start_http_client
+from app.services.pipeline_checkpoint import close_checkpointer, start_checkpointer
+from app.services.resume_parser import shutdown_pdf_pool
+from app.services.task_queue import consume, make_worker_id, queue_stats, requeue_dead
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+async def run_consumers(concurrency: int, kinds: list[str] | None = None) -> None:
+    """Run ``concurrency`` consumers in this process until signalled."""
+    import app.workers.tasks  # noqa: F401  (registers the handlers)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
+    await start_http_client()
+    await start_checkpointer()
+    logger.info(f"Task worker: {concurrency} consumers, kinds={kinds or 'all'}")
+    try:
+        await asyncio.gather(*(
+            consume(make_worker_id(i), stop, kinds) for i in range(concurrency)
+        ))
+    finally:
+        await close_checkpointer()
+        await flush_traces()
+        await close_http_client()
+        shutdown_pdf_pool()
+
+
+def _process_main(concurrency: int, kinds: list[str] | None) -> None:
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_consumers(concurrency, kinds))
+
+
+def main(processes: int, concurrency: int, kinds: list[str] | None = None) -> None:
+    if processes <= 1:
+        _process_main(concurrency, kinds)
+        return
+
+    ctx = multiprocessing.get_context("spawn")
+    children = [
+        ctx.Process(target=_process_main, args=(concurrency, kinds), name=f"task-worker-{i}")
+        for i in range(processes)
+    ]
+    for child in children:
+        child.start()
+
+    def _forward(signum, frame):
+        for child in children:
+            if child.is_alive():
+                child.terminate()  # SIGTERM: finish current task, then exit
+
+    signal.signal(signal.SIGTERM, _forward)
+    signal.signal(signal.SIGINT, _forward)
+    for child in children:
+        child.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, default=settings.TASK_WORKER_PROCESSES)
+    parser.add_argument("--concurrency", type=int, default=settings.TASK_WORKER_CONCURRENCY,
+                        help="async consumers per process")
+    parser.add_argument("--kinds", help="comma-separated task kinds to consume (default: all)")
+    parser.add_argument("--stats", action="store_true", help="print task counts and exit")
+    parser.add_argument("--requeue-dead", action="store_true", help="requeue dead-lettered tasks and exit")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    kinds = [k.strip() for k in args.kinds.split(",") if k.strip()] if args.kinds else None
+
+    if args.stats:
+        print(json.dumps(asyncio.run(queue_stats()), indent=2))
+    elif args.requeue_dead:
+        requeued = asyncio.run(requeue_dead(kinds))
+        print(f"Requeued {requeued} dead tasks")
+    else:
+        main(args.processes, args.concurrency, kinds)
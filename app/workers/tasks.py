@@ -0,0 +1,131 @@
+"""Task wrappers around the LLM-heavy services, run by ``app.workers.task_worker``.
+
+Each handler:
+
+- loads what it needs from the task payload
+- calls the service with ``raise_transient=True``, so a provider outage or
+  rate limit becomes a queue retry with backoff instead of a silently
+  degraded result
+- persists results the way the matching endpoint does
+- returns a JSON result, which is stored on the task for ``GET /tasks/{id}``
+
+Missing inputs raise ``PermanentTaskError`` and are dead-lettered without
+retrying.
+"""
+
+import uuid
+
+from sqlalchemy import select
+
+from app.db.session import async_session_factory
+from app.models.resume import ResumeProfile
+from app.models.task import Task
+from app.models.user import User
+from app.schemas.career import CareerRecommendationOut, to_role_insight
+from app.schemas.resume import ResumeProfileOut
+from app.schemas.roadmap import RoadmapEntryOut
+from app.services.ats_scorer import score_resume
+from app.services.career_recommender import refresh_recommendations
+from app.services.pipeline_runner import drop_checkpoints, execute_run, fail_run
+from app.services.resume_parser import is_user_upload, parse_resume_with_llm, save_parsed_resume
+from app.services.roadmap_generator import create_roadmap
+from app.services.role_insights import explore_roles
+from app.services.task_queue import PermanentTaskError, task_handler
+
+# Kinds users may submit through POST /tasks (payload user_id is the caller).
+# resume.parse is not one: it is queued by POST /resume/upload-async with a server-chosen path.
+USER_TASK_KINDS = ("resume.ats_score", "career.recommend", "career.explore", "roadmap.generate")
+
+
+async def _load_profile(session, user_id: uuid.UUID) -> ResumeProfile | None:
+    result = await session.execute(select(ResumeProfile).where(ResumeProfile.user_id == user_id))
+    return result.scalar_one_or_none()
+
+
+@task_handler("resume.parse", priority=10)
+async def parse_resume_task(task: Task) -> dict:
+    file_path = task.payload.get("file_path")
+    if not file_path:
+        raise PermanentTaskError("Missing file_path")
+    if not is_user_upload(file_path, task.user_id):
+        raise PermanentTaskError("file_path is not one of the user's uploads")
+    parsed = await parse_resume_with_llm(file_path, raise_transient=True)
+    async with async_session_factory() as session:
+        profile = await save_parsed_resume(session, task.user_id, file_path, parsed)
+        await session.commit()
+        return ResumeProfileOut.model_validate(profile).model_dump(mode="json")
+
+
+@task_handler("resume.ats_score", priority=10)
+async def ats_score_task(task: Task) -> dict:
+    async with async_session_factory() as session:
+        profile = await _load_profile(session, task.user_id)
+    if not profile or not profile.raw_text:
+        raise PermanentTaskError("Upload a resume first")
+    return await score_resume(
+        profile.raw_text,
+        task.payload.get("target_role"),
+        use_llm=task.payload.get("use_llm"),
+        raise_transient=True,
+    )
+
+
+@task_handler("career.recommend", priority=10)
+async def recommend_careers_task(task: Task) -> dict:
+    async with async_session_factory() as session:
+        profile = await _load_profile(session, task.user_id)
+        if not profile or not profile.skills:
+            raise PermanentTaskError("Upload resume first to extract skills")
+        recs = await refresh_recommendations(session, task.user_id, profile, raise_transient=True)
+        await session.commit()
+        return {"recommendations": [CareerRecommendationOut.model_validate(r).model_dump(mode="json") for r in recs]}
+
+
+@task_handler("career.explore", priority=5)
+async def explore_roles_task(task: Task) -> dict:
+    async with async_session_factory() as session:
+        user = await session.get(User, task.user_id)
+        profile = await _load_profile(session, task.user_id)
+        if not user or not profile or not profile.raw_text:
+            raise PermanentTaskError("Upload a resume first")
+        insights = await explore_roles(
+            session, user, profile,
+            roles=task.payload.get("roles"),
+            refresh=bool(task.payload.get("refresh")),
+            raise_transient=True,
+        )
+        await session.commit()
+        return {"roles": [
+            to_role_insight(i).model_dump(mode="json", exclude_unset=True) for i in insights
+        ]}
+
+
+@task_handler("roadmap.generate", priority=5)
+async def generate_roadmap_task(task: Task) -> dict:
+    days = int(task.payload.get("days", 7))
+    async with async_session_factory() as session:
+        profile = await _load_profile(session, task.user_id)
+        entries = await create_roadmap(session, task.user_id, profile, days, raise_transient=True)
+        await session.commit()
+        return {"entries": [RoadmapEntryOut.model_validate(e).model_dump(mode="json") for e in entries]}
+
+
+async def _pipeline_run_dead(task: Task, error: str) -> None:
+    # Timed out or lease lapsed on the last attempt: nothing else will end the run
+    await fail_run(uuid.UUID(task.payload["run_id"]), error)
+
+
+@task_handler("pipeline.run", priority=10, max_attempts=3, on_dead=_pipeline_run_dead)
+async def pipeline_run_task(task: Task) -> dict:
+    # Nodes retry transient errors themselves; a failed attempt is retried by the
+    # queue, and every attempt (or a re-claimed task) resumes the checkpoint
+    run_id = uuid.UUID(task.payload["run_id"])
+    await execute_run(run_id, final_attempt=task.attempts >= task.max_attempts)
+    return {"run_id": str(run_id)}
+
+
+@task_handler("pipeline.drop_checkpoint")
+async def drop_checkpoint_task(task: Task) -> dict:
+    # Queued, delayed by PIPELINE_CHECKPOINT_RETENTION_HOURS, when runs complete
+    run_ids = [uuid.UUID(run_id) for run_id in task.payload["run_ids"]]
+    return {"dropped": await drop_checkpoints(run_ids)}
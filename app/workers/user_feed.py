@@ -0,0 +1,42 @@
+"""Background job — recompute per-user ranked job feeds from the catalog.
+
+Usage:
+    python -m app.workers.user_feed            # refresh changed feeds once
+    python -m app.workers.user_feed --force    # recompute every feed
+    python -m app.workers.user_feed --loop     # every USER_JOB_FEED_INTERVAL_SECONDS
+
+The catalog sync worker also runs this after each sync pass (see
+USER_JOB_FEED_AFTER_SYNC), so feeds follow catalog refreshes.
+"""
+
+import argparse
+import asyncio
+import logging
+
+from app.core.config import get_settings
+from app.services.job_feed import refresh_user_feeds
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+async def main(loop: bool = False, force: bool = False) -> None:
+    while True:
+        try:
+            await refresh_user_feeds(force=force)
+        except Exception as e:
+            if not loop:
+                raise
+            logger.error(f"Job feed refresh failed: {e}")
+        if not loop:
+            return
+        await asyncio.sleep(settings.USER_JOB_FEED_INTERVAL_SECONDS)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--loop", action="store_true", help="refresh periodically")
+    parser.add_argument("--force", action="store_true", help="recompute every feed")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(loop=args.loop, force=args.force))
@@ -47,9 +47,16 @@ export default function DashboardPage() {
   const runPipeline = async () => {
     if (!file) return;
     setPipelineLoading(true);
+    setPipelineResult(null);
     try {
-      const result = await api.runPipeline(file);
-      setPipelineResult(result);
+      const { run_id } = await api.runPipeline(file);
+      let failure = "";
+      // Each finished step streams its slice: skills, then roles, jobs, ATS
+      await api.streamPipeline(run_id, (event, data) => {
+        if (event === "failed") failure = data.error;
+        else if (event !== "resumed") setPipelineResult((prev: any) => ({ ...prev, ...data, step: event }));
+      });
+      if (failure) throw new Error(`Pipeline failed: ${failure}`);
       await refresh();
     } catch (err: any) {
       alert(err.message);
@@ -147,7 +154,9 @@ export default function DashboardPage() {
         {pipelineResult && (
           <div className="mt-6 space-y-4">
             <div className="bg-green-50 border border-green-200 rounded-xl p-4">
-              <h3 className="font-semibold text-green-800">Pipeline Complete</h3>
+              <h3 className="font-semibold text-green-800">
+                {pipelineResult.step === "completed" ? "Pipeline Complete" : "Pipeline Running..."}
+              </h3>
               <p className="text-sm text-green-700 mt-1">
                 Found {pipelineResult.skills_extracted?.length || 0} skills |
                 ATS Score: {pipelineResult.ats_score?.score || "N/A"}/100 |
@@ -6,7 +6,9 @@ import ProtectedRoute from "@/components/ProtectedRoute";
 
 export default function JobsPage() {
   const [jobs, setJobs] = useState<any[]>([]);
+  const [searchId, setSearchId] = useState<string | null>(null);
   const [savedJobs, setSavedJobs] = useState<any[]>([]);
+  const [savedCursor, setSavedCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(false);
   const [role, setRole] = useState("");
   const [tab, setTab] = useState<"search" | "saved">("search");
@@ -15,17 +17,19 @@ export default function JobsPage() {
     setLoading(true);
     try {
       const results = await api.searchJobs(role || undefined);
-      setJobs(results);
+      setSearchId(results.search_id);
+      setJobs(results.jobs);
     } catch (err: any) {
       alert(err.message);
     }
     setLoading(false);
   };
 
-  const loadSaved = async () => {
+  const loadSaved = async (cursor?: string) => {
     try {
-      const saved = await api.getSavedJobs();
-      setSavedJobs(saved);
+      const page = await api.getSavedJobs(cursor);
+      setSavedJobs((prev) => (cursor ? [...prev, ...page.jobs] : page.jobs));
+      setSavedCursor(page.next_cursor);
     } catch {}
   };
 
@@ -34,8 +38,9 @@ export default function JobsPage() {
   }, []);
 
   const saveJob = async (index: number) => {
+    if (!searchId) return;
     try {
-      await api.saveJob(index, role || undefined);
+      await api.saveJob(searchId, index);
       await loadSaved();
     } catch (err: any) {
       alert(err.message);
@@ -170,6 +175,14 @@ export default function JobsPage() {
                 </div>
               </div>
             ))}
+            {savedCursor && (
+              <button
+                onClick={() => loadSaved(savedCursor)}
+                className="w-full py-2 text-sm font-medium text-blue-600 hover:text-blue-700"
+              >
+                Load more
+              </button>
+            )}
           </div>
         )}
       </div>
@@ -66,12 +66,18 @@ export const api = {
 
   // Jobs
   searchJobs: (role?: string) =>
-    request<any[]>(`/jobs/search${role ? `?role=${encodeURIComponent(role)}` : ""}`),
-  saveJob: (index: number, role?: string) =>
-    request<any>(`/jobs/save/${index}${role ? `?role=${encodeURIComponent(role)}` : ""}`, {
+    request<{ search_id: string; expires_at: string; jobs: any[] }>(
+      `/jobs/search${role ? `?role=${encodeURIComponent(role)}` : ""}`
+    ),
+  saveJob: (searchId: string, index: number) =>
+    request<any>("/jobs/save", {
       method: "POST",
+      body: JSON.stringify({ search_id: searchId, job_index: index }),
     }),
-  getSavedJobs: () => request<any[]>("/jobs/saved"),
+  getSavedJobs: (cursor?: string) =>
+    request<{ jobs: any[]; next_cursor: string | null }>(
+      `/jobs/saved${cursor ? `?cursor=${encodeURIComponent(cursor)}` : ""}`
+    ),
   updateJobStatus: (id: string, status: string) =>
     request<any>(`/jobs/saved/${id}/status`, {
       method: "PATCH",
@@ -91,6 +97,36 @@ export const api = {
   runPipeline: (file: File) => {
     const form = new FormData();
     form.append("file", file);
-    return request<any>("/pipeline/onboard", { method: "POST", body: form });
+    return request<{ run_id: string; status: string }>("/pipeline/onboard", { method: "POST", body: form });
+  },
+  resumePipeline: (runId: string) =>
+    request<any>(`/pipeline/runs/${runId}/resume`, { method: "POST" }),
+  // SSE over fetch (EventSource cannot send the Authorization header)
+  streamPipeline: async (runId: string, onEvent: (event: string, data: any) => void) => {
+    const token = typeof window !== "undefined" ? localStorage.getItem("token") : null;
+    const res = await fetch(`${BASE}/pipeline/runs/${runId}/events`, {
+      headers: token ? { Authorization: `Bearer ${token}` } : {},
+    });
+    if (!res.ok || !res.body) throw new Error(`Request failed: ${res.status}`);
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+    for (;;) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      let end;
+      while ((end = buffer.indexOf("\n\n")) >= 0) {
+        const block = buffer.slice(0, end);
+        buffer = buffer.slice(end + 2);
+        let event = "message";
+        let data = "";
+        for (const line of block.split("\n")) {
+          if (line.startsWith("event: ")) event = line.slice(7);
+          else if (line.startsWith("data: ")) data += line.slice(6);
+        }
+        if (data) onEvent(event, JSON.parse(data));
+      }
+    }
   },
 };
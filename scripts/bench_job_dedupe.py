@@ -0,0 +1,88 @@
+"""Benchmark near-duplicate collapsing: LSH banding vs all-pairs comparison.
+
+Usage: python scripts/bench_job_dedupe.py [num_jobs]
+
+Plants reposts (a few edited words, another city and apply URL) among
+distinct postings and reports how many the detector collapses.
+"""
+
+import random
+import sys
+import time
+
+from app.core.config import get_settings
+from app.services.job_dedupe import JobDeduplicator, minhash, similarity
+from app.services.resume_parser import SKILL_PATTERNS
+
+FILLER = (
+    "we are looking for a motivated engineer to join our growing team and build "
+    "reliable products used by thousands of customers across the country "
+).split()
+CITIES = ["Bangalore", "Pune", "Hyderabad", "Chennai", "Mumbai", "Delhi"]
+
+
+def make_jobs(n: int, repost_share: float, rng: random.Random) -> tuple[list[dict], int]:
+    skills = sorted(SKILL_PATTERNS)
+    jobs: list[dict] = []
+    for i in range(n):
+        words = rng.choices(FILLER, k=220) + rng.sample(skills, 8)
+        rng.shuffle(words)
+        jobs.append({
+            "external_job_id": f"job-{i}",
+            "title": f"{rng.choice(['Backend', 'Frontend', 'Data'])} Developer",
+            "company": f"Company {i % 500}",
+            "location": rng.choice(CITIES),
+            "apply_url": f"https://example.com/{i}",
+            "description": " ".join(words),
+        })
+
+    planted = int(n * repost_share)
+    for i, original in enumerate(rng.sample(jobs, planted)):
+        words = original["description"].split()
+        for _ in range(rng.randint(1, 6)):
+            words[rng.randrange(len(words))] = rng.choice(FILLER)
+        jobs.append({
+            **original,
+            "external_job_id": f"repost-{i}",
+            "location": rng.choice(CITIES),
+            "apply_url": f"https://aggregator.example/{i}",
+            "description": " ".join(words),
+        })
+    rng.shuffle(jobs)
+    return jobs, planted
+
+
+def all_pairs(jobs: list[dict]) -> int:
+    threshold = get_settings().JOB_DEDUPE_MIN_SIMILARITY
+    canonical: list = []
+    duplicates = 0
+    for job in jobs:
+        signature = minhash(job)
+        if any(similarity(signature, c) >= threshold for c in canonical):
+            duplicates += 1
+        else:
+            canonical.append(signature)
+    return duplicates
+
+
+def main():
+    num_jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    jobs, planted = make_jobs(num_jobs, 0.2, random.Random(11))
+
+    start = time.perf_counter()
+    dedupe = JobDeduplicator()
+    for job in jobs:
+        dedupe.add(dict(job))
+    lsh_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    brute = all_pairs(jobs)
+    brute_ms = (time.perf_counter() - start) * 1000
+
+    print(f"jobs={len(jobs)} planted_reposts={planted}")
+    print(f"LSH banding:  {lsh_ms:8.1f} ms  collapsed={dedupe.duplicates}")
+    print(f"all pairs:    {brute_ms:8.1f} ms  collapsed={brute}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Benchmark the job ranking engine on a large candidate pool.
+
+Usage: python scripts/bench_job_ranker.py [num_jobs]
+"""
+
+import random
+import sys
+import time
+from statistics import median
+
+from app.services.job_ranker import JobRanker, clear_feature_cache
+from app.services.resume_parser import SKILL_PATTERNS
+
+FILLER = (
+    "we are looking for a motivated engineer to join our growing team and build "
+    "reliable products used by thousands of customers across the country "
+).split()
+
+
+def legacy_rank_jobs(jobs: list[dict], user_skills: list[str], location_pref: str | None = None) -> list[dict]:
+    """The previous substring-based ranker (mutates, full sort)."""
+    user_skill_set = {s.lower() for s in user_skills}
+    for job in jobs:
+        desc_lower = (job.get("description") or "").lower()
+        title_lower = (job.get("title") or "").lower()
+        skill_hits = sum(1 for s in user_skill_set if s in desc_lower or s in title_lower)
+        skill_score = min(60, (skill_hits / max(len(user_skill_set), 1)) * 60)
+        loc_score = 0
+        if location_pref:
+            job_loc = (job.get("location") or "").lower()
+            if location_pref.lower() in job_loc:
+                loc_score = 20
+            elif job.get("is_remote"):
+                loc_score = 15
+        exp_score = 20
+        for marker in ["5+ years", "4+ years", "3+ years", "senior", "lead", "principal"]:
+            if marker in desc_lower:
+                exp_score = 0
+                break
+        for marker in ["entry level", "fresher", "0-1 year", "junior", "intern", "graduate"]:
+            if marker in desc_lower:
+                exp_score = 20
+                break
+        job["match_score"] = round(skill_score + loc_score + exp_score, 1)
+    jobs.sort(key=lambda j: j["match_score"], reverse=True)
+    return jobs[:20]
+
+
+def make_jobs(n: int, rng: random.Random) -> list[dict]:
+    skills = sorted(SKILL_PATTERNS)
+    jobs = []
+    for i in range(n):
+        words = rng.choices(FILLER, k=220) + rng.sample(skills, 8)
+        if rng.random() < 0.3:
+            words.append(rng.choice(["senior", "5+ years", "fresher", "entry level"]))
+        rng.shuffle(words)
+        jobs.append({
+            "external_job_id": f"job-{i}",
+            "title": f"{rng.choice(['Backend', 'Frontend', 'Data'])} Developer",
+            "company": f"Company {i % 500}",
+            "location": rng.choice(["Bangalore", "Pune", "Remote", "Hyderabad"]),
+            "is_remote": rng.random() < 0.2,
+            "description": " ".join(words),
+        })
+    return jobs
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    num_jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    rng = random.Random(7)
+    jobs = make_jobs(num_jobs, rng)
+    user_skills = rng.sample(sorted(SKILL_PATTERNS), 15)
+
+    legacy_ms = median([
+        timed(lambda: legacy_rank_jobs([dict(j) for j in jobs], user_skills, "Bangalore"))
+        for _ in range(5)
+    ])
+
+    def cold() -> float:
+        clear_feature_cache()
+        return timed(lambda: JobRanker(user_skills, "Bangalore").rank(jobs))
+
+    cold_ms = median([cold() for _ in range(5)])
+    warm_ms = median([
+        timed(lambda: JobRanker(rng.sample(sorted(SKILL_PATTERNS), 15), "Bangalore").rank(jobs))
+        for _ in range(10)
+    ])
+
+    avg_chars = sum(len(j["description"]) for j in jobs) // len(jobs)
+    print(f"jobs={num_jobs} avg_description={avg_chars} chars user_skills={len(user_skills)}")
+    print(f"legacy substring ranker:        {legacy_ms:8.1f} ms  (median of 5)")
+    print(f"engine, cold (tokenize all):    {cold_ms:8.1f} ms  (median of 5)")
+    print(f"engine, warm (cached features): {warm_ms:8.1f} ms  (median of 10 users)")
+
+
+if __name__ == "__main__":
+    main()
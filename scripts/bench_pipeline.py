@@ -0,0 +1,71 @@
+"""Show the onboarding pipeline's critical path with stubbed external calls.
+
+Usage: python scripts/bench_pipeline.py
+
+The LLM / job API calls are replaced by sleeps of typical latency so the
+graph structure is what's measured: job search and ATS scoring overlap, and
+the speculative job search for the keyword top role overlaps the LLM
+recommendation (on a hit) or is thrown away (on a miss).
+"""
+
+import asyncio
+import time
+
+from app.core.config import get_settings
+from app.services import pipeline
+
+LATENCY = {"parse": 0.3, "recommend": 0.5, "search": 1.5, "ats": 1.0}
+LLM_ROLE = "Backend Developer"
+
+
+async def fake_parse(path, **kwargs):
+    await asyncio.sleep(LATENCY["parse"])
+    return {"raw_text": "python developer resume", "skills": ["python", "sql"]}
+
+
+async def fake_recommend(user_skills, education=None, experience=None, **kwargs):
+    await asyncio.sleep(LATENCY["recommend"])
+    return [{"job_role": LLM_ROLE, "match_score": 80}]
+
+
+async def fake_search(role, skills, location=None, remote=False):
+    await asyncio.sleep(LATENCY["search"])
+    return [{"title": role, "match_score": 70}]
+
+
+async def fake_score(text, role, **kwargs):
+    await asyncio.sleep(LATENCY["ats"])
+    return {"score": 72}
+
+
+async def run(label: str, speculate: bool, guess: str) -> None:
+    get_settings().PIPELINE_SPECULATIVE_SEARCH = speculate
+    pipeline.predict_top_role = lambda skills: guess
+
+    start = time.perf_counter()
+    result = await pipeline.run_full_pipeline("bench-user", "resume.pdf")
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    timings = result["timings"]
+    print(f"\n{label}")
+    for node, ms in timings["nodes"].items():
+        print(f"  {node:<18} {ms:8.1f} ms")
+    print(f"  critical path:     {timings['critical_path_ms']:8.1f} ms")
+    print(f"  measured wall time:{wall_ms:8.1f} ms  errors={result['errors']}")
+
+
+async def main():
+    pipeline.parse_resume_with_llm = fake_parse
+    pipeline.recommend_roles = fake_recommend
+    pipeline.find_jobs_for_role = fake_search
+    pipeline.score_resume = fake_score
+
+    print(f"stub latencies (s): {LATENCY}")
+    await run("no speculation", speculate=False, guess=LLM_ROLE)
+    await run("speculation hit", speculate=True, guess=LLM_ROLE)
+    await run("speculation miss", speculate=True, guess="Data Analyst")
+    print(f"\nspeculation stats: {pipeline.get_speculation_stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
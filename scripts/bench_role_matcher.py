@@ -0,0 +1,71 @@
+"""Benchmark the vectorized role matcher against the per-role set loop.
+
+Usage: python scripts/bench_role_matcher.py [num_roles]
+"""
+
+import random
+import sys
+import tempfile
+import time
+
+from app.services.role_matcher import RoleMatcher
+
+
+def naive_top_k(mapping: dict[str, list[str]], user_skills: list[str], top_n: int) -> list[dict]:
+    """The original per-call loop: one set per role, full sort."""
+    user_skill_set = {s.lower().strip() for s in user_skills}
+    results: list[dict] = []
+    for role, role_skills in mapping.items():
+        role_skill_set = {s.lower() for s in role_skills}
+        matched = user_skill_set & role_skill_set
+        score = len(matched) / (len(role_skill_set) + 1e-6)
+        results.append({
+            "job_role": role,
+            "match_score": round(score * 100, 1),
+            "matched_skills": sorted(matched),
+            "missing_skills": sorted(role_skill_set - user_skill_set),
+        })
+    results.sort(key=lambda x: x["match_score"], reverse=True)
+    return results[:top_n]
+
+
+def timeit(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    num_roles = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    rng = random.Random(42)
+    vocab = [f"skill_{i}" for i in range(2_000)]
+    mapping = {f"Role {i}": rng.sample(vocab, rng.randint(5, 30)) for i in range(num_roles)}
+    users = [rng.sample(vocab, rng.randint(5, 40)) for _ in range(50)]
+
+    start = time.perf_counter()
+    matcher = RoleMatcher.from_mapping(mapping)
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    for user in users:
+        assert matcher.top_k(user, 5) == naive_top_k(mapping, user, 5)
+
+    it = iter(users * 1000)
+    naive_ms = timeit(lambda: naive_top_k(mapping, next(it), 5), 20)
+    it = iter(users * 1000)
+    fast_ms = timeit(lambda: matcher.top_k(next(it), 5), 200)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        matcher.save(tmp)
+        mapped = RoleMatcher.load(tmp, mmap=True)
+        it = iter(users * 1000)
+        mmap_ms = timeit(lambda: mapped.top_k(next(it), 5), 200)
+
+    print(f"roles={num_roles} skills={len(matcher.skills)} compile={compile_ms:.1f}ms")
+    print(f"naive loop:   {naive_ms:8.3f} ms/query")
+    print(f"csr top-k:    {fast_ms:8.3f} ms/query  ({naive_ms / fast_ms:.0f}x)")
+    print(f"csr (mmap):   {mmap_ms:8.3f} ms/query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+"""Precompile the role × skill matrix into ROLE_MATRIX_DIR.
+
+Run after changing ROLE_SKILL_MAP or the files in ROLE_TAXONOMY_DIR. The API
+memory-maps the saved arrays so all workers share a single copy.
+"""
+
+import sys
+
+from app.core.config import get_settings
+from app.services.career_recommender import build_role_taxonomy
+from app.services.role_matcher import RoleMatcher
+
+
+def main():
+    target = sys.argv[1] if len(sys.argv) > 1 else get_settings().ROLE_MATRIX_DIR
+    if not target:
+        sys.exit("Set ROLE_MATRIX_DIR or pass an output directory")
+    matcher = RoleMatcher.from_mapping(build_role_taxonomy())
+    matcher.save(target)
+    print(f"Saved {len(matcher)} roles x {len(matcher.skills)} skills to {target}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,7 @@ from app.db.base import Base
 from app.db.session import engine
 
 # Import models so they register with Base
-from app.models import career, job, resume, roadmap, user  # noqa: F401
+from app.models import career, job, pipeline, resume, roadmap, role_keywords, task, user  # noqa: F401
 
 
 async def init():
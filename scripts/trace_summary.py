@@ -0,0 +1,57 @@
+"""Print the critical path of traces exported with TRACE_EXPORTER=json.
+
+Usage:
+    python scripts/trace_summary.py                          # last 10 traces in TRACE_JSON_PATH
+    python scripts/trace_summary.py --name pipeline.run -n 3
+    python scripts/trace_summary.py --trace-id <run_id>      # every attempt of one run
+    python scripts/trace_summary.py --spans                  # slowest spans too
+"""
+
+import argparse
+import json
+
+from app.core.config import get_settings
+from app.core.tracing import normalize_trace_id
+
+
+def load(path: str) -> list[dict]:
+    traces = []
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                traces.append(json.loads(line))
+    return traces
+
+
+def print_trace(trace: dict, show_spans: bool) -> None:
+    error = f"  ERROR {trace['error']}" if trace.get("error") else ""
+    print(f"{trace['name']}  {trace['trace_id']}  {trace['duration_ms']:.1f} ms  "
+          f"({trace['spans']} spans){error}")
+    total = trace["duration_ms"] or 1.0
+    for step in trace["critical_path"]:
+        bar = "█" * max(1, round(40 * step["ms"] / total))
+        print(f"  {step['span']:<32} {step['ms']:9.1f} ms  {bar}")
+    if show_spans:
+        print("  slowest spans:")
+        for s in sorted(trace["span_list"], key=lambda s: s["duration_ms"], reverse=True)[:10]:
+            print(f"    {s['name']:<30} {s['duration_ms']:9.1f} ms  {json.dumps(s['attributes'], default=str)[:80]}")
+    print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--file", default=get_settings().TRACE_JSON_PATH)
+    parser.add_argument("--name", help="only traces whose root span has this name")
+    parser.add_argument("--trace-id", help="only this trace (a run id works)")
+    parser.add_argument("-n", type=int, default=10, help="how many of the latest traces")
+    parser.add_argument("--spans", action="store_true", help="also list the slowest spans")
+    args = parser.parse_args()
+
+    traces = load(args.file)
+    if args.name:
+        traces = [t for t in traces if t["name"] == args.name]
+    if args.trace_id:
+        wanted = normalize_trace_id(args.trace_id)
+        traces = [t for t in traces if t["trace_id"] == wanted]
+    for trace in traces[-args.n:]:
+        print_trace(trace, args.spans)
@@ -0,0 +1,22 @@
+"""Integration tests use the Postgres at DATABASE_URL (tables from scripts/init_db.py).
+
+They are skipped when the database is not reachable.
+"""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+
+from app.db.session import engine
+
+
+@pytest_asyncio.fixture
+async def db():
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    except Exception as e:
+        await engine.dispose()
+        pytest.skip(f"Postgres not reachable: {e}")
+    yield engine
+    await engine.dispose()  # pooled connections belong to this test's event loop
@@ -0,0 +1,116 @@
+"""A catalog sync pass against the local stub feed (scripts/stub_job_feed.json)."""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, select, update
+
+from app.db.session import async_session_factory
+from app.models.job import CatalogJob, CatalogSyncState, JobSearchSnapshot
+from app.models.user import User
+from app.services.job_catalog import expire_search_snapshots, link_near_duplicates, upsert_catalog_jobs
+from app.workers import catalog_sync
+from app.workers.catalog_sync import sync_query
+
+ROLE, LOCATION = "Backend Developer", "Bangalore"
+KEY = f"{ROLE.lower()}|{LOCATION.lower()}"
+
+
+async def sync_state() -> CatalogSyncState | None:
+    async with async_session_factory() as session:
+        return await session.get(CatalogSyncState, KEY)
+
+
+@pytest_asyncio.fixture
+async def clean(db):
+    async def wipe():
+        async with async_session_factory() as session:
+            await session.execute(delete(CatalogSyncState).where(CatalogSyncState.query_key == KEY))
+            await session.execute(delete(CatalogJob).where(CatalogJob.external_job_id == "stub-001"))
+            await session.commit()
+
+    await wipe()
+    yield
+    await wipe()
+
+
+@pytest.mark.asyncio
+async def test_sync_pass_moves_the_cursor_only_when_complete(clean, monkeypatch, tmp_path):
+    # A failed fetch records nothing: the next pass asks for the whole window again
+    monkeypatch.setattr(catalog_sync.settings, "CATALOG_FEED_PATH", str(tmp_path / "missing.json"))
+    assert await sync_query(ROLE, LOCATION) == 0
+    assert await sync_state() is None
+
+    monkeypatch.setattr(catalog_sync.settings, "CATALOG_FEED_PATH", "scripts/stub_job_feed.json")
+    assert await sync_query(ROLE, LOCATION) == 1
+    state = await sync_state()
+    assert state is not None and state.jobs_seen == 1
+    async with async_session_factory() as session:
+        job = (await session.execute(
+            select(CatalogJob).where(CatalogJob.external_job_id == "stub-001")
+        )).scalar_one()
+    assert job.title == "Backend Developer - Fresher"
+
+    # An incomplete pass keeps the previous cursor
+    monkeypatch.setattr(catalog_sync.settings, "CATALOG_FEED_PATH", str(tmp_path / "missing.json"))
+    await sync_query(ROLE, LOCATION)
+    assert (await sync_state()).last_synced_at == state.last_synced_at
+
+
+@pytest.mark.asyncio
+async def test_expired_search_snapshots_are_swept_for_every_user(db):
+    now = datetime.now(timezone.utc)
+    async with async_session_factory() as session:
+        users = [User(email=f"sweep-{uuid.uuid4().hex[:8]}@example.com", hashed_password="x", full_name="Sweep")
+                 for _ in range(2)]
+        session.add_all(users)
+        await session.flush()
+        for user in users:
+            session.add(JobSearchSnapshot(user_id=user.id, query="old", expires_at=now - timedelta(minutes=1)))
+        session.add(JobSearchSnapshot(user_id=users[0].id, query="live", expires_at=now + timedelta(hours=1)))
+        await session.commit()
+
+    try:
+        async with async_session_factory() as session:
+            assert await expire_search_snapshots(session) >= 2
+            await session.commit()
+            left = await session.execute(
+                select(JobSearchSnapshot.query).where(JobSearchSnapshot.user_id.in_([u.id for u in users]))
+            )
+            assert left.scalars().all() == ["live"]
+    finally:
+        async with async_session_factory() as session:
+            await session.execute(delete(User).where(User.id.in_([u.id for u in users])))
+            await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_canonical_linked_as_duplicate_hands_over_its_duplicates(db):
+    ids = [f"dup-{uuid.uuid4().hex[:8]}" for _ in range(3)]
+    older, canonical, duplicate = ids
+    posting = {"title": "Platform Engineer", "company": "Acme", "location": "Pune",
+               "description": "Build and run the deployment platform with Kubernetes and Go."}
+    try:
+        async with async_session_factory() as session:
+            await upsert_catalog_jobs(session, [{**posting, "external_job_id": i} for i in ids])
+            # `older` is found later but was first seen before the cluster's canonical
+            await session.execute(update(CatalogJob).where(CatalogJob.external_job_id == older).values(
+                first_seen_at=datetime.now(timezone.utc) - timedelta(days=1), canonical_job_id=None))
+            await session.execute(update(CatalogJob).where(CatalogJob.external_job_id == canonical)
+                                  .values(canonical_job_id=None))
+            await session.execute(update(CatalogJob).where(CatalogJob.external_job_id == duplicate)
+                                  .values(canonical_job_id=canonical))
+
+            assert await link_near_duplicates(session, {canonical}) == 1
+            await session.commit()
+            result = await session.execute(
+                select(CatalogJob.external_job_id, CatalogJob.canonical_job_id)
+                .where(CatalogJob.external_job_id.in_(ids))
+            )
+            assert dict(result.all()) == {older: None, canonical: older, duplicate: older}
+    finally:
+        async with async_session_factory() as session:
+            await session.execute(delete(CatalogJob).where(CatalogJob.external_job_id.in_(ids)))
+            await session.commit()
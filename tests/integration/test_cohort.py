@@ -0,0 +1,99 @@
+"""Cohort members' invites, and batch writes that fail mid-run."""
+
+import uuid
+
+import httpx
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, select
+
+from app.core.security import hash_password
+from app.db.session import async_session_factory
+from app.main import app
+from app.models.pipeline import Cohort, PipelineRun
+from app.models.user import User
+from app.services import cohort_runner
+from app.services.cohort_runner import CohortMember, cohort_invites, create_cohort, run_cohort
+
+
+@pytest_asyncio.fixture
+async def cohort(db):
+    tag = uuid.uuid4().hex[:8]
+    existing = f"member-{tag}@example.com"
+    async with async_session_factory() as session:
+        session.add(User(email=existing, hashed_password=hash_password("old-secret"), full_name="Existing"))
+        await session.flush()
+        cohort = await create_cohort(session, f"test-{tag}", [
+            CohortMember(email=f"new-{tag}@example.com", resume_path="uploads/a.pdf"),
+            CohortMember(email=existing, resume_path="uploads/b.pdf"),
+        ])
+        await session.commit()
+    yield cohort
+    async with async_session_factory() as session:
+        await session.execute(delete(User).where(User.email.in_([f"new-{tag}@example.com", existing])))
+        await session.execute(delete(Cohort).where(Cohort.id == cohort.id))
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_new_members_sign_up_with_their_invite(cohort):
+    async with async_session_factory() as session:
+        invites = await cohort_invites(session, cohort.id)
+    # Members who already had an account keep their password and get no invite
+    assert len(invites) == 1
+    email, token = invites[0]
+    assert email.startswith("new-")
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test/api/v1") as client:
+        assert (await client.post("/auth/login", json={"email": email, "password": ""})).status_code == 401
+        # An invite is not an access token
+        assert (await client.get("/users/me", headers={"Authorization": f"Bearer {token}"})).status_code == 401
+
+        resp = await client.post("/auth/set-password", json={"token": token, "password": "s3cret-pass"})
+        assert resp.status_code == 200
+        assert resp.json()["user"]["email"] == email
+
+        # Single use
+        resp = await client.post("/auth/set-password", json={"token": token, "password": "other"})
+        assert resp.status_code == 400
+        resp = await client.post("/auth/login", json={"email": email, "password": "s3cret-pass"})
+        assert resp.status_code == 200
+
+    async with async_session_factory() as session:
+        assert await cohort_invites(session, cohort.id) == []
+
+
+@pytest.mark.asyncio
+async def test_a_failed_batch_write_is_retried_not_dropped(cohort, monkeypatch):
+    async def finished_run(run, location, remote):
+        return {"node_timings": {"parse_resume": 1.0}}, set()
+
+    calls: list[int] = []
+
+    async def flaky_persist(session, runs):
+        calls.append(len(runs))
+        if len(calls) == 1:
+            raise ConnectionError("database went away")
+        await session.execute(
+            PipelineRun.__table__.update()
+            .where(PipelineRun.id.in_([run.id for run, _ in runs]))
+            .values(status="completed")
+        )
+
+    monkeypatch.setattr(cohort_runner, "_execute", finished_run)
+    monkeypatch.setattr(cohort_runner, "persist_onboarding_batch", flaky_persist)
+    monkeypatch.setattr(cohort_runner.settings, "COHORT_PERSIST_BATCH_SIZE", 1)
+
+    stats = await run_cohort(cohort.id, concurrency=1)
+    assert stats["runs"]["completed"] == 2
+    assert stats["runs"]["persisted"] == 2
+    assert stats["runs"]["unpersisted"] == 0
+    assert calls[0] == 1 and sum(calls[1:]) == 2  # the failed batch went out again with the next one
+
+    async with async_session_factory() as session:
+        statuses = (await session.execute(
+            select(PipelineRun.status).where(PipelineRun.cohort_id == cohort.id)
+        )).scalars().all()
+        assert (await session.get(Cohort, cohort.id)).status == "completed"
+    assert statuses == ["completed", "completed"]
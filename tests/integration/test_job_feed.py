@@ -0,0 +1,55 @@
+"""A stored feed built from other inputs is recomputed when the user opens it."""
+
+import uuid
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete
+
+from app.core.security import create_access_token
+from app.db.session import async_session_factory
+from app.main import app
+from app.models.career import CareerRecommendation
+from app.models.job import UserFeedState, UserJobFeedEntry
+from app.models.resume import ResumeProfile
+from app.models.user import User
+from app.services.job_feed import FeedInputs
+
+
+@pytest_asyncio.fixture
+async def user(db):
+    async with async_session_factory() as session:
+        user = User(email=f"feed-{uuid.uuid4().hex[:8]}@example.com", hashed_password="x",
+                    full_name="Feed", location_preference="Pune")
+        session.add(user)
+        await session.flush()
+        session.add(ResumeProfile(user_id=user.id, skills=["python"], experience=[], education=[]))
+        session.add(CareerRecommendation(user_id=user.id, job_role="Zz Feed Test Role", match_score=90,
+                                         is_selected=True))
+        # Computed for the role the user had before switching
+        session.add(UserFeedState(user_id=user.id, role="Data Analyst", inputs_hash="old", job_count=1,
+                                  computed_at=datetime.now(timezone.utc)))
+        session.add(UserJobFeedEntry(user_id=user.id, position=0, external_job_id="old-1",
+                                     job={"external_job_id": "old-1", "title": "Data Analyst", "company": "Acme"}))
+        await session.commit()
+    yield user
+    async with async_session_factory() as session:
+        await session.execute(delete(User).where(User.id == user.id))
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_feed_for_changed_inputs_is_recomputed_inline(user):
+    headers = {"Authorization": f"Bearer {create_access_token(str(user.id))}"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test/api/v1", headers=headers) as client:
+        resp = await client.get("/jobs/feed")
+    assert resp.status_code == 200
+    assert resp.json()["role"] == "Zz Feed Test Role"
+    assert resp.json()["jobs"] == []  # nothing in the catalog for that role; the old entry is gone
+
+    async with async_session_factory() as session:
+        state = await session.get(UserFeedState, user.id)
+    assert state.inputs_hash == FeedInputs(user.id, "Zz Feed Test Role", ["python"], "Pune", False).fingerprint()
@@ -0,0 +1,111 @@
+"""Failing onboarding runs: queue retries, dead-lettering and resume."""
+
+import uuid
+
+import httpx
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, select
+
+from app.core.security import create_access_token
+from app.db.session import async_session_factory
+from app.main import app
+from app.models.pipeline import PipelineRun, PipelineRunEvent
+from app.models.task import Task
+from app.models.user import User
+from app.services import pipeline_runner
+from app.services.pipeline_runner import enqueue_run, follow_events
+from app.services.task_queue import claim, execute
+
+
+@pytest_asyncio.fixture
+async def run(db, monkeypatch):
+    async def no_checkpoint(run_id):
+        return None
+
+    async def failing_stream(run_id, initial_state):
+        raise ConnectionError("provider down")
+        yield  # pragma: no cover
+
+    monkeypatch.setattr(pipeline_runner, "get_run_progress", no_checkpoint)
+    monkeypatch.setattr(pipeline_runner, "stream_pipeline", failing_stream)
+    monkeypatch.setattr("app.services.task_queue.retry_delay", lambda attempts: 0.0)
+
+    async with async_session_factory() as session:
+        user = User(email=f"runs-{uuid.uuid4().hex[:8]}@example.com", hashed_password="x", full_name="Runs")
+        session.add(user)
+        await session.flush()
+        run = PipelineRun(user_id=user.id, resume_file_path="uploads/none.pdf")
+        session.add(run)
+        await session.flush()
+        await enqueue_run(session, run)
+        await session.commit()
+    yield run
+    async with async_session_factory() as session:
+        await session.execute(delete(Task).where(Task.user_id == run.user_id))
+        await session.execute(delete(User).where(User.id == run.user_id))
+        await session.commit()
+
+
+async def run_task_once(run: PipelineRun) -> Task:
+    worker = f"test-{uuid.uuid4().hex[:6]}"
+    task = await claim(worker, ["pipeline.run"])
+    assert task is not None and task.payload["run_id"] == str(run.id)
+    await execute(task, worker)
+    async with async_session_factory() as session:
+        return await session.get(Task, task.id)
+
+
+async def run_state(run: PipelineRun) -> tuple[str, list[str]]:
+    async with async_session_factory() as session:
+        status = (await session.get(PipelineRun, run.id)).status
+        events = (await session.execute(
+            select(PipelineRunEvent.event).where(PipelineRunEvent.run_id == run.id).order_by(PipelineRunEvent.id)
+        )).scalars().all()
+    return status, list(events)
+
+
+@pytest.mark.asyncio
+async def test_failed_attempts_are_retried_then_the_run_fails(run):
+    task = await run_task_once(run)
+    assert task.status == "queued" and task.attempts == 1
+    assert await run_state(run) == ("running", ["retrying"])
+
+    await run_task_once(run)
+    task = await run_task_once(run)
+    assert task.status == "dead" and "provider down" in task.last_error
+    assert await run_state(run) == ("failed", ["retrying", "retrying", "failed"])
+
+    # SSE followers get the terminal event and the stream ends
+    events = [e.event async for e in follow_events(run.id) if e is not None]
+    assert events[-1] == "failed"
+
+
+@pytest.mark.asyncio
+async def test_a_run_whose_task_died_is_failed_and_resumable(run):
+    # The last attempt's lease lapsed (worker killed mid-run): the run was never told
+    async with async_session_factory() as session:
+        task = (await session.execute(select(Task).where(Task.user_id == run.user_id))).scalar_one()
+        task.attempts = task.max_attempts
+        task.status = "running"
+        task.locked_by = "gone"
+        task.locked_until = task.created_at
+        await session.commit()
+
+    task = await run_task_once(run)
+    assert task.status == "dead"
+    assert await run_state(run) == ("failed", ["failed"])
+
+    headers = {"Authorization": f"Bearer {create_access_token(str(run.user_id))}"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test/api/v1", headers=headers) as client:
+        resp = await client.post(f"/pipeline/runs/{run.id}/resume")
+        assert resp.status_code == 202
+        # Its task is queued now: a second resume is refused
+        assert (await client.post(f"/pipeline/runs/{run.id}/resume")).status_code == 409
+
+        # A run left "running" with no live task (dead-lettered before it could record that) resumes
+        async with async_session_factory() as session:
+            await session.execute(delete(Task).where(Task.user_id == run.user_id))
+            await session.commit()
+        assert (await client.post(f"/pipeline/runs/{run.id}/resume")).status_code == 202
@@ -0,0 +1,96 @@
+"""Committed changes to a user row drop its cached principal, whatever the write path."""
+
+import asyncio
+import uuid
+
+import httpx
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, update
+
+from app.core import auth_cache
+from app.core.auth_cache import MemoryPrincipalStore, close_principal_store, remember_principal, set_principal_store
+from app.core.security import create_access_token
+from app.db.session import async_session_factory
+from app.main import app
+from app.models.user import User
+
+
+async def settle() -> None:
+    if auth_cache._pending_invalidations:
+        await asyncio.gather(*auth_cache._pending_invalidations)
+
+
+@pytest_asyncio.fixture
+async def store(db):
+    store = MemoryPrincipalStore(ttl=60, max_entries=100)
+    set_principal_store(store)
+    yield store
+    await close_principal_store()
+
+
+@pytest_asyncio.fixture
+async def users(db):
+    async with async_session_factory() as session:
+        rows = [User(email=f"inval-{uuid.uuid4().hex[:8]}@example.com", hashed_password="x", full_name="Inval")
+                for _ in range(2)]
+        session.add_all(rows)
+        await session.commit()
+    yield rows
+    async with async_session_factory() as session:
+        await session.execute(delete(User).where(User.id.in_([u.id for u in rows])))
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_deactivation_in_another_session_reaches_the_next_request(store, users):
+    user = users[0]
+    headers = {"Authorization": f"Bearer {create_access_token(str(user.id))}"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test/api/v1", headers=headers) as client:
+        assert (await client.get("/users/me")).status_code == 200
+        assert await store.get(user.id) is not None
+
+        # e.g. a worker or an admin script: no explicit invalidate_principal call
+        async with async_session_factory() as session:
+            row = await session.get(User, user.id)
+            row.is_active = False
+            await session.commit()
+        await settle()
+
+        assert await store.get(user.id) is None
+        assert (await client.get("/users/me")).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_only_changed_users_are_invalidated(store, users):
+    for user in users:
+        await remember_principal(user)
+
+    async with async_session_factory() as session:
+        row = await session.get(User, users[0].id)
+        row.full_name = "Renamed"
+        await session.flush()
+        await session.commit()
+    await settle()
+    assert await store.get(users[0].id) is None
+    assert await store.get(users[1].id) is not None
+
+    # Reading a user invalidates nothing
+    async with async_session_factory() as session:
+        await session.get(User, users[1].id)
+        await session.commit()
+    await settle()
+    assert await store.get(users[1].id) is not None
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_clears_the_cache(store, users):
+    for user in users:
+        await remember_principal(user)
+
+    async with async_session_factory() as session:
+        await session.execute(update(User).where(User.id == users[0].id).values(is_active=False))
+        await session.commit()
+    await settle()
+    assert [await store.get(user.id) for user in users] == [None, None]
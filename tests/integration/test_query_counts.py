@@ -0,0 +1,114 @@
+"""How many SQL statements each authenticated endpoint issues.
+
+A throwaway user with a resume profile, recommendations, a stored role
+insight, many saved jobs and roadmap entries calls each endpoint in-process,
+and the statements sent to Postgres are counted. Each endpoint is called
+twice: cold (principal cache invalidated first) and warm (principal cached).
+The main regression this catches is relationships loading implicitly with
+the user on every request.
+"""
+
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+import httpx
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, event, insert
+
+from app.core.auth_cache import invalidate_principal
+from app.core.security import create_access_token
+from app.db.session import async_session_factory
+from app.main import app
+from app.models.career import CareerRecommendation
+from app.models.job import SavedJob, UserFeedState, UserJobFeedEntry
+from app.models.resume import ResumeProfile
+from app.models.roadmap import RoadmapEntry
+from app.models.user import User
+from app.services.job_feed import FeedInputs
+from app.services.role_insights import InsightInputs, _row, upsert_insights
+
+SAVED_JOBS = 200
+
+# (method, path, params) → max statements, including the auth lookup on a cache miss
+BUDGETS = {
+    ("GET", "/users/me", None): 1,
+    ("PATCH", "/users/me/onboard", None): 2,
+    ("GET", "/resume/profile", None): 1,
+    ("POST", "/resume/ats-score", (("target_role", "Data Analyst"),)): 2,
+    ("GET", "/career/explore", (("role", "Data Analyst"),)): 2,
+    ("GET", "/roadmap/today", None): 2,
+    ("GET", "/jobs/saved", None): 2,
+    ("GET", "/jobs/feed", None): 4,  # + the inputs the stored feed is checked against
+}
+
+ONBOARD_LOCATIONS = ["Bangalore", "Pune"]  # [warm, cold]: both change the row, the fixture value last
+
+
+@pytest_asyncio.fixture
+async def user_id(db):
+    now = datetime.now(timezone.utc)
+    async with async_session_factory() as session:
+        user = User(email=f"qcount-{uuid.uuid4().hex[:8]}@example.com", hashed_password="x",
+                    full_name="Query Count", location_preference="Bangalore")
+        session.add(user)
+        await session.flush()
+        profile = ResumeProfile(user_id=user.id, raw_text="python sql dashboards " * 2000,
+                                skills=["python", "sql", "excel"], experience=[], education=[])
+        session.add(profile)
+        session.add_all(CareerRecommendation(user_id=user.id, job_role=role, match_score=90 - i, is_selected=i == 0)
+                        for i, role in enumerate(["Data Analyst", "Backend Developer", "Data Scientist"]))
+        await session.execute(insert(SavedJob), [{
+            "user_id": user.id, "title": f"Job {i}", "company": "Acme", "description": "lorem ipsum " * 400,
+            "created_at": now - timedelta(minutes=i),
+        } for i in range(SAVED_JOBS)])
+        await session.execute(insert(RoadmapEntry), [{
+            "user_id": user.id, "date": date.today() - timedelta(days=i),
+        } for i in range(30)])
+        feed_inputs = FeedInputs(user.id, "Data Analyst", profile.skills, user.location_preference, False)
+        session.add(UserFeedState(user_id=user.id, role="Data Analyst", inputs_hash=feed_inputs.fingerprint(),
+                                  job_count=1, computed_at=now))
+        session.add(UserJobFeedEntry(user_id=user.id, position=0, job={"title": "Data Analyst", "company": "Acme"}))
+        inputs = InsightInputs.for_user(user, profile)
+        await upsert_insights(session, [_row(inputs, "Data Analyst", [{"title": "Data Analyst"}], {
+            "score": 50, "keyword_score": 20, "format_score": 10, "achievement_score": 10,
+            "missing_keywords": [], "suggestions": [], "action_verbs_found": [], "action_verbs_missing": [],
+        }, now)])
+        await session.commit()
+        user_id = user.id
+
+    yield user_id
+
+    async with async_session_factory() as session:
+        await session.execute(delete(User).where(User.id == user_id))  # children cascade in Postgres
+        await session.commit()
+    await invalidate_principal(user_id)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("method", "path", "params"), list(BUDGETS), ids=[f"{m} {p}" for m, p, _ in BUDGETS])
+async def test_endpoint_stays_within_query_budget(db, user_id, method, path, params):
+    budget = BUDGETS[(method, path, params)]
+    statements = 0
+
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    headers = {"Authorization": f"Bearer {create_access_token(str(user_id))}"}
+    transport = httpx.ASGITransport(app=app)
+    event.listen(db.sync_engine, "before_cursor_execute", count)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://test/api/v1", headers=headers) as client:
+            for cold in (True, False):
+                if cold:
+                    await invalidate_principal(user_id)
+                body = {"location_preference": ONBOARD_LOCATIONS[cold]} if method == "PATCH" else None
+                before = statements
+                resp = await client.request(method, path, params=dict(params or ()), json=body)
+                used = statements - before
+                phase = "cold" if cold else "warm"
+                assert resp.status_code < 400, f"{phase}: {resp.status_code} {resp.text[:200]}"
+                assert used <= budget, f"{phase}: {used} statements, budget {budget}"
+    finally:
+        event.remove(db.sync_engine, "before_cursor_execute", count)
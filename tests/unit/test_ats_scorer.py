@@ -0,0 +1,28 @@
+"""Which terms the rule-based ATS score matches a resume against."""
+
+import pytest
+
+from app.services import ats_scorer
+from app.services.ats_scorer import DEFAULT_KEYWORDS, ROLE_KEYWORDS, resolve_role_keywords
+
+
+@pytest.mark.asyncio
+async def test_registry_roles_are_scored_on_keywords_and_skills(monkeypatch):
+    async def keyword_set(role):
+        return {"keywords": ["pipelines", "terraform", "monitoring"], "skills": ["terraform", "aws"]}
+
+    monkeypatch.setattr(ats_scorer, "get_role_keyword_set", keyword_set)
+    assert await resolve_role_keywords("Cloud Engineer") == ["pipelines", "terraform", "monitoring", "aws"]
+
+    result = await ats_scorer.score_resume("Built AWS pipelines", "Cloud Engineer", use_llm=False)
+    assert result["missing_keywords"] == ["terraform", "monitoring"]
+
+
+@pytest.mark.asyncio
+async def test_known_and_unresolved_roles(monkeypatch):
+    async def unavailable(role):
+        return None
+
+    monkeypatch.setattr(ats_scorer, "get_role_keyword_set", unavailable)
+    assert await resolve_role_keywords("Data Analyst") == ROLE_KEYWORDS["Data Analyst"]
+    assert await resolve_role_keywords("Cloud Engineer") == DEFAULT_KEYWORDS
@@ -0,0 +1,58 @@
+"""Which principal store ``get_principal_store`` builds for the worker count."""
+
+import pytest
+
+from app.core import auth_cache
+from app.core.auth_cache import MULTI_WORKER_MEMORY_TTL, close_principal_store, get_principal_store
+
+
+class FakeRedisStore:
+    name = "redis"
+
+    def __init__(self, url: str, ttl: float):
+        self.ttl = ttl
+
+
+@pytest.fixture
+def configure(monkeypatch):
+    def apply(backend: str, workers: int, redis_installed: bool = False) -> None:
+        monkeypatch.setattr(auth_cache.settings, "PRINCIPAL_CACHE_BACKEND", backend)
+        monkeypatch.setattr(auth_cache.settings, "PRINCIPAL_CACHE_TTL_SECONDS", 60)
+        monkeypatch.setattr(auth_cache.settings, "WEB_CONCURRENCY", workers)
+        monkeypatch.setattr(auth_cache.importlib.util, "find_spec",
+                            lambda name: object() if redis_installed and name == "redis" else None)
+        monkeypatch.setattr(auth_cache, "RedisPrincipalStore", FakeRedisStore)
+        auth_cache._store, auth_cache._store_ready = None, False
+
+    yield apply
+    auth_cache._store, auth_cache._store_ready = None, False
+
+
+def test_single_worker_keeps_the_memory_ttl(configure):
+    configure("auto", workers=1, redis_installed=True)
+    store = get_principal_store()
+    assert store.name == "memory"
+    assert store.ttl == 60
+
+
+def test_auto_uses_redis_with_several_workers(configure):
+    configure("auto", workers=4, redis_installed=True)
+    assert get_principal_store().name == "redis"
+
+
+def test_memory_ttl_is_capped_when_other_workers_cannot_see_invalidations(configure):
+    configure("auto", workers=4, redis_installed=False)
+    store = get_principal_store()
+    assert store.name == "memory"
+    assert store.ttl == MULTI_WORKER_MEMORY_TTL
+
+    configure("memory", workers=4, redis_installed=True)
+    assert get_principal_store().ttl == MULTI_WORKER_MEMORY_TTL
+
+
+@pytest.mark.asyncio
+async def test_disabled_backend(configure):
+    configure("", workers=4)
+    assert get_principal_store() is None
+    assert auth_cache.get_auth_cache_stats()["backend"] == "disabled"
+    await close_principal_store()
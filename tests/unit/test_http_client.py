@@ -0,0 +1,95 @@
+"""Retry and jitter of ``request_with_retry`` against an in-process stub server."""
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from app.services import http_client
+from app.services.http_client import get_http_client, request_with_retry, set_http_client
+
+
+class StubServer:
+    """Answers with the queued statuses (or raises queued transport errors), then 200."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls: list[str] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls.append(request.method)
+        outcome = self.responses.pop(0) if self.responses else 200
+        if isinstance(outcome, Exception):
+            raise outcome
+        return httpx.Response(outcome, json={"ok": outcome == 200})
+
+
+@pytest_asyncio.fixture
+async def stub(monkeypatch):
+    delays: list[tuple[float, float]] = []
+    uniform = http_client.random.uniform
+
+    def recording_uniform(low, high):
+        delays.append((low, high))
+        return uniform(low, high)
+
+    monkeypatch.setattr(http_client.settings, "HTTP_RETRY_BACKOFF", 0.001)
+    monkeypatch.setattr(http_client.settings, "HTTP_MAX_RETRIES", 2)
+    monkeypatch.setattr(http_client.random, "uniform", recording_uniform)
+
+    async def install(*responses) -> StubServer:
+        server = StubServer(*responses)
+        await set_http_client(httpx.AsyncClient(transport=httpx.MockTransport(server)))
+        server.delays = delays
+        return server
+
+    yield install
+    await set_http_client(None)
+
+
+@pytest.mark.asyncio
+async def test_replaced_client_is_closed(stub):
+    await stub()
+    injected = get_http_client()
+    await stub()
+    assert injected.is_closed
+    assert not get_http_client().is_closed
+
+
+@pytest.mark.asyncio
+async def test_get_is_retried_on_gateway_errors_with_growing_jitter(stub):
+    server = await stub(503, 502)
+    resp = await request_with_retry("GET", "http://stub/jobs")
+    assert resp.status_code == 200
+    assert server.calls == ["GET", "GET", "GET"]
+    # Full jitter: uniform(0, backoff * 2**attempt)
+    assert server.delays == [(0, 0.001), (0, 0.002)]
+
+
+@pytest.mark.asyncio
+async def test_transport_errors_are_retried(stub):
+    server = await stub(httpx.ConnectError("refused"))
+    resp = await request_with_retry("GET", "http://stub/jobs")
+    assert resp.status_code == 200
+    assert len(server.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_retries(stub):
+    server = await stub(503, 503, 503, 503)
+    resp = await request_with_retry("GET", "http://stub/jobs")
+    assert resp.status_code == 503
+    assert len(server.calls) == 3
+
+    server = await stub(*[httpx.ReadTimeout("slow")] * 3)
+    with pytest.raises(httpx.ReadTimeout):
+        await request_with_retry("GET", "http://stub/jobs")
+    assert len(server.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_non_idempotent_methods_are_sent_once(stub):
+    server = await stub(503)
+    resp = await request_with_retry("POST", "http://stub/llm", json={})
+    assert resp.status_code == 503
+    assert server.calls == ["POST"]
+    assert server.delays == []
@@ -0,0 +1,33 @@
+"""Per-job feature cache of the ranker."""
+
+from app.services import job_ranker
+from app.services.job_ranker import JobRanker, clear_feature_cache, get_features
+
+
+def test_edited_posting_of_the_same_length_gets_new_features():
+    clear_feature_cache()
+    job = {"external_job_id": "edit-1", "title": "Backend Developer", "description": "python sql docker"}
+    edited = {**job, "description": "golang sql docker"}
+    assert len(edited["description"]) == len(job["description"])
+
+    ranker = JobRanker(["python"])
+    assert ranker.score(job) > ranker.score(edited)
+    assert "python" not in get_features(edited).tokens
+
+
+def test_features_are_reused_for_unchanged_postings():
+    clear_feature_cache()
+    job = {"external_job_id": "same-1", "title": "Data Analyst", "description": "sql excel fresher"}
+    assert get_features(job) is get_features(dict(job))
+
+
+def test_cache_evicts_least_recently_used_within_its_byte_budget(monkeypatch):
+    clear_feature_cache()
+    jobs = [{"external_job_id": f"lru-{i}", "title": "Developer", "description": f"python sql {i}"} for i in range(3)]
+    first, second = get_features(jobs[0]), get_features(jobs[1])
+    monkeypatch.setattr(job_ranker.settings, "JOB_FEATURE_CACHE_MB", (first.nbytes + second.nbytes) / (1024 * 1024))
+
+    assert get_features(jobs[0]) is first  # hit: now the most recently used
+    get_features(jobs[2])
+    assert get_features(jobs[0]) is first
+    assert get_features(jobs[1]) is not second
@@ -0,0 +1,145 @@
+"""Source breakers in ``iter_job_pages``, using the file source and the stub feed."""
+
+import asyncio
+import time
+
+import pytest
+
+from app.services.job_aggregator import (
+    FanoutReport,
+    FileJobSource,
+    JobSearchUnavailable,
+    JobSource,
+    iter_job_pages,
+)
+
+STUB_FEED = "scripts/stub_job_feed.json"
+
+
+class SlowFileSource(FileJobSource):
+    """The stub feed, answering after ``delay`` seconds, with any number of pages."""
+
+    max_pages = None
+
+    def __init__(self, path: str, delay: float):
+        super().__init__(path, timeout=5.0)
+        self.delay = delay
+
+    async def search(self, *args):
+        await asyncio.sleep(self.delay)
+        return await super().search(*args)
+
+
+async def collect(queries: list[str], source, **kwargs) -> list[dict]:
+    jobs: list[dict] = []
+    async for page in iter_job_pages(queries, sources=[source], **kwargs):
+        jobs.extend(page)
+    return jobs
+
+
+def test_sources_must_implement_search():
+    class NoSearch(JobSource):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        NoSearch()
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_on_failures_and_recovers(tmp_path, caplog):
+    source = FileJobSource(str(tmp_path / "missing.json"))
+    source.breaker.failure_threshold = 2
+    source.breaker.reset_timeout = 0.05
+
+    with pytest.raises(JobSearchUnavailable):
+        await collect(["backend", "developer"], source)
+    assert source.breaker.state == "open"
+    failures = source.breaker.stats.failures
+
+    # Open: the source is skipped without being called, and the search says so
+    source.path = STUB_FEED
+    with pytest.raises(JobSearchUnavailable) as raised:
+        await collect(["backend"], source)
+    assert raised.value.report.short_circuited == raised.value.report.pages
+    assert "Every job source is short-circuited" in caplog.text
+    assert source.breaker.stats.failures == failures
+    assert source.breaker.stats.short_circuits >= 1
+
+    # After the reset timeout one trial goes through and closes the breaker
+    time.sleep(0.06)
+    jobs = await collect(["backend"], source)
+    assert {j["source"] for j in jobs} == {"file"}
+    assert any("Backend" in j["title"] for j in jobs)
+    assert source.breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_pages_running_at_the_budget_deadline_count_as_failures():
+    source = SlowFileSource(STUB_FEED, delay=1.0)
+    source.breaker.failure_threshold = 3
+
+    report = FanoutReport()
+    with pytest.raises(JobSearchUnavailable):
+        await collect(["backend"], source, num_pages=3, budget=0.05, report=report)
+    assert report.dropped == 3
+    await asyncio.sleep(0.01)  # let the cancelled pages unwind
+    assert source.breaker.stats.failures == 3
+    assert source.breaker.state == "open"
+
+
+@pytest.mark.asyncio
+async def test_caller_cancellation_does_not_count_as_failure():
+    source = SlowFileSource(STUB_FEED, delay=1.0)
+    source.breaker.failure_threshold = 1
+
+    task = asyncio.create_task(collect(["backend"], source, num_pages=3))
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await asyncio.sleep(0.01)
+    assert source.breaker.stats.failures == 0
+    assert source.breaker.state == "closed"
+
+    # A consumer that stops after the first page does not hurt the source either
+    source.delay = 0
+    pages = iter_job_pages(["backend", "developer"], sources=[source], num_pages=3)
+    async for _ in pages:
+        break
+    await pages.aclose()
+    await asyncio.sleep(0.01)
+    assert source.breaker.stats.failures == 0
+    assert source.breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_half_open_trial_frees_the_breaker():
+    source = SlowFileSource(STUB_FEED, delay=1.0)
+    source.breaker.failure_threshold = 1
+    source.breaker.reset_timeout = 0.0
+    source.breaker.record_failure()
+
+    task = asyncio.create_task(collect(["backend"], source, num_pages=1))
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await asyncio.sleep(0.01)  # let the abandoned page unwind and run its cancellation handler
+
+    source.delay = 0
+    assert await collect(["backend"], source, num_pages=1)
+    assert source.breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_partial_failures_still_return_what_was_answered(tmp_path):
+    broken = FileJobSource(str(tmp_path / "missing.json"))
+    broken.name = "broken"
+    report = FanoutReport()
+    jobs: list[dict] = []
+    async for page in iter_job_pages(["backend"], sources=[broken, FileJobSource(STUB_FEED)], report=report):
+        jobs.extend(page)
+    assert jobs and report.failed == 1 and report.completed == 1
+
+    # Nothing matched is an answer, not an outage
+    assert await collect(["no such role anywhere"], FileJobSource(STUB_FEED)) == []
@@ -0,0 +1,48 @@
+"""Checkpoint store selection and deletion of finished runs' checkpoints."""
+
+from typing import TypedDict
+
+import pytest
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, StateGraph
+
+from app.services import pipeline_checkpoint
+from app.services.pipeline_checkpoint import delete_checkpoints, get_checkpointer, set_checkpointer
+
+
+class CountState(TypedDict):
+    count: int
+
+
+def counting_graph(saver):
+    graph = StateGraph(CountState)
+    graph.add_node("step", lambda state: {"count": state["count"] + 1})
+    graph.set_entry_point("step")
+    graph.add_edge("step", END)
+    return graph.compile(checkpointer=saver)
+
+
+def test_durable_checkpoints_require_the_store_to_be_started(monkeypatch):
+    set_checkpointer(None)
+    monkeypatch.setattr(pipeline_checkpoint.settings, "PIPELINE_CHECKPOINTS", True)
+    with pytest.raises(RuntimeError):
+        get_checkpointer()
+
+    monkeypatch.setattr(pipeline_checkpoint.settings, "PIPELINE_CHECKPOINTS", False)
+    assert isinstance(get_checkpointer(), MemorySaver)
+    set_checkpointer(None)
+
+
+@pytest.mark.asyncio
+async def test_delete_checkpoints_drops_only_the_given_runs():
+    saver = MemorySaver()
+    set_checkpointer(saver)
+    graph = counting_graph(saver)
+    for run_id in ("done", "kept"):
+        await graph.ainvoke({"count": 0}, {"configurable": {"thread_id": run_id}})
+
+    await delete_checkpoints(["done"])
+
+    assert not (await graph.aget_state({"configurable": {"thread_id": "done"}})).values
+    assert (await graph.aget_state({"configurable": {"thread_id": "kept"}})).values == {"count": 1}
+    set_checkpointer(None)
@@ -0,0 +1,79 @@
+"""A wrong speculative guess must not hurt the real job search that follows."""
+
+import asyncio
+
+import pytest
+
+from app.services import job_aggregator, pipeline
+from app.services.job_aggregator import FileJobSource, set_job_sources
+
+STUB_FEED = "scripts/stub_job_feed.json"
+
+
+class SlowStubSource(FileJobSource):
+    """The stub feed as a slow paginated provider, like JSearch."""
+
+    name = "jsearch"
+    max_pages = None
+
+    def __init__(self, delay: float):
+        super().__init__(STUB_FEED, timeout=5.0)
+        self.delay = delay
+
+    async def search(self, *args):
+        await asyncio.sleep(self.delay)
+        return await super().search(*args)
+
+
+@pytest.fixture
+def slow_source(monkeypatch):
+    async def no_catalog(*args):
+        return []
+
+    monkeypatch.setattr(job_aggregator, "search_catalog", no_catalog)
+    monkeypatch.setattr(pipeline.settings, "PIPELINE_SPECULATIVE_SEARCH", True)
+    monkeypatch.setattr(job_aggregator.settings, "JOB_SEARCH_PAGES", 3)
+    source = SlowStubSource(delay=0.3)
+    source.breaker.failure_threshold = 3
+    set_job_sources([source])
+    yield source
+    set_job_sources(None)
+
+
+@pytest.mark.asyncio
+async def test_speculation_miss_then_real_search_returns_jobs(slow_source):
+    state = {"skills": ["python", "sql", "excel", "tableau"], "location_preference": None}
+    speculation = pipeline._start_speculative_search(state)
+    assert speculation["role"] == "Data Analyst"
+    await asyncio.sleep(0.05)  # its pages are in flight
+
+    # The LLM picked another role: the guess is cancelled
+    settled = pipeline._settle_speculation(speculation, "Backend Developer")
+    assert settled["speculation"]["hit"] is False
+    await asyncio.sleep(0.01)
+    assert slow_source.breaker.state == "closed"
+    assert slow_source.breaker.stats.failures == 0
+
+    slow_source.delay = 0
+    result = await pipeline.search_jobs_node({**state, "selected_role": "Backend Developer", **settled})
+    assert result["matched_jobs"]
+    assert all("Backend" in job["title"] for job in result["matched_jobs"])
+    assert "errors" not in result
+
+
+@pytest.mark.asyncio
+async def test_unclaimed_guess_is_dropped(slow_source, monkeypatch):
+    state = {"skills": ["python", "sql", "excel", "tableau"], "location_preference": None}
+
+    # The run ends (join_results) without search_jobs claiming the hit, e.g. resumed elsewhere
+    speculation = pipeline._settle_speculation(pipeline._start_speculative_search(state), "Data Analyst")
+    await pipeline.join_results_node({**state, **speculation})
+    assert speculation["speculation"]["key"] not in pipeline._speculative_searches
+
+    # The run dies before any node after recommend_careers: the guess expires
+    monkeypatch.setattr(pipeline.settings, "PIPELINE_SPECULATION_TTL_SECONDS", 0.05)
+    speculation = pipeline._settle_speculation(pipeline._start_speculative_search(state), "Data Analyst")
+    task = pipeline._speculative_searches[speculation["speculation"]["key"]]
+    await asyncio.sleep(0.1)
+    assert speculation["speculation"]["key"] not in pipeline._speculative_searches
+    assert task.cancelled()
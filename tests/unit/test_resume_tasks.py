@@ -0,0 +1,32 @@
+"""resume.parse only ever reads the submitting user's own uploads."""
+
+import os
+import uuid
+
+import pytest
+
+from app.models.task import Task
+from app.services.resume_parser import is_user_upload, settings, upload_path
+from app.services.task_queue import PermanentTaskError
+from app.workers.tasks import USER_TASK_KINDS, parse_resume_task
+
+
+def test_resume_parse_cannot_be_submitted_by_users():
+    assert "resume.parse" not in USER_TASK_KINDS
+
+
+def test_only_own_files_directly_in_the_upload_dir_are_accepted():
+    me, other = uuid.uuid4(), uuid.uuid4()
+    assert is_user_upload(upload_path(me), me)
+    assert not is_user_upload(upload_path(other), me)
+    assert not is_user_upload(os.path.join(settings.UPLOAD_DIR, "..", f"{me}_x.pdf"), me)
+    assert not is_user_upload(os.path.join(settings.UPLOAD_DIR, "sub", f"{me}_x.pdf"), me)
+    assert not is_user_upload(f"/etc/{me}_passwd", me)
+
+
+@pytest.mark.asyncio
+async def test_handler_rejects_another_users_upload():
+    me, other = uuid.uuid4(), uuid.uuid4()
+    task = Task(kind="resume.parse", user_id=me, payload={"file_path": upload_path(other)})
+    with pytest.raises(PermanentTaskError):
+        await parse_resume_task(task)
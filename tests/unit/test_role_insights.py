@@ -0,0 +1,35 @@
+"""What a role insight stores: list items without descriptions, never an empty search."""
+
+import uuid
+
+from app.schemas.job import to_list_item
+from app.services.role_insights import insight_rows_from_state
+
+STATE = {
+    "selected_role": "Backend Developer",
+    "skills": ["python"],
+    "raw_text": "python developer",
+    "ats_result": {"score": 71},
+    "matched_jobs": [{
+        "external_job_id": "job-1",
+        "title": "Backend Developer",
+        "company": "Acme",
+        "description": "Build python services. " * 50,
+        "match_score": 80.0,
+    }],
+}
+
+
+def test_insight_jobs_are_stored_without_descriptions():
+    [row] = insight_rows_from_state(uuid.uuid4(), STATE)
+    [job] = row["jobs"]
+    assert "description" not in job
+    assert job["external_job_id"] == "job-1"
+    assert job["snippet"].startswith("Build python services.")
+
+    # Listed again (GET /career/explore), the stored snippet is kept
+    assert to_list_item(job).snippet == job["snippet"]
+
+
+def test_a_search_without_jobs_is_not_stored():
+    assert insight_rows_from_state(uuid.uuid4(), {**STATE, "matched_jobs": []}) == []
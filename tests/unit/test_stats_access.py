@@ -0,0 +1,29 @@
+"""GET /stats is internal: STATS_TOKEN, or open in development only."""
+
+import httpx
+import pytest
+
+from app.core import deps
+from app.core.deps import require_stats_token
+from app.main import app
+
+
+@pytest.mark.asyncio
+async def test_stats_is_hidden_without_the_token(monkeypatch):
+    monkeypatch.setattr(deps.settings, "STATS_TOKEN", "s3cret")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        assert (await client.get("/stats")).status_code == 404
+        assert (await client.get("/stats", headers={"X-Stats-Token": "wrong"})).status_code == 404
+    require_stats_token("s3cret")  # the right token passes
+
+
+def test_stats_without_a_token_is_development_only(monkeypatch):
+    monkeypatch.setattr(deps.settings, "STATS_TOKEN", "")
+    monkeypatch.setattr(deps.settings, "ENVIRONMENT", "development")
+    require_stats_token(None)
+
+    monkeypatch.setattr(deps.settings, "ENVIRONMENT", "production")
+    with pytest.raises(deps.HTTPException) as raised:
+        require_stats_token(None)
+    assert raised.value.status_code == 404
@@ -0,0 +1,46 @@
+"""JSON trace export runs off the event loop and is awaited by flush_traces."""
+
+import json
+import threading
+
+import pytest
+
+from app.core import tracing
+from app.core.tracing import flush_traces, span, start_trace
+
+
+@pytest.fixture
+def json_exporter(monkeypatch, tmp_path):
+    path = tmp_path / "traces.jsonl"
+    monkeypatch.setattr(tracing.settings, "TRACE_EXPORTER", "json")
+    monkeypatch.setattr(tracing.settings, "TRACE_JSON_PATH", str(path))
+    return path
+
+
+@pytest.mark.asyncio
+async def test_json_export_is_written_off_the_event_loop(json_exporter, monkeypatch):
+    writer_threads = []
+    write_json = tracing._write_json
+
+    def recording_write(trace, summary):
+        writer_threads.append(threading.current_thread())
+        write_json(trace, summary)
+
+    monkeypatch.setattr(tracing, "_write_json", recording_write)
+    with start_trace("request", route="/jobs"):
+        with span("db.query"):
+            pass
+    await flush_traces()
+
+    assert writer_threads and writer_threads[0] is not threading.main_thread()
+    [line] = json_exporter.read_text().splitlines()
+    trace = json.loads(line)
+    assert trace["name"] == "request"
+    assert [s["name"] for s in trace["span_list"]] == ["request", "db.query"]
+
+
+def test_json_export_without_event_loop_writes_inline(json_exporter):
+    with start_trace("script"):
+        pass
+
+    assert json.loads(json_exporter.read_text())["name"] == "script"